@@ -5,7 +5,12 @@ from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, Field
 
 from app.api.deps import CurrentUser, Database
-from app.schemas.task import InstagramTaskInput, CopywriterTaskInput, TaskResponse
+from app.schemas.task import (
+    InstagramBatchTaskInput,
+    InstagramTaskInput,
+    CopywriterTaskInput,
+    TaskResponse,
+)
 from app.services.task_queue import get_task_queue
 from app.services.agents.tools.image_generator import image_service
 
@@ -101,6 +106,77 @@ async def create_instagram_task(
     )
 
 
+@router.post(
+    "/marketing/instagram/batch",
+    response_model=TaskResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_instagram_batch_task(
+    data: InstagramBatchTaskInput,
+    current_user: CurrentUser,
+    db: Database,
+) -> TaskResponse:
+    """Create a task generating many Instagram posts at half price (ready within 24h)."""
+    if not current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User must belong to a company",
+        )
+
+    company = await db.companies.find_one({"_id": ObjectId(current_user.company_id)})
+    if not company:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Company not found")
+
+    if "marketing" not in company.get("enabled_agents", []):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Marketing agents not enabled for this company",
+        )
+
+    now = datetime.utcnow()
+    task_doc = {
+        "company_id": current_user.company_id,
+        "user_id": current_user.id,
+        "department": "marketing",
+        "agent": "instagram_specialist",
+        "type": "create_posts_batch",
+        "input": data.model_dump(),
+        "output": None,
+        "status": "pending",
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+        "completed_at": None,
+    }
+
+    result = await db.tasks.insert_one(task_doc)
+    task_id = str(result.inserted_id)
+
+    try:
+        pool = await get_task_queue()
+        await pool.enqueue_job("process_instagram_batch_task", task_id, data.model_dump())
+    except Exception as e:
+        await db.tasks.update_one(
+            {"_id": result.inserted_id},
+            {"$set": {"error": f"Queue error: {str(e)}", "status": "pending"}}
+        )
+
+    return TaskResponse(
+        id=task_id,
+        company_id=current_user.company_id,
+        user_id=current_user.id or "",
+        department="marketing",
+        agent="instagram_specialist",
+        type="create_posts_batch",
+        input=data.model_dump(),
+        output=None,
+        status="pending",
+        error=None,
+        created_at=now,
+        completed_at=None,
+    )
+
+
 @router.post("/marketing/copywriter", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_copywriter_task(
     data: CopywriterTaskInput,
@@ -9,6 +9,7 @@ from pydantic import BaseModel, Field
 
 from app.api.deps import CurrentUser, Database
 from app.services.agents.monitoring import (
+    Alert,
     AlertService,
     AlertType,
     AlertPriority,
@@ -50,6 +51,12 @@ class AlertCountResponse(BaseModel):
     low: int
 
 
+class AlertOverviewResponse(BaseModel):
+    """Alerts with unread counts for the dashboard."""
+    alerts: list[AlertResponse]
+    counts: AlertCountResponse
+
+
 class CashflowCheckRequest(BaseModel):
     """Request for cashflow check."""
     current_balance: float
@@ -83,6 +90,23 @@ class TrendScanRequest(BaseModel):
 # ============================================================================
 
 
+def _alert_response(a: Alert) -> AlertResponse:
+    """Convert an Alert to its response schema."""
+    return AlertResponse(
+        id=a.id,
+        type=a.type.value,
+        priority=a.priority.value,
+        title=a.title,
+        message=a.message,
+        data=a.data,
+        action_url=a.action_url,
+        action_label=a.action_label,
+        suggested_actions=a.suggested_actions,
+        read=a.read,
+        created_at=a.created_at,
+    )
+
+
 @router.get("", response_model=list[AlertResponse])
 async def get_alerts(
     current_user: CurrentUser,
@@ -112,22 +136,32 @@ async def get_alerts(
         limit=limit,
     )
 
-    return [
-        AlertResponse(
-            id=a.id,
-            type=a.type.value,
-            priority=a.priority.value,
-            title=a.title,
-            message=a.message,
-            data=a.data,
-            action_url=a.action_url,
-            action_label=a.action_label,
-            suggested_actions=a.suggested_actions,
-            read=a.read,
-            created_at=a.created_at,
+    return [_alert_response(a) for a in alerts]
+
+
+@router.get("/overview", response_model=AlertOverviewResponse)
+async def get_alerts_overview(
+    current_user: CurrentUser,
+    db: Database,
+    limit: int = Query(50, ge=1, le=100),
+) -> AlertOverviewResponse:
+    """Get active alerts together with unread counts (one database query)."""
+    if not current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User must belong to a company",
         )
-        for a in alerts
-    ]
+
+    alert_service = AlertService(db)
+    alerts, counts = await alert_service.get_alerts_overview(
+        company_id=current_user.company_id,
+        limit=limit,
+    )
+
+    return AlertOverviewResponse(
+        alerts=[_alert_response(a) for a in alerts],
+        counts=AlertCountResponse(**counts),
+    )
 
 
 @router.get("/count", response_model=AlertCountResponse)
@@ -1,5 +1,8 @@
 from fastapi import APIRouter
 
+from app.services.agents.marketing._response_cache import response_cache_stats
+from app.services.agents.memory import memory_service
+
 router = APIRouter(tags=["health"])
 
 
@@ -7,3 +10,12 @@ router = APIRouter(tags=["health"])
 async def health_check() -> dict:
     """Health check endpoint for Railway."""
     return {"status": "healthy"}
+
+
+@router.get("/health/cache")
+async def cache_stats() -> dict:
+    """Agent cache hit rates in this process."""
+    return {
+        "embeddings": memory_service.embedding_cache_stats,
+        "marketing_responses": response_cache_stats(),
+    }
@@ -1,8 +1,9 @@
 """Legal Department API endpoints."""
 
+import asyncio
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
 from pydantic import BaseModel, Field
 
 from app.api.deps import CurrentUser, Database
@@ -14,11 +15,20 @@ from app.services.agents.legal import (
     generate_data_processing_agreement,
     generate_terms_of_service,
     generate_return_policy,
+    ECOMMERCE_LEGAL_REFERENCE_JSON,
 )
 
 router = APIRouter(prefix="/legal", tags=["legal"])
 
 
+def _generation_timeout() -> HTTPException:
+    """Error for a document whose generation stalled on every attempt."""
+    return HTTPException(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        detail="Generowanie dokumentu trwało zbyt długo. Spróbuj ponownie za chwilę.",
+    )
+
+
 # ============================================================================
 # SCHEMAS
 # ============================================================================
@@ -101,6 +111,12 @@ class ReturnPolicyRequest(BaseModel):
     contact_email: str = ""
 
 
+class LegalBundleRequest(BaseModel):
+    """Request for Terms of Service and return policy generated together."""
+    terms: TermsOfServiceRequest
+    return_policy: ReturnPolicyRequest = Field(default_factory=ReturnPolicyRequest)
+
+
 # ============================================================================
 # ENDPOINTS
 # ============================================================================
@@ -225,20 +241,23 @@ async def generate_terms_endpoint(
     company = await db.companies.find_one({"_id": current_user.company_id})
     company_name = company.get("name", "") if company else ""
 
-    result = await generate_terms_of_service(
-        company_name=company_name,
-        company_address=data.company_address,
-        service_type=data.service_type,
-        service_description=data.service_description,
-        pricing_model=data.pricing_model,
-        payment_terms=data.payment_terms,
-        contact_email=data.contact_email,
-        jurisdiction=data.jurisdiction,
-        b2b_only=data.b2b_only,
-        subscription_based=data.subscription_based,
-        free_trial=data.free_trial,
-        refund_policy=data.refund_policy,
-    )
+    try:
+        result = await generate_terms_of_service(
+            company_name=company_name,
+            company_address=data.company_address,
+            service_type=data.service_type,
+            service_description=data.service_description,
+            pricing_model=data.pricing_model,
+            payment_terms=data.payment_terms,
+            contact_email=data.contact_email,
+            jurisdiction=data.jurisdiction,
+            b2b_only=data.b2b_only,
+            subscription_based=data.subscription_based,
+            free_trial=data.free_trial,
+            refund_policy=data.refund_policy,
+        )
+    except TimeoutError:
+        raise _generation_timeout()
 
     return result
 
@@ -259,14 +278,89 @@ async def generate_return_policy_endpoint(
     company = await db.companies.find_one({"_id": current_user.company_id})
     company_name = company.get("name", "") if company else ""
 
-    result = await generate_return_policy(
-        company_name=company_name,
-        business_type=data.business_type,
-        products_type=data.products_type,
-        return_period_days=data.return_period_days,
-        accepts_opened_products=data.accepts_opened_products,
-        free_returns=data.free_returns,
-        contact_email=data.contact_email,
-    )
+    try:
+        result = await generate_return_policy(
+            company_name=company_name,
+            business_type=data.business_type,
+            products_type=data.products_type,
+            return_period_days=data.return_period_days,
+            accepts_opened_products=data.accepts_opened_products,
+            free_returns=data.free_returns,
+            contact_email=data.contact_email,
+        )
+    except TimeoutError:
+        raise _generation_timeout()
 
     return result
+
+
+@router.post("/bundle")
+async def generate_legal_bundle_endpoint(
+    data: LegalBundleRequest,
+    current_user: CurrentUser,
+    db: Database,
+) -> dict[str, Any]:
+    """Generate Terms of Service and a return policy in one request.
+
+    Both documents are generated concurrently, so the wait is that of the
+    slower one instead of the sum of both.
+    """
+    if not current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User must belong to a company",
+        )
+
+    company = await db.companies.find_one({"_id": current_user.company_id})
+    company_name = company.get("name", "") if company else ""
+
+    try:
+        terms, return_policy = await asyncio.gather(
+            generate_terms_of_service(
+                company_name=company_name,
+                company_address=data.terms.company_address,
+                service_type=data.terms.service_type,
+                service_description=data.terms.service_description,
+                pricing_model=data.terms.pricing_model,
+                payment_terms=data.terms.payment_terms,
+                contact_email=data.terms.contact_email,
+                b2b_only=data.terms.b2b_only,
+                subscription_based=data.terms.subscription_based,
+                free_trial=data.terms.free_trial,
+                refund_policy=data.terms.refund_policy,
+            ),
+            generate_return_policy(
+                company_name=company_name,
+                company_address=data.terms.company_address,
+                business_type=data.return_policy.business_type,
+                products_type=data.return_policy.products_type,
+                return_period_days=data.return_policy.return_period_days,
+                accepts_opened_products=data.return_policy.accepts_opened_products,
+                free_returns=data.return_policy.free_returns,
+                contact_email=data.return_policy.contact_email or data.terms.contact_email,
+            ),
+        )
+    except TimeoutError:
+        raise _generation_timeout()
+
+    return {
+        "success": True,
+        "terms": terms,
+        "return_policy": return_policy,
+    }
+
+
+@router.get("/reference/ecommerce-law")
+async def get_ecommerce_law_reference(
+    current_user: CurrentUser,
+) -> Response:
+    """Get static Polish e-commerce law references used in generated terms.
+
+    The payload never changes between deploys, so it is serialized once at
+    import and can be cached by the client.
+    """
+    return Response(
+        content=ECOMMERCE_LEGAL_REFERENCE_JSON,
+        media_type="application/json",
+        headers={"Cache-Control": "private, max-age=86400, immutable"},
+    )
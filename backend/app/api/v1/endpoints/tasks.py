@@ -146,21 +146,30 @@ async def retry_task(
             detail="Only failed or pending tasks can be retried",
         )
 
+    if task["type"] == "create_posts_batch" and task["status"] == "pending":
+        # Pending batch task is already submitted or polling - a retry would
+        # start a second poll chain or submit (and bill) the batch twice
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Batch task is still running and cannot be retried",
+        )
+
     # Reset task status
     now = datetime.utcnow()
-    await db.tasks.update_one(
-        {"_id": ObjectId(task_id)},
-        {
-            "$set": {
-                "status": "pending",
-                "error": None,
-                "output": None,
-                "updated_at": now,
-                "completed_at": None,
-            },
-            "$inc": {"retry_count": 1}
-        }
-    )
+    reset: dict = {
+        "$set": {
+            "status": "pending",
+            "error": None,
+            "output": None,
+            "updated_at": now,
+            "completed_at": None,
+        },
+        "$inc": {"retry_count": 1}
+    }
+    if task["status"] == "failed":
+        # A failed OpenAI batch is submitted again
+        reset["$unset"] = {"batch_id": "", "batch_posts": "", "batch_brand_context": ""}
+    await db.tasks.update_one({"_id": ObjectId(task_id)}, reset)
 
     # Determine which job to enqueue based on agent
     job_name_map = {
@@ -171,6 +180,8 @@ async def retry_task(
     }
 
     job_name = job_name_map.get(task["agent"])
+    if task["type"] == "create_posts_batch":
+        job_name = "process_instagram_batch_task"
     if job_name:
         try:
             pool = await get_task_queue()
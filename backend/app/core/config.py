@@ -27,6 +27,7 @@ class Settings(BaseSettings):
 
     # Qdrant
     QDRANT_URL: str = "http://localhost:6333"
+    QDRANT_PREFER_GRPC: bool = False  # gRPC (port 6334) - binarne wektory zamiast JSON
 
     # JWT
     SECRET_KEY: str = "change-me-in-production"
@@ -36,6 +37,12 @@ class Settings(BaseSettings):
 
     # OpenAI
     OPENAI_API_KEY: str = ""
+    LEGAL_LLM_MAX_CONCURRENCY: int = 16  # Równoległe wywołania LLM generatorów prawnych
+    # Modele agentów marketingowych - research to głównie wywołania narzędzi,
+    # recenzent zwraca finalny tekst, więc zostaje na modelu piszącym
+    MARKETING_RESEARCH_MODEL: str = "gpt-4.1-nano"
+    MARKETING_WRITER_MODEL: str = "gpt-4o-mini"
+    MARKETING_REVIEW_MODEL: str = "gpt-4o-mini"
 
     # Tavily (Web Search)
     TAVILY_API_KEY: str = ""
@@ -3,12 +3,14 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.v1.router import api_router
 from app.core.config import settings
 from app.services.database import mongodb, redis_client
 from app.services.database.qdrant import qdrant_service
 from app.services.database.indexes import create_indexes
+from app.services.agents.llm_http import close_llm_http_clients
 
 # Global reference to worker task
 _worker_task = None
@@ -96,12 +98,18 @@ async def lifespan(app: FastAPI):
         await mongodb.disconnect()
     except Exception:
         pass
+    try:
+        await close_llm_http_clients()
+    except Exception:
+        pass
 
 
 app = FastAPI(
     title=settings.APP_NAME,
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
     lifespan=lifespan,
+    # orjson - szybsza serializacja dużych odpowiedzi (posty, alerty, listy zadań)
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -14,6 +14,12 @@ class InstagramTaskInput(BaseModel):
     include_hashtags: bool = Field(default=True, description="Czy dodac hashtagi")
 
 
+class InstagramBatchTaskInput(BaseModel):
+    """Input for generating many Instagram posts through the OpenAI Batch API."""
+
+    posts: list[InstagramTaskInput] = Field(..., min_length=1, max_length=100)
+
+
 class CopywriterTaskInput(BaseModel):
     """Input for copywriting task."""
 
@@ -10,7 +10,7 @@ from typing import Any
 
 from app.core.config import settings
 from app.services.agents.marketing.instagram import generate_instagram_post
-from app.services.agents.marketing.copywriter import generate_marketing_copy
+from app.services.agents.marketing.copywriter import generate_marketing_copy_batch
 from app.services.agents.tools.image_generator import image_service
 from app.services.agents.memory import memory_service, MemoryType
 from app.services.agents.brand_context import build_brand_context
@@ -182,21 +182,21 @@ class CampaignService:
         }
 
         # Step 1: Generate marketing copy for each type with brand context
-        for copy_type in copy_types:
-            try:
-                copy_result = await generate_marketing_copy(
-                    brief=brief,
-                    copy_type=copy_type,
-                    brand_voice=brand_voice,
-                    target_audience=target_audience,
-                    company_id=company_id,
-                    brand_context=copywriter_context,
-                )
-                results["outputs"]["copy"][copy_type] = copy_result
-                if "copywriter" not in results["agents_used"]:
-                    results["agents_used"].append("copywriter")
-            except Exception as e:
-                results["outputs"]["copy"][copy_type] = {"error": str(e)}
+        copy_results = await generate_marketing_copy_batch([
+            {
+                "brief": brief,
+                "copy_type": copy_type,
+                "brand_voice": brand_voice,
+                "target_audience": target_audience,
+                "company_id": company_id,
+                "brand_context": copywriter_context,
+            }
+            for copy_type in copy_types
+        ])
+        for copy_type, copy_result in zip(copy_types, copy_results):
+            results["outputs"]["copy"][copy_type] = copy_result
+            if "error" not in copy_result and "copywriter" not in results["agents_used"]:
+                results["agents_used"].append("copywriter")
 
         # Step 2: Generate social posts for each platform with brand context
         for platform in platforms:
@@ -29,8 +29,10 @@ from app.services.agents.legal.contract_reviewer import (
 from app.services.agents.legal.gdpr_assistant import (
     check_gdpr_compliance,
     generate_privacy_policy,
+    generate_privacy_policy_stream,
     generate_data_processing_agreement,
     generate_rcpd_template,
+    generate_full_gdpr_package,
     RODO_ARTICLES,
     POLISH_DATA_PROTECTION_LAW,
     IOD_REQUIRED_CASES,
@@ -40,13 +42,19 @@ from app.services.agents.legal.gdpr_assistant import (
 # Terms Generator - regulaminy i polityki
 from app.services.agents.legal.terms_generator import (
     generate_terms_of_service,
+    generate_terms_of_service_stream,
     generate_return_policy,
+    generate_return_policy_stream,
     generate_marketing_consents,
     generate_data_collection_notice,
+    generate_compliance_bundle,
+    generate_all_legal_docs,
     POLISH_ECOMMERCE_LAW,
     WITHDRAWAL_EXCEPTIONS,
     REQUIRED_CONSUMER_INFO,
     WITHDRAWAL_FORM_TEMPLATE,
+    ECOMMERCE_LEGAL_REFERENCE_JSON,
+    TERMS_SCHEMA,
 )
 
 __all__ = [
@@ -62,8 +70,10 @@ __all__ = [
     # GDPR/RODO Assistant
     "check_gdpr_compliance",
     "generate_privacy_policy",
+    "generate_privacy_policy_stream",
     "generate_data_processing_agreement",
     "generate_rcpd_template",
+    "generate_full_gdpr_package",
     "RODO_ARTICLES",
     "POLISH_DATA_PROTECTION_LAW",
     "IOD_REQUIRED_CASES",
@@ -71,11 +81,17 @@ __all__ = [
 
     # Terms Generator
     "generate_terms_of_service",
+    "generate_terms_of_service_stream",
     "generate_return_policy",
+    "generate_return_policy_stream",
     "generate_marketing_consents",
     "generate_data_collection_notice",
+    "generate_compliance_bundle",
+    "generate_all_legal_docs",
     "POLISH_ECOMMERCE_LAW",
     "WITHDRAWAL_EXCEPTIONS",
     "REQUIRED_CONSUMER_INFO",
     "WITHDRAWAL_FORM_TEMPLATE",
+    "ECOMMERCE_LEGAL_REFERENCE_JSON",
+    "TERMS_SCHEMA",
 ]
@@ -0,0 +1,50 @@
+"""Cache wygenerowanych dokumentów prawnych w Redis.
+
+Klucz to skrót pełnego promptu i nazwy modelu, więc zmiana danych firmy,
+daty albo treści promptu automatycznie daje nowy wpis.
+"""
+
+import hashlib
+from typing import Any
+
+from redis.exceptions import RedisError
+
+from app.services.cache import get_cache_service
+
+DOCUMENT_CACHE_TTL = 3600  # 1 godzina
+
+
+def document_cache_key(kind: str, model: str, *prompt_parts: str) -> str:
+    """Build a content-addressed cache key for a generated document.
+
+    Args:
+        kind: Document type, e.g. "terms"
+        model: LLM model name the document is generated with
+        prompt_parts: Prompt texts sent to the model
+
+    Returns:
+        Redis key like ``legal:terms:<sha256>``
+    """
+    digest = hashlib.sha256(model.encode())
+    for part in prompt_parts:
+        digest.update(b"\0")
+        digest.update(part.encode())
+    return f"legal:{kind}:{digest.hexdigest()}"
+
+
+async def get_cached_document(key: str) -> Any | None:
+    """Get a cached document, or None on a miss or when Redis is unavailable."""
+    try:
+        cache = await get_cache_service()
+        return await cache.get(key)
+    except (RuntimeError, RedisError):
+        return None
+
+
+async def cache_document(key: str, document: Any) -> None:
+    """Store a generated document; cache errors never fail generation."""
+    try:
+        cache = await get_cache_service()
+        await cache.set(key, document, ttl=DOCUMENT_CACHE_TTL)
+    except (RuntimeError, RedisError):
+        pass
@@ -0,0 +1,126 @@
+"""Wyciąganie obiektu JSON z odpowiedzi modelu dla agentów prawnych."""
+
+import re
+from typing import Any
+
+import orjson
+
+# Znaki istotne dla struktury JSON - reszta tekstu jest przeskakiwana w C
+_JSON_TOKEN_RE = re.compile(r'[{}"\\]')
+
+
+def extract_json_object(text: str) -> str | None:
+    """Return the first balanced ``{...}`` block in the model output.
+
+    Single forward pass over structural characters only. String literals
+    and escapes are tracked, so braces inside Polish legal text do not
+    count, and any commentary the model adds after the JSON is ignored.
+
+    Args:
+        text: Raw LLM output, possibly with a preamble or code fences
+
+    Returns:
+        The JSON object text, or None if no balanced object was found
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    skip_until = -1
+
+    for match in _JSON_TOKEN_RE.finditer(text, start):
+        pos = match.start()
+        if pos < skip_until:
+            continue
+        char = match.group()
+
+        if in_string:
+            if char == "\\":
+                skip_until = pos + 2
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:pos + 1]
+
+    return None
+
+
+class JsonFieldStream:
+    """Incremental scanner for a streamed JSON object.
+
+    Tracks brace depth and string state over the incoming text and returns
+    each top-level ``"key": value`` member as soon as it is complete, so
+    callers can use early fields before the model finishes the document.
+    Any preamble before the first ``{`` is ignored.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._pos = 0
+        self._member_start = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.done = False
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        """Consume a chunk of text and return newly completed fields."""
+        if self.done:
+            return []
+
+        self._buffer += chunk
+        buffer = self._buffer
+        fields: list[tuple[str, Any]] = []
+
+        i = self._pos
+        while i < len(buffer):
+            ch = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    self._member_start = i + 1
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    fields.extend(self._parse_member(buffer[self._member_start:i]))
+                    self.done = True
+                    break
+            elif ch == "," and self._depth == 1:
+                fields.extend(self._parse_member(buffer[self._member_start:i]))
+                self._member_start = i + 1
+            i += 1
+
+        # Drop already consumed text so the buffer only holds the open member
+        self._buffer = buffer[self._member_start:]
+        self._pos = i - self._member_start
+        self._member_start = 0
+        return fields
+
+    @staticmethod
+    def _parse_member(member: str) -> list[tuple[str, Any]]:
+        member = member.strip()
+        if not member:
+            return []
+        try:
+            return list(orjson.loads("{" + member + "}").items())
+        except orjson.JSONDecodeError:
+            return []
@@ -8,14 +8,14 @@ This module provides contract analysis specifically for Polish legal context:
 - Polish contract formalities and requirements
 """
 
-import json
-import re
 from typing import Any
 
+import orjson
 from crewai import Agent, Task, Crew, Process
 from langchain_openai import ChatOpenAI
 
 from app.core.config import settings
+from app.services.agents.legal._llm_json import extract_json_object
 
 
 # =============================================================================
@@ -159,6 +159,29 @@ def _build_abusive_clauses_context() -> str:
     return "\n".join(lines)
 
 
+# Backstory eksperta konsumenckiego jest stały - składamy go raz przy imporcie
+_ABUSIVE_CLAUSES_TEXT = "\n".join(
+    f"- {c['type']}: {c['description']} ({c['legal_basis']})"
+    for c in COMMON_ABUSIVE_CLAUSES
+)
+
+_CONSUMER_EXPERT_BACKSTORY = f"""Jesteś ekspertem od prawa konsumenckiego w Polsce.
+        Specjalizujesz się w identyfikacji klauzul abuzywnych zgodnie z:
+        - Art. 385¹-385³ Kodeksu cywilnego
+        - Rejestrem klauzul niedozwolonych UOKiK
+        - Orzecznictwem SOKiK
+
+        TYPOWE KLAUZULE NIEDOZWOLONE:
+        {_ABUSIVE_CLAUSES_TEXT}
+
+        KRYTERIA KLAUZULI NIEDOZWOLONEJ (Art. 385¹ KC):
+        1. Nie została uzgodniona indywidualnie
+        2. Kształtuje prawa/obowiązki konsumenta sprzecznie z dobrymi obyczajami
+        3. Rażąco narusza interesy konsumenta
+
+        SKUTEK: Klauzula nie wiąże konsumenta (Art. 385¹ § 2 KC)"""
+
+
 async def review_contract(
     contract_text: str,
     contract_type: str = "general",
@@ -390,10 +413,10 @@ async def review_contract(
     result = crew.kickoff()
     result_text = str(result)
 
-    json_match = re.search(r"\{[\s\S]*\}", result_text)
-    if json_match:
+    json_text = extract_json_object(result_text)
+    if json_text:
         try:
-            parsed = json.loads(json_match.group())
+            parsed = orjson.loads(json_text)
             return {
                 "success": True,
                 "analysis": parsed,
@@ -401,7 +424,7 @@ async def review_contract(
                 "is_b2c": is_b2c,
                 "legal_system": "polish",
             }
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             pass
 
     return {
@@ -613,17 +636,17 @@ async def analyze_employment_contract(
     result = crew.kickoff()
     result_text = str(result)
 
-    json_match = re.search(r"\{[\s\S]*\}", result_text)
-    if json_match:
+    json_text = extract_json_object(result_text)
+    if json_text:
         try:
-            parsed = json.loads(json_match.group())
+            parsed = orjson.loads(json_text)
             return {
                 "success": True,
                 "analysis": parsed,
                 "contract_subtype": contract_subtype,
                 "perspective": "employee" if employee_perspective else "employer",
             }
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             pass
 
     return {
@@ -725,12 +748,12 @@ async def compare_contracts(
     result = crew.kickoff()
     result_text = str(result)
 
-    json_match = re.search(r"\{[\s\S]*\}", result_text)
-    if json_match:
+    json_text = extract_json_object(result_text)
+    if json_text:
         try:
-            parsed = json.loads(json_match.group())
+            parsed = orjson.loads(json_text)
             return {"success": True, "comparison": parsed}
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             pass
 
     return {"success": True, "comparison": {"raw_content": result_text}}
@@ -753,29 +776,10 @@ async def check_abusive_clauses(
     """
     llm = _get_llm()
 
-    abusive_clauses_text = "\n".join([
-        f"- {c['type']}: {c['description']} ({c['legal_basis']})"
-        for c in COMMON_ABUSIVE_CLAUSES
-    ])
-
     consumer_expert = Agent(
         role="Specjalista Prawa Konsumenckiego",
         goal="Identyfikować klauzule niedozwolone w umowach konsumenckich",
-        backstory=f"""Jesteś ekspertem od prawa konsumenckiego w Polsce.
-        Specjalizujesz się w identyfikacji klauzul abuzywnych zgodnie z:
-        - Art. 385¹-385³ Kodeksu cywilnego
-        - Rejestrem klauzul niedozwolonych UOKiK
-        - Orzecznictwem SOKiK
-
-        TYPOWE KLAUZULE NIEDOZWOLONE:
-        {abusive_clauses_text}
-
-        KRYTERIA KLAUZULI NIEDOZWOLONEJ (Art. 385¹ KC):
-        1. Nie została uzgodniona indywidualnie
-        2. Kształtuje prawa/obowiązki konsumenta sprzecznie z dobrymi obyczajami
-        3. Rażąco narusza interesy konsumenta
-
-        SKUTEK: Klauzula nie wiąże konsumenta (Art. 385¹ § 2 KC)""",
+        backstory=_CONSUMER_EXPERT_BACKSTORY,
         tools=[],
         llm=llm,
         verbose=False,
@@ -842,12 +846,12 @@ async def check_abusive_clauses(
     result = crew.kickoff()
     result_text = str(result)
 
-    json_match = re.search(r"\{[\s\S]*\}", result_text)
-    if json_match:
+    json_text = extract_json_object(result_text)
+    if json_text:
         try:
-            parsed = json.loads(json_match.group())
+            parsed = orjson.loads(json_text)
             return {"success": True, "analysis": parsed}
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             pass
 
     return {"success": True, "analysis": {"raw_content": result_text}}
@@ -8,15 +8,26 @@ This module provides GDPR/RODO compliance assistance specifically for Polish con
 - IOD (Inspektor Ochrony Danych) - Data Protection Officer requirements
 """
 
-import json
-import re
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import aclosing
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
+import httpx
+import orjson
 from crewai import Agent, Task, Crew, Process
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 
 from app.core.config import settings
+from app.services.agents.llm_http import (
+    get_llm_http_async_client,
+    get_llm_http_client,
+    uses_llm_http_clients,
+)
+from app.services.agents.legal._llm_json import JsonFieldStream, extract_json_object
 
 
 # =============================================================================
@@ -122,12 +133,302 @@ DPIA_REQUIRED_CASES = [
 ]
 
 
+# =============================================================================
+# WZORCE ODPOWIEDZI JSON
+# =============================================================================
+# Statyczne - budowane raz przy imporcie, dzięki czemu treść promptu jest
+# identyczna między wywołaniami.
+
+_GDPR_JSON_SHAPE = """
+        Zwróć w formacie JSON:
+        {
+            "overall_compliance": {
+                "score": 0-100,
+                "status": "compliant/partially_compliant/non_compliant",
+                "critical_issues": liczba,
+                "high_issues": liczba,
+                "medium_issues": liczba
+            },
+            "legal_bases_assessment": {
+                "status": "ok/issues",
+                "purposes_with_bases": [
+                    {
+                        "purpose": "cel",
+                        "suggested_legal_basis": "podstawa z Art. 6 RODO",
+                        "valid": true/false,
+                        "notes": "uwagi"
+                    }
+                ],
+                "issues": ["problemy"]
+            },
+            "areas": [
+                {
+                    "area": "nazwa obszaru",
+                    "rodo_articles": ["artykuły RODO"],
+                    "status": "compliant/warning/non_compliant",
+                    "current_state": "obecny stan",
+                    "requirements": ["wymagania"],
+                    "gaps": ["braki"],
+                    "recommendations": ["rekomendacje"]
+                }
+            ],
+            "iod_assessment": {
+                "required": true/false,
+                "reasons": ["powody"],
+                "recommendation": "rekomendacja"
+            },
+            "dpia_assessment": {
+                "required": true/false,
+                "triggers": ["czynniki wymagające DPIA"],
+                "recommendation": "rekomendacja"
+            },
+            "required_documents": [
+                {
+                    "document": "nazwa dokumentu",
+                    "rodo_basis": "podstawa w RODO",
+                    "required": true/false,
+                    "exists": true/false,
+                    "priority": "critical/high/medium"
+                }
+            ],
+            "action_plan": [
+                {
+                    "action": "co zrobić",
+                    "rodo_article": "artykuł RODO",
+                    "priority": "critical/high/medium/low",
+                    "deadline_category": "natychmiast/30dni/90dni",
+                    "responsible": "kto",
+                    "estimated_effort": "niski/średni/wysoki"
+                }
+            ],
+            "risk_assessment": {
+                "uodo_inspection_risk": "low/medium/high",
+                "fine_risk_tier": "none/tier1/tier2/polish_public",
+                "max_potential_fine": "kwota",
+                "main_risk_factors": ["czynniki"]
+            },
+            "uodo_info": {
+                "name": "Urząd Ochrony Danych Osobowych",
+                "website": "https://uodo.gov.pl",
+                "complaint_right": "Art. 77 RODO - prawo do skargi"
+            },
+            "disclaimer": "Ocena ma charakter informacyjny. Zalecamy przeprowadzenie pełnego audytu RODO przez certyfikowanego IOD."
+        }
+        """
+
+
+# Pola JSON polityki prywatności (generate_privacy_policy może zamówić tylko część)
+_POLICY_JSON_FIELDS = {
+    "administrator": """"administrator": {
+                "name": "nazwa administratora",
+                "address": "adres administratora",
+                "nip": "NIP administratora",
+                "email": "email administratora"
+            }""",
+    "iod": """"iod": {
+                "appointed": true/false,
+                "name": "imię i nazwisko IOD lub nie wyznaczono",
+                "email": "email IOD"
+            }""",
+    "last_updated": '"last_updated": "data aktualizacji"',
+    "sections": """"sections": [
+                {
+                    "number": "§ 1",
+                    "title": "tytuł sekcji",
+                    "rodo_basis": "podstawa w RODO",
+                    "content_html": "treść sekcji w HTML"
+                }
+            ]""",
+    "full_text": '"full_text": "pełna treść polityki jako tekst"',
+    "full_html": '"full_html": "pełna treść jako HTML"',
+    "required_consents": """"required_consents": [
+                {
+                    "purpose": "cel",
+                    "consent_text": "treść zgody",
+                    "required": true/false
+                }
+            ]""",
+    "cookie_policy": """"cookie_policy": {
+                "included": true/false,
+                "cookie_types": ["typy cookies"],
+                "cookie_table": [
+                    {
+                        "name": "nazwa",
+                        "provider": "dostawca",
+                        "purpose": "cel",
+                        "expiry": "czas życia",
+                        "type": "necessary/functional/analytics/marketing"
+                    }
+                ]
+            }""",
+    "compliance_checklist": """"compliance_checklist": [
+                {
+                    "requirement": "wymóg RODO",
+                    "article": "artykuł",
+                    "fulfilled": true/false
+                }
+            ]""",
+}
+
+
+def _build_policy_json_shape(fields) -> str:
+    """Build the privacy policy JSON shape limited to the given fields."""
+    members = ",\n            ".join(
+        ['"title": "Polityka Prywatności"'] + [_POLICY_JSON_FIELDS[f] for f in fields]
+    )
+    return f"""
+        Zwróć w formacie JSON:
+        {{
+            {members}
+        }}
+        """
+
+
+_POLICY_JSON_SHAPE = _build_policy_json_shape(_POLICY_JSON_FIELDS)
+
+
+_DPA_JSON_SHAPE = """
+        Zwróć w formacie JSON:
+        {
+            "title": "Umowa Powierzenia Przetwarzania Danych Osobowych",
+            "legal_basis": "Art. 28 Rozporządzenia (UE) 2016/679 (RODO)",
+            "parties": {
+                "controller": {
+                    "role": "Administrator",
+                    "name": "nazwa administratora",
+                    "address": "adres administratora",
+                    "nip": "NIP administratora"
+                },
+                "processor": {
+                    "role": "Podmiot Przetwarzający",
+                    "name": "nazwa podmiotu przetwarzającego",
+                    "address": "adres podmiotu przetwarzającego",
+                    "nip": "NIP podmiotu przetwarzającego"
+                }
+            },
+            "processing_details": {
+                "subject": "przedmiot przetwarzania",
+                "duration": "czas przetwarzania",
+                "location": "lokalizacja",
+                "data_categories": ["kategorie danych osobowych"],
+                "data_subjects": ["kategorie osób"]
+            },
+            "sections": [
+                {
+                    "number": "§ 1",
+                    "title": "tytuł",
+                    "rodo_basis": "artykuł RODO",
+                    "content": "treść"
+                }
+            ],
+            "processor_obligations": [
+                {
+                    "obligation": "obowiązek",
+                    "rodo_article": "Art. 28.3.x",
+                    "description": "opis"
+                }
+            ],
+            "full_text": "pełna treść umowy",
+            "annexes": [
+                {
+                    "annex_number": "Załącznik 1",
+                    "title": "tytuł załącznika",
+                    "content": "zawartość lub opis"
+                }
+            ],
+            "signatures": {
+                "controller_signature": "[podpis Administratora]",
+                "processor_signature": "[podpis Podmiotu Przetwarzającego]",
+                "date": "[data]",
+                "place": "[miejsce]"
+            }
+        }
+        """
+
+
+# Stała część zadania RCPD - przed danymi firmy, żeby prefiks promptu się nie zmieniał
+_RCPD_TASK = """
+        Stwórz szablon RCPD (Rejestr Czynności Przetwarzania Danych) zgodny z Art. 30 RODO
+        dla administratora opisanego w sekcji DANE DO SZABLONU RCPD na końcu zadania.
+
+        STWÓRZ SZABLON RCPD ZAWIERAJĄCY:
+
+        1. DANE ADMINISTRATORA
+        2. DANE IOD (jeśli wyznaczony)
+        3. TABELA CZYNNOŚCI PRZETWARZANIA z kolumnami:
+           - Lp.
+           - Nazwa czynności
+           - Cel przetwarzania
+           - Podstawa prawna (Art. 6 RODO)
+           - Kategorie osób
+           - Kategorie danych
+           - Odbiorcy danych
+           - Transfer poza UE (tak/nie + podstawa)
+           - Termin usunięcia
+           - Środki bezpieczeństwa
+        """
+
+
+_RCPD_JSON_SHAPE = """
+        Zwróć w formacie JSON:
+        {
+            "title": "Rejestr Czynności Przetwarzania Danych Osobowych",
+            "legal_basis": "Art. 30 ust. 1 RODO",
+            "administrator": {
+                "name": "nazwa administratora",
+                "nip": "NIP administratora",
+                "address": "[adres]",
+                "contact": "[email/telefon]"
+            },
+            "iod": {
+                "appointed": true/false,
+                "name": "imię i nazwisko IOD lub nie wyznaczono",
+                "contact": "kontakt IOD"
+            },
+            "last_updated": "data aktualizacji",
+            "processing_activities": [
+                {
+                    "id": 1,
+                    "activity_name": "nazwa czynności",
+                    "purpose": "cel przetwarzania",
+                    "legal_basis": "podstawa z Art. 6 RODO",
+                    "data_subjects": ["kategorie osób"],
+                    "data_categories": ["kategorie danych"],
+                    "recipients": ["odbiorcy"],
+                    "third_country_transfer": {
+                        "occurs": false,
+                        "countries": [],
+                        "safeguards": ""
+                    },
+                    "retention_period": "okres przechowywania",
+                    "security_measures": ["środki bezpieczeństwa"]
+                }
+            ],
+            "template_notes": [
+                "Instrukcje wypełniania RCPD"
+            ],
+            "review_schedule": "Przegląd co najmniej raz w roku"
+        }
+        """
+
+
+@uses_llm_http_clients
+@lru_cache(maxsize=1)
 def _get_llm():
-    """Get LLM instance for GDPR analysis."""
+    """Get shared LLM instance for GDPR analysis.
+
+    Cached so all GDPR generators reuse one client and its connection pool.
+    """
     return ChatOpenAI(
         model="gpt-4o-mini",
         temperature=0.3,
         api_key=settings.OPENAI_API_KEY,
+        # Zawieszone wywołanie lepiej ponowić niż czekać na nie kilka minut
+        timeout=httpx.Timeout(45, connect=5),
+        max_retries=2,
+        http_client=get_llm_http_client(),
+        # astream idzie przez klienta async - bez tego ma on domyślną pulę połączeń
+        http_async_client=get_llm_http_async_client(),
     )
 
 
@@ -136,7 +437,9 @@ def _build_rodo_context() -> str:
     lines = ["PODSTAWY PRAWNE RODO:"]
 
     for key, data in RODO_ARTICLES.items():
-        lines.append(f"\n{data['article']} - {data['title']}:")
+        # Nie każdy wpis ma tytuł (np. prawa osób, obowiązki administratora)
+        title = f" - {data['title']}" if "title" in data else ""
+        lines.append(f"\n{data['article']}{title}:")
         if "bases" in data:
             for base in data["bases"]:
                 lines.append(f"  - {base}")
@@ -154,6 +457,88 @@ def _build_rodo_context() -> str:
     return "\n".join(lines)
 
 
+# Backstory audytora nie zależy od danych firmy - składamy go raz przy imporcie
+_IOD_CASES_TEXT = "\n".join(f"  - {case}" for case in IOD_REQUIRED_CASES)
+_DPIA_CASES_TEXT = "\n".join(f"  - {case}" for case in DPIA_REQUIRED_CASES)
+
+_GDPR_EXPERT_BACKSTORY = f"""Jesteś certyfikowanym Inspektorem Ochrony Danych (IOD) z 10-letnim
+        doświadczeniem w Polsce. Specjalizujesz się w:
+        - RODO (Rozporządzenie 2016/679)
+        - Polskiej ustawie o ochronie danych osobowych (2018)
+        - Wytycznych UODO i EROD
+
+        {_build_rodo_context()}
+
+        KIEDY WYMAGANY IOD (Art. 37 RODO):
+        {_IOD_CASES_TEXT}
+
+        KIEDY WYMAGANA DPIA (Art. 35 RODO):
+        {_DPIA_CASES_TEXT}
+
+        KARY:
+        - Tier 1: do 10 mln EUR lub 2% obrotu (Art. 83 ust. 4 RODO)
+        - Tier 2: do 20 mln EUR lub 4% obrotu (Art. 83 ust. 5 RODO)
+        - Podmioty publiczne w Polsce: do 100 000 PLN
+
+        WAŻNE: Twoja analiza ma charakter informacyjny. Zalecasz pełny audyt RODO."""
+
+
+def _derive_rodo_facts(
+    number_of_data_subjects: str,
+    uses_profiling: bool,
+    processes_special_categories: bool,
+    is_public_entity: bool,
+) -> dict[str, tuple[Any, str]]:
+    """Derive classifications that follow directly from the input flags.
+
+    Returns only the facts that can be decided without the LLM, as
+    ``{fact: (value, reason)}``. Undetermined facts are left to the model.
+    """
+    facts: dict[str, tuple[Any, str]] = {}
+    large_scale = number_of_data_subjects.strip().startswith(">")
+
+    # Próg kary RODO zależy od rodzaju naruszenia, nie od kategorii danych -
+    # ustalamy tylko odrębny limit dla podmiotów publicznych (art. 102 ustawy)
+    if is_public_entity:
+        facts["iod_required"] = (True, IOD_REQUIRED_CASES[0])
+        facts["fine_risk_tier"] = ("polish_public", POLISH_DATA_PROTECTION_LAW["kary"]["polish_public"])
+
+    if large_scale and processes_special_categories:
+        facts.setdefault("iod_required", (True, IOD_REQUIRED_CASES[2]))
+        facts["dpia_required"] = (True, DPIA_REQUIRED_CASES[1])
+    if large_scale and uses_profiling:
+        facts.setdefault("iod_required", (True, IOD_REQUIRED_CASES[1]))
+        facts.setdefault("dpia_required", (True, DPIA_REQUIRED_CASES[0]))
+
+    return facts
+
+
+# Fakt -> (sekcja, pole) w JSON oceny
+_RODO_FACT_FIELDS = (
+    ("iod_required", "iod_assessment", "required"),
+    ("dpia_required", "dpia_assessment", "required"),
+    ("fine_risk_tier", "risk_assessment", "fine_risk_tier"),
+)
+
+
+def _apply_rodo_facts(assessment: dict[str, Any], facts: dict[str, tuple[Any, str]]) -> None:
+    """Overwrite model output with the facts derived from the input flags.
+
+    The model may return null or a string for a section. A missing or null
+    section becomes an object holding just the derived fact; any other value
+    is kept under "summary" next to it.
+    """
+    for fact, section, field in _RODO_FACT_FIELDS:
+        if fact not in facts:
+            continue
+        current = assessment.get(section)
+        if current is None:
+            assessment[section] = {}
+        elif not isinstance(current, dict):
+            assessment[section] = {"summary": current}
+        assessment[section][field] = facts[fact][0]
+
+
 async def check_gdpr_compliance(
     business_description: str,
     data_collected: list[str],
@@ -187,34 +572,10 @@ async def check_gdpr_compliance(
     """
     llm = _get_llm()
 
-    rodo_context = _build_rodo_context()
-
-    iod_cases = "\n".join([f"  - {case}" for case in IOD_REQUIRED_CASES])
-    dpia_cases = "\n".join([f"  - {case}" for case in DPIA_REQUIRED_CASES])
-
     gdpr_expert = Agent(
         role="Ekspert RODO / Inspektor Ochrony Danych",
         goal="Przeprowadzać audyty zgodności z RODO i polskimi przepisami o ochronie danych",
-        backstory=f"""Jesteś certyfikowanym Inspektorem Ochrony Danych (IOD) z 10-letnim
-        doświadczeniem w Polsce. Specjalizujesz się w:
-        - RODO (Rozporządzenie 2016/679)
-        - Polskiej ustawie o ochronie danych osobowych (2018)
-        - Wytycznych UODO i EROD
-
-        {rodo_context}
-
-        KIEDY WYMAGANY IOD (Art. 37 RODO):
-        {iod_cases}
-
-        KIEDY WYMAGANA DPIA (Art. 35 RODO):
-        {dpia_cases}
-
-        KARY:
-        - Tier 1: do 10 mln EUR lub 2% obrotu (Art. 83 ust. 4 RODO)
-        - Tier 2: do 20 mln EUR lub 4% obrotu (Art. 83 ust. 5 RODO)
-        - Podmioty publiczne w Polsce: do 100 000 PLN
-
-        WAŻNE: Twoja analiza ma charakter informacyjny. Zalecasz pełny audyt RODO.""",
+        backstory=_GDPR_EXPERT_BACKSTORY,
         tools=[],
         llm=llm,
         verbose=False,
@@ -224,8 +585,25 @@ async def check_gdpr_compliance(
     purposes_text = "\n".join([f"- {p}" for p in data_processing_purposes])
     sharing_text = "\n".join([f"- {s}" for s in (third_party_sharing or ["brak"])])
 
-    task = Task(
-        description=f"""
+    known_facts = _derive_rodo_facts(
+        number_of_data_subjects=number_of_data_subjects,
+        uses_profiling=uses_profiling,
+        processes_special_categories=processes_special_categories,
+        is_public_entity=is_public_entity,
+    )
+    facts_text = ""
+    if known_facts:
+        facts_lines = "\n".join(
+            f"        - {fact.upper()}={str(value).lower()} ({reason})"
+            for fact, (value, reason) in known_facts.items()
+        )
+        facts_text = f"""
+        USTALONE FAKTY (wynikają wprost z danych - nie oceniaj ich ponownie,
+        w JSON wpisz te wartości i skup się na rekomendacjach):
+{facts_lines}
+"""
+
+    header = f"""
         Przeprowadź kompleksową ocenę zgodności z RODO:
 
         OPIS DZIAŁALNOŚCI:
@@ -250,115 +628,43 @@ async def check_gdpr_compliance(
         OBECNY STAN:
         - Polityka prywatności: {"TAK" if has_privacy_policy else "NIE"}
         - Mechanizm zgód: {"TAK" if has_consent_mechanism else "NIE"}
+{facts_text}
+        PRZEPROWADŹ AUDYT W OBSZARACH (artykuły RODO znasz z kontekstu prawnego):
 
-        PRZEPROWADŹ AUDYT W OBSZARACH:
-
-        1. PODSTAWY PRAWNE PRZETWARZANIA (Art. 6 RODO)
+        1. PODSTAWY PRAWNE
            - Czy każdy cel ma właściwą podstawę?
            - Czy zgody są poprawnie zbierane?
 
-        2. OBOWIĄZKI INFORMACYJNE (Art. 13-14 RODO)
+        2. OBOWIĄZKI INFORMACYJNE
            - Czy polityka prywatności jest kompletna?
            - Czy spełnia wymogi formalne?
 
-        3. PRAWA OSÓB (Art. 15-22 RODO)
+        3. PRAWA OSÓB
            - Czy zapewniono realizację wszystkich praw?
            - Czy są procedury obsługi żądań?
 
-        4. BEZPIECZEŃSTWO (Art. 32 RODO)
+        4. BEZPIECZEŃSTWO
            - Środki techniczne i organizacyjne
            - Pseudonimizacja, szyfrowanie
 
-        5. DOKUMENTACJA (Art. 30 RODO - RCPD)
+        5. DOKUMENTACJA (RCPD)
            - Czy prowadzony jest rejestr czynności?
 
-        6. IOD - INSPEKTOR OCHRONY DANYCH (Art. 37 RODO)
+        6. IOD
            - Czy wymagane wyznaczenie IOD?
 
-        7. DPIA - OCENA SKUTKÓW (Art. 35 RODO)
+        7. DPIA
            - Czy wymagana DPIA?
 
-        8. TRANSFER DANYCH (Art. 44-49 RODO)
+        8. TRANSFER DANYCH
            - Czy transfer poza UE jest zgodny?
 
-        9. UMOWY POWIERZENIA (Art. 28 RODO)
+        9. UMOWY POWIERZENIA
            - Czy są umowy z procesorami?
+        """
 
-        Zwróć w formacie JSON:
-        {{
-            "overall_compliance": {{
-                "score": 0-100,
-                "status": "compliant/partially_compliant/non_compliant",
-                "critical_issues": liczba,
-                "high_issues": liczba,
-                "medium_issues": liczba
-            }},
-            "legal_bases_assessment": {{
-                "status": "ok/issues",
-                "purposes_with_bases": [
-                    {{
-                        "purpose": "cel",
-                        "suggested_legal_basis": "podstawa z Art. 6 RODO",
-                        "valid": true/false,
-                        "notes": "uwagi"
-                    }}
-                ],
-                "issues": ["problemy"]
-            }},
-            "areas": [
-                {{
-                    "area": "nazwa obszaru",
-                    "rodo_articles": ["artykuły RODO"],
-                    "status": "compliant/warning/non_compliant",
-                    "current_state": "obecny stan",
-                    "requirements": ["wymagania"],
-                    "gaps": ["braki"],
-                    "recommendations": ["rekomendacje"]
-                }}
-            ],
-            "iod_assessment": {{
-                "required": true/false,
-                "reasons": ["powody"],
-                "recommendation": "rekomendacja"
-            }},
-            "dpia_assessment": {{
-                "required": true/false,
-                "triggers": ["czynniki wymagające DPIA"],
-                "recommendation": "rekomendacja"
-            }},
-            "required_documents": [
-                {{
-                    "document": "nazwa dokumentu",
-                    "rodo_basis": "podstawa w RODO",
-                    "required": true/false,
-                    "exists": true/false,
-                    "priority": "critical/high/medium"
-                }}
-            ],
-            "action_plan": [
-                {{
-                    "action": "co zrobić",
-                    "rodo_article": "artykuł RODO",
-                    "priority": "critical/high/medium/low",
-                    "deadline_category": "natychmiast/30dni/90dni",
-                    "responsible": "kto",
-                    "estimated_effort": "niski/średni/wysoki"
-                }}
-            ],
-            "risk_assessment": {{
-                "uodo_inspection_risk": "low/medium/high",
-                "fine_risk_tier": "none/tier1/tier2",
-                "max_potential_fine": "kwota",
-                "main_risk_factors": ["czynniki"]
-            }},
-            "uodo_info": {{
-                "name": "Urząd Ochrony Danych Osobowych",
-                "website": "https://uodo.gov.pl",
-                "complaint_right": "Art. 77 RODO - prawo do skargi"
-            }},
-            "disclaimer": "Ocena ma charakter informacyjny. Zalecamy przeprowadzenie pełnego audytu RODO przez certyfikowanego IOD."
-        }}
-        """,
+    task = Task(
+        description=f"{header}\n{_GDPR_JSON_SHAPE}",
         agent=gdpr_expert,
         expected_output="Comprehensive RODO compliance assessment in JSON format",
     )
@@ -370,71 +676,56 @@ async def check_gdpr_compliance(
         verbose=False,
     )
 
-    result = crew.kickoff()
+    result = await asyncio.to_thread(crew.kickoff)
     result_text = str(result)
 
-    json_match = re.search(r"\{[\s\S]*\}", result_text)
-    if json_match:
+    json_text = extract_json_object(result_text)
+    if json_text:
         try:
-            parsed = json.loads(json_match.group())
+            parsed = orjson.loads(json_text)
+            _apply_rodo_facts(parsed, known_facts)
             return {"success": True, "assessment": parsed}
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             pass
 
     return {"success": True, "assessment": {"raw_content": result_text}}
 
 
-async def generate_privacy_policy(
-    company_name: str,
-    company_address: str,
-    company_nip: str = "",
-    business_type: str = "",
-    data_collected: list[str] | None = None,
-    data_purposes: list[str] | None = None,
-    legal_bases: list[str] | None = None,
-    third_parties: list[str] | None = None,
-    cookies_used: bool = True,
-    analytics_tools: list[str] | None = None,
-    contact_email: str = "",
-    iod_name: str = "",
-    iod_email: str = "",
-    data_retention_periods: dict[str, str] | None = None,
-    transfers_outside_eu: bool = False,
-    transfer_countries: list[str] | None = None,
-) -> dict[str, Any]:
-    """Generate a RODO-compliant privacy policy for Polish business.
-
-    Args:
-        company_name: Company legal name
-        company_address: Company address
-        company_nip: Company NIP (tax ID)
-        business_type: Type of business/website
-        data_collected: Types of personal data collected
-        data_purposes: Purposes for data processing
-        legal_bases: Legal bases for processing (Art. 6 RODO)
-        third_parties: Third parties receiving data
-        cookies_used: Whether cookies are used
-        analytics_tools: Analytics tools used
-        contact_email: Contact email for privacy matters
-        iod_name: Data Protection Officer name (if appointed)
-        iod_email: DPO contact email
-        data_retention_periods: Retention periods by data type
-        transfers_outside_eu: Whether data is transferred outside EU
-        transfer_countries: Countries where data is transferred
-
-    Returns:
-        Dictionary with complete privacy policy
-    """
-    llm = _get_llm()
+def _build_privacy_policy_prompts(
+    company_name: str,
+    company_address: str,
+    company_nip: str = "",
+    business_type: str = "",
+    data_collected: list[str] | None = None,
+    data_purposes: list[str] | None = None,
+    legal_bases: list[str] | None = None,
+    third_parties: list[str] | None = None,
+    cookies_used: bool = True,
+    analytics_tools: list[str] | None = None,
+    contact_email: str = "",
+    iod_name: str = "",
+    iod_email: str = "",
+    data_retention_periods: dict[str, str] | None = None,
+    transfers_outside_eu: bool = False,
+    transfer_countries: list[str] | None = None,
+    sections_requested: set[str] | None = None,
+) -> tuple[str, str]:
+    """Build (backstory, task description) for the privacy policy writer."""
+    if sections_requested is None:
+        json_shape = _POLICY_JSON_SHAPE
+    else:
+        unknown = sections_requested - _POLICY_JSON_FIELDS.keys()
+        if unknown:
+            raise ValueError(f"Unknown privacy policy fields: {', '.join(sorted(unknown))}")
+        json_shape = _build_policy_json_shape(
+            [f for f in _POLICY_JSON_FIELDS if f in sections_requested]
+        )
 
     rodo_rights = "\n".join([
         f"  - {desc}" for desc in RODO_ARTICLES["prawa_osob"]["rights"].values()
     ])
 
-    policy_writer = Agent(
-        role="Specjalista ds. Polityki Prywatności RODO",
-        goal="Tworzyć kompleksowe polityki prywatności zgodne z RODO i polskim prawem",
-        backstory=f"""Jesteś specjalistą od tworzenia dokumentacji RODO dla polskich firm.
+    backstory = f"""Jesteś specjalistą od tworzenia dokumentacji RODO dla polskich firm.
         Tworzysz polityki prywatności, które są:
         - Zgodne z Art. 13-14 RODO
         - Zrozumiałe dla przeciętnego użytkownika
@@ -456,11 +747,7 @@ async def generate_privacy_policy(
         12. Informacja o profilowaniu
 
         UODO: {POLISH_DATA_PROTECTION_LAW['uodo']['name']}
-        Adres: {POLISH_DATA_PROTECTION_LAW['uodo']['address']}""",
-        tools=[],
-        llm=llm,
-        verbose=False,
-    )
+        Adres: {POLISH_DATA_PROTECTION_LAW['uodo']['address']}"""
 
     data_text = "\n".join([f"- {d}" for d in (data_collected or ["dane kontaktowe"])])
     purposes_text = "\n".join([f"- {p}" for p in (data_purposes or ["realizacja usługi"])])
@@ -472,8 +759,7 @@ async def generate_privacy_policy(
     ]) or "Zgodnie z celami przetwarzania"
     transfer_countries_text = ", ".join(transfer_countries or [])
 
-    task = Task(
-        description=f"""
+    header = f"""
         Stwórz politykę prywatności zgodną z RODO (Art. 13-14):
 
         ADMINISTRATOR DANYCH:
@@ -507,6 +793,8 @@ async def generate_privacy_policy(
 
         TRANSFER POZA UE: {"Tak - kraje: " + transfer_countries_text if transfers_outside_eu else "Nie"}
 
+        DATA AKTUALIZACJI: {datetime.now().strftime('%d.%m.%Y')}
+
         POLITYKA MUSI ZAWIERAĆ WSZYSTKIE ELEMENTY Z ART. 13 RODO:
 
         1. ADMINISTRATOR DANYCH (§1)
@@ -531,60 +819,91 @@ async def generate_privacy_policy(
         12. ZMIANY POLITYKI (§12)
         13. KONTAKT (§13)
 
-        Zwróć w formacie JSON:
-        {{
-            "title": "Polityka Prywatności",
-            "administrator": {{
-                "name": "{company_name}",
-                "address": "{company_address}",
-                "nip": "{company_nip or '[NIP]'}",
-                "email": "{contact_email or '[EMAIL]'}"
-            }},
-            "iod": {{
-                "appointed": {"true" if iod_name else "false"},
-                "name": "{iod_name or 'nie wyznaczono'}",
-                "email": "{iod_email or ''}"
-            }},
-            "last_updated": "{datetime.now().strftime('%d.%m.%Y')}",
-            "sections": [
-                {{
-                    "number": "§ 1",
-                    "title": "tytuł sekcji",
-                    "rodo_basis": "podstawa w RODO",
-                    "content_html": "treść sekcji w HTML"
-                }}
-            ],
-            "full_text": "pełna treść polityki jako tekst",
-            "full_html": "pełna treść jako HTML",
-            "required_consents": [
-                {{
-                    "purpose": "cel",
-                    "consent_text": "treść zgody",
-                    "required": true/false
-                }}
-            ],
-            "cookie_policy": {{
-                "included": {"true" if cookies_used else "false"},
-                "cookie_types": ["typy cookies"],
-                "cookie_table": [
-                    {{
-                        "name": "nazwa",
-                        "provider": "dostawca",
-                        "purpose": "cel",
-                        "expiry": "czas życia",
-                        "type": "necessary/functional/analytics/marketing"
-                    }}
-                ]
-            }},
-            "compliance_checklist": [
-                {{
-                    "requirement": "wymóg RODO",
-                    "article": "artykuł",
-                    "fulfilled": true/false
-                }}
-            ]
-        }}
-        """,
+        Dane administratora, IOD, datę aktualizacji i cookies w JSON uzupełnij wartościami podanymi powyżej.
+        """
+
+    description = f"{header}\n{json_shape}"
+
+    return backstory, description
+
+
+async def generate_privacy_policy(
+    company_name: str,
+    company_address: str,
+    company_nip: str = "",
+    business_type: str = "",
+    data_collected: list[str] | None = None,
+    data_purposes: list[str] | None = None,
+    legal_bases: list[str] | None = None,
+    third_parties: list[str] | None = None,
+    cookies_used: bool = True,
+    analytics_tools: list[str] | None = None,
+    contact_email: str = "",
+    iod_name: str = "",
+    iod_email: str = "",
+    data_retention_periods: dict[str, str] | None = None,
+    transfers_outside_eu: bool = False,
+    transfer_countries: list[str] | None = None,
+    sections_requested: set[str] | None = None,
+) -> dict[str, Any]:
+    """Generate a RODO-compliant privacy policy for Polish business.
+
+    Args:
+        company_name: Company legal name
+        company_address: Company address
+        company_nip: Company NIP (tax ID)
+        business_type: Type of business/website
+        data_collected: Types of personal data collected
+        data_purposes: Purposes for data processing
+        legal_bases: Legal bases for processing (Art. 6 RODO)
+        third_parties: Third parties receiving data
+        cookies_used: Whether cookies are used
+        analytics_tools: Analytics tools used
+        contact_email: Contact email for privacy matters
+        iod_name: Data Protection Officer name (if appointed)
+        iod_email: DPO contact email
+        data_retention_periods: Retention periods by data type
+        transfers_outside_eu: Whether data is transferred outside EU
+        transfer_countries: Countries where data is transferred
+        sections_requested: Top-level policy fields to generate (e.g.
+            {"full_text"}); None generates all of them
+
+    Returns:
+        Dictionary with complete privacy policy
+    """
+    llm = _get_llm()
+
+    backstory, description = _build_privacy_policy_prompts(
+        company_name=company_name,
+        company_address=company_address,
+        company_nip=company_nip,
+        business_type=business_type,
+        data_collected=data_collected,
+        data_purposes=data_purposes,
+        legal_bases=legal_bases,
+        third_parties=third_parties,
+        cookies_used=cookies_used,
+        analytics_tools=analytics_tools,
+        contact_email=contact_email,
+        iod_name=iod_name,
+        iod_email=iod_email,
+        data_retention_periods=data_retention_periods,
+        transfers_outside_eu=transfers_outside_eu,
+        transfer_countries=transfer_countries,
+        sections_requested=sections_requested,
+    )
+
+    policy_writer = Agent(
+        role="Specjalista ds. Polityki Prywatności RODO",
+        goal="Tworzyć kompleksowe polityki prywatności zgodne z RODO i polskim prawem",
+        backstory=backstory,
+        tools=[],
+        llm=llm,
+        verbose=False,
+    )
+
+    task = Task(
+        description=description,
         agent=policy_writer,
         expected_output="Complete RODO-compliant privacy policy in JSON format",
     )
@@ -596,20 +915,79 @@ async def generate_privacy_policy(
         verbose=False,
     )
 
-    result = crew.kickoff()
+    result = await asyncio.to_thread(crew.kickoff)
     result_text = str(result)
 
-    json_match = re.search(r"\{[\s\S]*\}", result_text)
-    if json_match:
+    json_text = extract_json_object(result_text)
+    if json_text:
         try:
-            parsed = json.loads(json_match.group())
+            parsed = orjson.loads(json_text)
             return {"success": True, "privacy_policy": parsed}
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             pass
 
     return {"success": True, "privacy_policy": {"full_text": result_text}}
 
 
+async def generate_privacy_policy_stream(
+    company_name: str,
+    company_address: str,
+    company_nip: str = "",
+    business_type: str = "",
+    data_collected: list[str] | None = None,
+    data_purposes: list[str] | None = None,
+    legal_bases: list[str] | None = None,
+    third_parties: list[str] | None = None,
+    cookies_used: bool = True,
+    analytics_tools: list[str] | None = None,
+    contact_email: str = "",
+    iod_name: str = "",
+    iod_email: str = "",
+    data_retention_periods: dict[str, str] | None = None,
+    transfers_outside_eu: bool = False,
+    transfer_countries: list[str] | None = None,
+    sections_requested: set[str] | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Stream a RODO-compliant privacy policy section by section.
+
+    Same inputs as ``generate_privacy_policy``. Instead of waiting for the
+    whole document, the LLM output is streamed and every top-level field of
+    the policy JSON (e.g. ``administrator``, ``iod``, ``sections``) is
+    yielded as ``{field: value}`` as soon as it is complete. Merging all
+    yielded dicts gives the full policy.
+    """
+    backstory, description = _build_privacy_policy_prompts(
+        company_name=company_name,
+        company_address=company_address,
+        company_nip=company_nip,
+        business_type=business_type,
+        data_collected=data_collected,
+        data_purposes=data_purposes,
+        legal_bases=legal_bases,
+        third_parties=third_parties,
+        cookies_used=cookies_used,
+        analytics_tools=analytics_tools,
+        contact_email=contact_email,
+        iod_name=iod_name,
+        iod_email=iod_email,
+        data_retention_periods=data_retention_periods,
+        transfers_outside_eu=transfers_outside_eu,
+        transfer_countries=transfer_countries,
+        sections_requested=sections_requested,
+    )
+
+    messages = [SystemMessage(content=backstory), HumanMessage(content=description)]
+    scanner = JsonFieldStream()
+
+    # aclosing - przerwany strumień od razu zamyka odpowiedź HTTP modelu
+    async with aclosing(_get_llm().astream(messages)) as stream:
+        async for chunk in stream:
+            for key, value in scanner.feed(chunk.content):
+                yield {key: value}
+            if scanner.done:
+                break
+
+
 async def generate_data_processing_agreement(
     controller_name: str,
     controller_address: str,
@@ -682,8 +1060,7 @@ async def generate_data_processing_agreement(
     data_text = "\n".join([f"- {d}" for d in (data_categories or ["dane kontaktowe"])])
     subjects_text = "\n".join([f"- {s}" for s in (data_subjects or ["klienci", "pracownicy"])])
 
-    task = Task(
-        description=f"""
+    header = f"""
         Stwórz umowę powierzenia przetwarzania danych (DPA) zgodną z Art. 28 RODO:
 
         ADMINISTRATOR DANYCH:
@@ -732,62 +1109,11 @@ async def generate_data_processing_agreement(
         § 10. ODPOWIEDZIALNOŚĆ
         § 11. POSTANOWIENIA KOŃCOWE
 
-        Zwróć w formacie JSON:
-        {{
-            "title": "Umowa Powierzenia Przetwarzania Danych Osobowych",
-            "legal_basis": "Art. 28 Rozporządzenia (UE) 2016/679 (RODO)",
-            "parties": {{
-                "controller": {{
-                    "role": "Administrator",
-                    "name": "{controller_name}",
-                    "address": "{controller_address}",
-                    "nip": "{controller_nip or '[NIP]'}"
-                }},
-                "processor": {{
-                    "role": "Podmiot Przetwarzający",
-                    "name": "{processor_name or '[PROCESOR]'}",
-                    "address": "{processor_address or '[ADRES]'}",
-                    "nip": "{processor_nip or '[NIP]'}"
-                }}
-            }},
-            "processing_details": {{
-                "subject": "{processing_subject or 'Świadczenie usług'}",
-                "duration": "{processing_duration or 'czas trwania umowy głównej'}",
-                "location": "{processing_location}",
-                "data_categories": {json.dumps(data_categories or ['dane kontaktowe'])},
-                "data_subjects": {json.dumps(data_subjects or ['klienci'])}
-            }},
-            "sections": [
-                {{
-                    "number": "§ 1",
-                    "title": "tytuł",
-                    "rodo_basis": "artykuł RODO",
-                    "content": "treść"
-                }}
-            ],
-            "processor_obligations": [
-                {{
-                    "obligation": "obowiązek",
-                    "rodo_article": "Art. 28.3.x",
-                    "description": "opis"
-                }}
-            ],
-            "full_text": "pełna treść umowy",
-            "annexes": [
-                {{
-                    "annex_number": "Załącznik 1",
-                    "title": "tytuł załącznika",
-                    "content": "zawartość lub opis"
-                }}
-            ],
-            "signatures": {{
-                "controller_signature": "[podpis Administratora]",
-                "processor_signature": "[podpis Podmiotu Przetwarzającego]",
-                "date": "[data]",
-                "place": "[miejsce]"
-            }}
-        }}
-        """,
+        Dane stron i szczegóły przetwarzania w JSON uzupełnij wartościami podanymi powyżej.
+        """
+
+    task = Task(
+        description=f"{header}\n{_DPA_JSON_SHAPE}",
         agent=dpa_writer,
         expected_output="Complete DPA in JSON format",
     )
@@ -799,15 +1125,15 @@ async def generate_data_processing_agreement(
         verbose=False,
     )
 
-    result = crew.kickoff()
+    result = await asyncio.to_thread(crew.kickoff)
     result_text = str(result)
 
-    json_match = re.search(r"\{[\s\S]*\}", result_text)
-    if json_match:
+    json_text = extract_json_object(result_text)
+    if json_text:
         try:
-            parsed = json.loads(json_match.group())
+            parsed = orjson.loads(json_text)
             return {"success": True, "dpa": parsed}
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             pass
 
     return {"success": True, "dpa": {"full_text": result_text}}
@@ -861,19 +1187,18 @@ async def generate_rcpd_template(
         verbose=False,
     )
 
-    activities_text = ""
-    if processing_activities:
-        for i, act in enumerate(processing_activities, 1):
-            activities_text += f"""
+    activities_text = "".join([
+        f"""
             {i}. {act.get('name', 'Czynność')}
                - Cel: {act.get('purpose', 'do określenia')}
                - Dane: {', '.join(act.get('data_categories', ['dane osobowe']))}
                - Osoby: {', '.join(act.get('data_subjects', ['klienci']))}
             """
+        for i, act in enumerate(processing_activities or [], 1)
+    ])
 
-    task = Task(
-        description=f"""
-        Stwórz szablon RCPD (Rejestr Czynności Przetwarzania Danych) zgodny z Art. 30 RODO:
+    header = f"""
+        DANE DO SZABLONU RCPD
 
         ADMINISTRATOR:
         - Nazwa: {company_name}
@@ -881,65 +1206,16 @@ async def generate_rcpd_template(
         - IOD: {iod_name or "nie wyznaczono"}
         - Kontakt IOD: {iod_contact or "nie dotyczy"}
 
+        DATA AKTUALIZACJI: {datetime.now().strftime('%d.%m.%Y')}
+
         ZNANE CZYNNOŚCI PRZETWARZANIA:
         {activities_text or "Do uzupełnienia"}
 
-        STWÓRZ SZABLON RCPD ZAWIERAJĄCY:
-
-        1. DANE ADMINISTRATORA
-        2. DANE IOD (jeśli wyznaczony)
-        3. TABELA CZYNNOŚCI PRZETWARZANIA z kolumnami:
-           - Lp.
-           - Nazwa czynności
-           - Cel przetwarzania
-           - Podstawa prawna (Art. 6 RODO)
-           - Kategorie osób
-           - Kategorie danych
-           - Odbiorcy danych
-           - Transfer poza UE (tak/nie + podstawa)
-           - Termin usunięcia
-           - Środki bezpieczeństwa
+        Dane administratora, IOD i datę aktualizacji w JSON uzupełnij wartościami podanymi powyżej.
+        """
 
-        Zwróć w formacie JSON:
-        {{
-            "title": "Rejestr Czynności Przetwarzania Danych Osobowych",
-            "legal_basis": "Art. 30 ust. 1 RODO",
-            "administrator": {{
-                "name": "{company_name}",
-                "nip": "{company_nip or '[NIP]'}",
-                "address": "[adres]",
-                "contact": "[email/telefon]"
-            }},
-            "iod": {{
-                "appointed": {"true" if iod_name else "false"},
-                "name": "{iod_name or 'nie wyznaczono'}",
-                "contact": "{iod_contact or ''}"
-            }},
-            "last_updated": "{datetime.now().strftime('%d.%m.%Y')}",
-            "processing_activities": [
-                {{
-                    "id": 1,
-                    "activity_name": "nazwa czynności",
-                    "purpose": "cel przetwarzania",
-                    "legal_basis": "podstawa z Art. 6 RODO",
-                    "data_subjects": ["kategorie osób"],
-                    "data_categories": ["kategorie danych"],
-                    "recipients": ["odbiorcy"],
-                    "third_country_transfer": {{
-                        "occurs": false,
-                        "countries": [],
-                        "safeguards": ""
-                    }},
-                    "retention_period": "okres przechowywania",
-                    "security_measures": ["środki bezpieczeństwa"]
-                }}
-            ],
-            "template_notes": [
-                "Instrukcje wypełniania RCPD"
-            ],
-            "review_schedule": "Przegląd co najmniej raz w roku"
-        }}
-        """,
+    task = Task(
+        description=f"{_RCPD_TASK}\n{_RCPD_JSON_SHAPE}\n{header}",
         agent=rcpd_expert,
         expected_output="RCPD template in JSON format",
     )
@@ -951,15 +1227,119 @@ async def generate_rcpd_template(
         verbose=False,
     )
 
-    result = crew.kickoff()
+    result = await asyncio.to_thread(crew.kickoff)
     result_text = str(result)
 
-    json_match = re.search(r"\{[\s\S]*\}", result_text)
-    if json_match:
+    json_text = extract_json_object(result_text)
+    if json_text:
         try:
-            parsed = json.loads(json_match.group())
+            parsed = orjson.loads(json_text)
             return {"success": True, "rcpd": parsed}
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             pass
 
     return {"success": True, "rcpd": {"raw_content": result_text}}
+
+
+async def generate_full_gdpr_package(
+    company_name: str,
+    company_address: str,
+    business_description: str,
+    data_collected: list[str],
+    data_processing_purposes: list[str],
+    company_nip: str = "",
+    business_type: str = "",
+    contact_email: str = "",
+    third_party_sharing: list[str] | None = None,
+    has_privacy_policy: bool = False,
+    has_consent_mechanism: bool = False,
+    stores_data_outside_eu: bool = False,
+    transfer_countries: list[str] | None = None,
+    number_of_data_subjects: str = "unknown",
+    uses_profiling: bool = False,
+    processes_special_categories: bool = False,
+    is_public_entity: bool = False,
+    processor_name: str = "",
+    processor_address: str = "",
+    data_subjects: list[str] | None = None,
+) -> dict[str, Any]:
+    """Run the RODO audit, privacy policy and DPA generation concurrently.
+
+    The three documents are built from the same company facts and do not
+    depend on each other's output, so they are generated in parallel. A
+    document that fails is returned as ``{"error": ...}`` and listed in
+    ``failed`` - the other documents are still returned.
+
+    Args:
+        company_name: Company legal name (data controller)
+        company_address: Company address
+        business_description: Description of the business
+        data_collected: Types of personal data collected
+        data_processing_purposes: Purposes for data processing
+        company_nip: Company NIP
+        business_type: Type of business (for the privacy policy)
+        contact_email: Contact email for privacy matters
+        third_party_sharing: Third parties data is shared with
+        has_privacy_policy: Whether a privacy policy exists
+        has_consent_mechanism: Whether consent mechanism exists
+        stores_data_outside_eu: Whether data is stored outside EU
+        transfer_countries: Countries where data is transferred
+        number_of_data_subjects: Approximate number (e.g., "<1000", ">10000")
+        uses_profiling: Whether profiling is used
+        processes_special_categories: Whether special category data is processed
+        is_public_entity: Whether this is a public entity
+        processor_name: Data processor company name (for the DPA)
+        processor_address: Processor address
+        data_subjects: Categories of data subjects
+
+    Returns:
+        Dictionary with assessment, privacy policy, DPA and failed documents
+    """
+    results = await asyncio.gather(
+        check_gdpr_compliance(
+            business_description=business_description,
+            data_collected=data_collected,
+            data_processing_purposes=data_processing_purposes,
+            third_party_sharing=third_party_sharing,
+            has_privacy_policy=has_privacy_policy,
+            has_consent_mechanism=has_consent_mechanism,
+            stores_data_outside_eu=stores_data_outside_eu,
+            number_of_data_subjects=number_of_data_subjects,
+            uses_profiling=uses_profiling,
+            processes_special_categories=processes_special_categories,
+            is_public_entity=is_public_entity,
+        ),
+        generate_privacy_policy(
+            company_name=company_name,
+            company_address=company_address,
+            company_nip=company_nip,
+            business_type=business_type,
+            data_collected=data_collected,
+            data_purposes=data_processing_purposes,
+            third_parties=third_party_sharing,
+            contact_email=contact_email,
+            transfers_outside_eu=stores_data_outside_eu,
+            transfer_countries=transfer_countries,
+        ),
+        generate_data_processing_agreement(
+            controller_name=company_name,
+            controller_address=company_address,
+            controller_nip=company_nip,
+            processor_name=processor_name,
+            processor_address=processor_address,
+            data_categories=data_collected,
+            data_subjects=data_subjects,
+        ),
+        return_exceptions=True,
+    )
+
+    package: dict[str, Any] = {"failed": []}
+    for key, result in zip(("assessment", "privacy_policy", "dpa"), results):
+        if isinstance(result, BaseException):
+            package[key] = {"error": str(result) or type(result).__name__}
+            package["failed"].append(key)
+        else:
+            package[key] = result[key]
+
+    package["success"] = len(package["failed"]) < len(results)
+    return package
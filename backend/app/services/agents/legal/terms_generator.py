@@ -9,23 +9,40 @@ Generator dokumentów prawnych zgodny z:
 Autor: Agora Platform
 """
 
-import json
-import re
-from datetime import datetime
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from datetime import date
+from functools import lru_cache
 from typing import Optional
 
-from crewai import Agent, Task, Crew, Process
+import httpx
+import orjson
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 
 from app.core.config import settings
+from app.services.agents.llm_http import (
+    get_llm_http_async_client,
+    get_llm_http_client,
+    uses_llm_http_clients,
+)
+from app.services.agents.legal._document_cache import (
+    cache_document,
+    document_cache_key,
+    get_cached_document,
+)
+from app.services.agents.legal._llm_json import JsonFieldStream
+from app.services.agents.legal.gdpr_assistant import generate_rcpd_template
 
 
 # =============================================================================
 # POLSKIE PODSTAWY PRAWNE
 # =============================================================================
 
+# Klucze ASCII - polskie znaki tylko w wartościach
 POLISH_ECOMMERCE_LAW = {
-    "uśude": {
+    "usude": {
         "name": "Ustawa o świadczeniu usług drogą elektroniczną",
         "date": "18 lipca 2002 r.",
         "dz_u": "Dz.U. 2002 nr 144 poz. 1204",
@@ -111,6 +128,12 @@ WITHDRAWAL_EXCEPTIONS = [
     },
 ]
 
+# Słowa kluczowe z przykładów, policzone raz - dopasowanie produktów do Art. 38
+_EXCEPTION_KEYWORD_INDEX = [
+    (tuple(exc["example"].lower().split(", ")), exc)
+    for exc in WITHDRAWAL_EXCEPTIONS
+]
+
 # Wymagane informacje dla konsumenta (Art. 12 ustawy o prawach konsumenta)
 REQUIRED_CONSUMER_INFO = [
     "główne cechy świadczenia z uwzględnieniem przedmiotu świadczenia",
@@ -159,122 +182,31 @@ Data:
 (*) Niepotrzebne skreślić.
 """
 
+# Ten sam wzór z polami dla str.format_map - wypełniany jednym przebiegiem
+_WITHDRAWAL_FORM_FORMAT = WITHDRAWAL_FORM_TEMPLATE.replace(
+    "[NAZWA PRZEDSIĘBIORCY]", "{company_name}"
+).replace(
+    "[ADRES PRZEDSIĘBIORCY]", "{company_address}"
+).replace(
+    "[EMAIL PRZEDSIĘBIORCY]", "{contact_email}"
+)
 
-def _get_llm():
-    """Get LLM instance."""
-    return ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.3,  # Niższa temperatura dla dokumentów prawnych
-        api_key=settings.OPENAI_API_KEY,
-    )
-
-
-def _get_current_date() -> str:
-    """Get current date in Polish format."""
-    months = [
-        "stycznia", "lutego", "marca", "kwietnia", "maja", "czerwca",
-        "lipca", "sierpnia", "września", "października", "listopada", "grudnia"
-    ]
-    now = datetime.now()
-    return f"{now.day} {months[now.month - 1]} {now.year} r."
+# Stałe podstawy prawne zserializowane raz przy imporcie - serwowane jako gotowe bajty
+ECOMMERCE_LEGAL_REFERENCE_JSON = orjson.dumps({
+    "polish_ecommerce_law": POLISH_ECOMMERCE_LAW,
+    "withdrawal_exceptions": WITHDRAWAL_EXCEPTIONS,
+    "required_consumer_info": REQUIRED_CONSUMER_INFO,
+    "withdrawal_form_template": WITHDRAWAL_FORM_TEMPLATE,
+})
 
 
 # =============================================================================
-# GENERATOR REGULAMINU
+# PROMPTY REGULAMINU
 # =============================================================================
+# Część stała idzie na początku promptu, dane firmy na końcu - dzięki temu
+# prefiks jest identyczny między wywołaniami i łapie się w cache promptów OpenAI.
 
-async def generate_terms_of_service(
-    # Dane usługodawcy (Art. 5 UŚUDE)
-    company_name: str,
-    company_address: str,
-    company_nip: str = "",
-    company_regon: str = "",
-    company_krs: str = "",
-    contact_email: str = "",
-    contact_phone: str = "",
-
-    # Dane o usłudze
-    service_type: str = "saas",
-    service_description: str = "",
-    website_url: str = "",
-
-    # Model biznesowy
-    pricing_model: str = "",
-    payment_terms: str = "",
-    subscription_based: bool = False,
-    free_trial: bool = False,
-    free_trial_days: int = 14,
-
-    # Typ klientów
-    b2b_only: bool = False,
-
-    # Polityki
-    refund_policy: str = "",
-
-    # Treści cyfrowe (Art. 38 pkt 13)
-    digital_content: bool = False,
-    digital_content_description: str = "",
-) -> dict:
-    """Generuje regulamin świadczenia usług drogą elektroniczną.
-
-    Zgodny z:
-    - Art. 8 ustawy o świadczeniu usług drogą elektroniczną
-    - Ustawą o prawach konsumenta (jeśli B2C)
-    - Art. 384-385⁴ Kodeksu cywilnego (wzorce umowne)
-
-    Args:
-        company_name: Pełna nazwa firmy
-        company_address: Adres siedziby
-        company_nip: NIP
-        company_regon: REGON
-        company_krs: Numer KRS (jeśli dotyczy)
-        contact_email: Email kontaktowy
-        contact_phone: Telefon kontaktowy
-        service_type: Typ usługi (saas, ecommerce, marketplace, consulting, agency)
-        service_description: Opis usługi
-        website_url: Adres strony internetowej
-        pricing_model: Model cenowy
-        payment_terms: Warunki płatności
-        subscription_based: Czy model subskrypcyjny
-        free_trial: Czy oferowany okres próbny
-        free_trial_days: Liczba dni okresu próbnego
-        b2b_only: Czy tylko dla firm (B2B)
-        refund_policy: Polityka zwrotów
-        digital_content: Czy dostarcza treści cyfrowe
-        digital_content_description: Opis treści cyfrowych
-
-    Returns:
-        Słownik z pełnym regulaminem i metadanymi
-    """
-    llm = _get_llm()
-
-    # Mapowanie typów usług
-    service_types = {
-        "saas": "oprogramowanie jako usługa (SaaS)",
-        "ecommerce": "sprzedaż towarów przez internet",
-        "marketplace": "platforma pośrednictwa handlowego",
-        "consulting": "usługi doradcze online",
-        "agency": "usługi agencyjne",
-        "education": "usługi edukacyjne online",
-    }
-    service_type_pl = service_types.get(service_type.lower(), service_type)
-
-    # Przygotuj informacje o wyjątkach od odstąpienia
-    applicable_exceptions = []
-    if digital_content:
-        applicable_exceptions.append(WITHDRAWAL_EXCEPTIONS[6])  # Art. 38 pkt 13
-    if service_type.lower() == "saas":
-        applicable_exceptions.append(WITHDRAWAL_EXCEPTIONS[0])  # Art. 38 pkt 1
-
-    exceptions_text = "\n".join([
-        f"- {exc['article']}: {exc['description']} (np. {exc['example']})"
-        for exc in applicable_exceptions
-    ]) if applicable_exceptions else "Brak szczególnych wyjątków."
-
-    legal_writer = Agent(
-        role="Specjalista ds. Regulaminów E-commerce",
-        goal="Tworzyć regulaminy w pełni zgodne z polskim prawem e-commerce",
-        backstory=f"""Jesteś doświadczonym prawnikiem specjalizującym się w prawie
+_TERMS_BACKSTORY = """Jesteś doświadczonym prawnikiem specjalizującym się w prawie
         internetowym i e-commerce w Polsce. Masz dogłębną znajomość:
 
         1. Ustawy o świadczeniu usług drogą elektroniczną (UŚUDE):
@@ -298,67 +230,11 @@ async def generate_terms_of_service(
         - Są zrozumiałe dla przeciętnego użytkownika
         - Nie zawierają klauzul niedozwolonych (abuzywnych)
 
-        UWAGA: Dokument ma charakter wzoru i wymaga weryfikacji przez prawnika.""",
-        tools=[],
-        llm=llm,
-        verbose=False,
-    )
-
-    consumer_section = ""
-    if not b2b_only:
-        consumer_section = f"""
-        DLA KONSUMENTÓW (zgodnie z ustawą o prawach konsumenta):
-
-        A) PRAWO ODSTĄPIENIA OD UMOWY (Art. 27):
-           - Konsument ma prawo odstąpić od umowy w terminie 14 dni bez podania przyczyny
-           - Termin biegnie od dnia zawarcia umowy (usługi) lub otrzymania towaru
-           - Wzór formularza odstąpienia zgodny z Załącznikiem nr 2 do ustawy
-
-        B) WYJĄTKI OD PRAWA ODSTĄPIENIA (Art. 38):
-           {exceptions_text}
+        UWAGA: Dokument ma charakter wzoru i wymaga weryfikacji przez prawnika."""
 
-        C) OBOWIĄZKI INFORMACYJNE (Art. 12):
-           - Wszystkie wymagane informacje muszą być jasno przedstawione
-           - Ceny brutto z VAT
-           - Pełne koszty dostawy przed zamówieniem
-
-        D) RĘKOJMIA (Art. 556-576 KC):
-           - 2 lata odpowiedzialności za wady
-           - Domniemanie istnienia wady przy zgłoszeniu w ciągu roku
-        """
-
-    task = Task(
-        description=f"""
-        Stwórz profesjonalny regulamin świadczenia usług drogą elektroniczną.
-
-        ═══════════════════════════════════════════════════════════════════
-        DANE USŁUGODAWCY (Art. 5 UŚUDE):
-        ═══════════════════════════════════════════════════════════════════
-        Nazwa: {company_name}
-        Adres: {company_address}
-        NIP: {company_nip or "[DO UZUPEŁNIENIA]"}
-        REGON: {company_regon or "[DO UZUPEŁNIENIA]"}
-        KRS: {company_krs or "nie dotyczy (działalność gospodarcza)"}
-        Email: {contact_email or "[DO UZUPEŁNIENIA]"}
-        Telefon: {contact_phone or "[DO UZUPEŁNIENIA]"}
-        Strona: {website_url or "[DO UZUPEŁNIENIA]"}
-
-        ═══════════════════════════════════════════════════════════════════
-        CHARAKTERYSTYKA USŁUGI:
-        ═══════════════════════════════════════════════════════════════════
-        Typ usługi: {service_type_pl}
-        Opis: {service_description or "[OPIS USŁUGI]"}
-        Odbiorcy: {"Wyłącznie przedsiębiorcy (B2B)" if b2b_only else "Konsumenci i przedsiębiorcy (B2C i B2B)"}
-        Model subskrypcyjny: {"Tak" if subscription_based else "Nie"}
-        Okres próbny: {"Tak - " + str(free_trial_days) + " dni" if free_trial else "Nie"}
-        Treści cyfrowe: {"Tak - " + digital_content_description if digital_content else "Nie"}
-
-        ═══════════════════════════════════════════════════════════════════
-        PŁATNOŚCI:
-        ═══════════════════════════════════════════════════════════════════
-        Model cenowy: {pricing_model or "wg cennika na stronie"}
-        Warunki płatności: {payment_terms or "przedpłata"}
-        Polityka zwrotów: {refund_policy or "zgodnie z ustawą o prawach konsumenta"}
+_TERMS_STATIC_PROMPT = """
+        Stwórz profesjonalny regulamin świadczenia usług drogą elektroniczną
+        dla usługodawcy opisanego w sekcji DANE DO REGULAMINU na końcu zadania.
 
         ═══════════════════════════════════════════════════════════════════
         WYMAGANIA PRAWNE - REGULAMIN MUSI ZAWIERAĆ (Art. 8 UŚUDE):
@@ -398,14 +274,14 @@ async def generate_terms_of_service(
         - Cennik i sposób jego aktualizacji
         - Metody płatności
         - Faktury VAT
-        {"- Automatyczne odnawianie subskrypcji" if subscription_based else ""}
+        - Automatyczne odnawianie subskrypcji (tylko w modelu subskrypcyjnym)
 
         § 8. TRYB POSTĘPOWANIA REKLAMACYJNEGO (Art. 8 ust. 3 pkt 4 UŚUDE)
         - Sposób składania reklamacji
         - Termin rozpatrzenia (14 dni)
         - Forma odpowiedzi
 
-        {consumer_section}
+        Jeśli dane zawierają sekcję DLA KONSUMENTÓW, opisz ją w § 8a. PRAWA KONSUMENTA.
 
         § 9. ODPOWIEDZIALNOŚĆ
         - Zakres odpowiedzialności usługodawcy
@@ -428,84 +304,839 @@ async def generate_terms_of_service(
         - Prawo właściwe (prawo polskie)
         - Sąd właściwy (dla przedsiębiorców)
         - Pozasądowe rozwiązywanie sporów (platforma ODR)
+        """
+
+
+# Schemat wygenerowanej treści regulaminu - metadane dokumentu uzupełniamy w Pythonie
+TERMS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "sections": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "number": {"type": "string", "description": "np. § 1"},
+                    "title": {"type": "string"},
+                    "content": {"type": "string", "description": "treść sekcji z numerowanymi punktami"},
+                    "legal_reference": {"type": "string", "description": "np. Art. 5 i 8 UŚUDE"},
+                },
+                "required": ["number", "title", "content", "legal_reference"],
+                "additionalProperties": False,
+            },
+        },
+        "full_text": {"type": "string", "description": "pełna sformatowana treść regulaminu"},
+        "consumer_rights_summary": {
+            "type": ["string", "null"],
+            "description": "podsumowanie praw konsumenta, null dla B2B",
+        },
+        "technical_requirements": {"type": "array", "items": {"type": "string"}},
+        "legal_notices": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "wymagane prawnie informacje",
+        },
+    },
+    "required": ["sections", "full_text", "consumer_rights_summary", "technical_requirements", "legal_notices"],
+    "additionalProperties": False,
+}
+
+# Paragrafy generowane równolegle - kolejność i tytuły jak w _TERMS_STATIC_PROMPT
+_TERMS_SECTIONS_B2B = (
+    ("§ 1", "POSTANOWIENIA OGÓLNE I DEFINICJE"),
+    ("§ 2", "RODZAJE I ZAKRES USŁUG"),
+    ("§ 3", "WARUNKI ŚWIADCZENIA USŁUG"),
+    ("§ 4", "WARUNKI ZAWIERANIA UMÓW"),
+    ("§ 5", "WARUNKI ROZWIĄZYWANIA UMÓW"),
+    ("§ 6", "PRAWA I OBOWIĄZKI STRON"),
+    ("§ 7", "PŁATNOŚCI I ROZLICZENIA"),
+    ("§ 8", "TRYB POSTĘPOWANIA REKLAMACYJNEGO"),
+    ("§ 9", "ODPOWIEDZIALNOŚĆ"),
+    ("§ 10", "WŁASNOŚĆ INTELEKTUALNA"),
+    ("§ 11", "OCHRONA DANYCH OSOBOWYCH (RODO)"),
+    ("§ 12", "POSTANOWIENIA KOŃCOWE"),
+)
+_TERMS_SECTIONS_B2C = (
+    _TERMS_SECTIONS_B2B[:8] + (("§ 8a", "PRAWA KONSUMENTA"),) + _TERMS_SECTIONS_B2B[8:]
+)
+
+_TERMS_SECTION_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "TermsSection",
+        "schema": {
+            "type": "object",
+            "properties": {
+                key: TERMS_SCHEMA["properties"]["sections"]["items"]["properties"][key]
+                for key in ("content", "legal_reference")
+            },
+            "required": ["content", "legal_reference"],
+            "additionalProperties": False,
+        },
+        "strict": True,
+    },
+}
+
+_TERMS_EXTRAS_KEYS = ("consumer_rights_summary", "technical_requirements", "legal_notices")
+
+_TERMS_EXTRAS_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "TermsExtras",
+        "schema": {
+            "type": "object",
+            "properties": {key: TERMS_SCHEMA["properties"][key] for key in _TERMS_EXTRAS_KEYS},
+            "required": list(_TERMS_EXTRAS_KEYS),
+            "additionalProperties": False,
+        },
+        "strict": True,
+    },
+}
+
+_TERMS_SECTION_INSTRUCTION = """
+        NAPISZ TERAZ WYŁĄCZNIE: {number}. {title}
+        Pozostałe paragrafy powstają osobno - nie powtarzaj ich treści.
+        """
+
+_TERMS_EXTRAS_INSTRUCTION = """
+        NAPISZ TERAZ WYŁĄCZNIE: podsumowanie praw konsumenta (null dla B2B),
+        wymagania techniczne i wymagane prawnie informacje. Paragrafy regulaminu powstają osobno.
+        """
+
+_TERMS_LEGAL_BASIS = [
+    "Ustawa z dnia 18 lipca 2002 r. o świadczeniu usług drogą elektroniczną",
+    "Ustawa z dnia 30 maja 2014 r. o prawach konsumenta",
+    "Kodeks cywilny",
+]
+
+# Podstawy prawne zwracane z regulaminem - dwa warianty zbudowane raz przy imporcie.
+# Klucz "uśude" w odpowiedzi API zostaje bez zmian (alias dla POLISH_ECOMMERCE_LAW["usude"]).
+_TERMS_LEGAL_REFS_B2C = {
+    "uśude": POLISH_ECOMMERCE_LAW["usude"],
+    "ustawa_konsumencka": POLISH_ECOMMERCE_LAW["ustawa_konsumencka"],
+}
+_TERMS_LEGAL_REFS_B2B = {
+    "uśude": POLISH_ECOMMERCE_LAW["usude"],
+    "ustawa_konsumencka": None,
+}
+
+
+def _build_consumer_section(exceptions: list[dict]) -> str:
+    """Build the B2C consumer rights block of the terms prompt."""
+    exceptions_text = "\n".join([
+        f"- {exc['article']}: {exc['description']} (np. {exc['example']})"
+        for exc in exceptions
+    ]) if exceptions else "Brak szczególnych wyjątków."
+
+    return f"""
+        DLA KONSUMENTÓW (zgodnie z ustawą o prawach konsumenta):
+
+        A) PRAWO ODSTĄPIENIA OD UMOWY (Art. 27):
+           - Konsument ma prawo odstąpić od umowy w terminie 14 dni bez podania przyczyny
+           - Termin biegnie od dnia zawarcia umowy (usługi) lub otrzymania towaru
+           - Wzór formularza odstąpienia zgodny z Załącznikiem nr 2 do ustawy
+
+        B) WYJĄTKI OD PRAWA ODSTĄPIENIA (Art. 38):
+           {exceptions_text}
+
+        C) OBOWIĄZKI INFORMACYJNE (Art. 12):
+           - Wszystkie wymagane informacje muszą być jasno przedstawione
+           - Ceny brutto z VAT
+           - Pełne koszty dostawy przed zamówieniem
+
+        D) RĘKOJMIA (Art. 556-576 KC):
+           - 2 lata odpowiedzialności za wady
+           - Domniemanie istnienia wady przy zgłoszeniu w ciągu roku
+        """
+
+
+# Wyjątki z Art. 38 wg (treści cyfrowe, SaaS) - pkt 13 dla treści cyfrowych, pkt 1 dla SaaS
+_TERMS_EXCEPTIONS = {
+    (digital_content, is_saas): (
+        ([WITHDRAWAL_EXCEPTIONS[6]] if digital_content else [])
+        + ([WITHDRAWAL_EXCEPTIONS[0]] if is_saas else [])
+    )
+    for digital_content in (False, True)
+    for is_saas in (False, True)
+}
+
+_CONSUMER_SECTIONS = {
+    key: _build_consumer_section(exceptions)
+    for key, exceptions in _TERMS_EXCEPTIONS.items()
+}
+
+
+# =============================================================================
+# PROMPTY POLITYKI ZWROTÓW
+# =============================================================================
+
+_RETURN_POLICY_BACKSTORY = """Jesteś ekspertem od praw konsumenta w Polsce. Znasz:
+
+        1. Ustawę o prawach konsumenta:
+           - Art. 27: 14 dni na odstąpienie bez przyczyny
+           - Art. 28-30: Bieg terminu odstąpienia
+           - Art. 31-33: Skutki odstąpienia (zwrot płatności)
+           - Art. 34: Obowiązki konsumenta przy odstąpieniu
+           - Art. 38: Wyjątki od prawa odstąpienia
+
+        2. Kodeks cywilny:
+           - Art. 556-576: Rękojmia za wady (2 lata)
+           - Art. 577-581: Gwarancja (dobrowolna)
+
+        Tworzysz polityki, które:
+        - Spełniają minimalne wymogi ustawowe
+        - Są zrozumiałe dla konsumentów
+        - Zawierają wzór formularza odstąpienia
+        - Jasno określają procedurę i terminy"""
+
+# Wyjątki z Art. 38 są stałe - listę do promptu budujemy raz przy imporcie
+_WITHDRAWAL_EXCEPTIONS_TEXT = "\n".join(
+    f"        - {exc['article']}: {exc['description']}" for exc in WITHDRAWAL_EXCEPTIONS
+)
+
+# Stała część zadania idzie na początek promptu, dane sprzedawcy na koniec -
+# prefiks jest identyczny między wywołaniami i łapie się w cache promptów OpenAI.
+_RETURN_POLICY_STATIC_PROMPT = """
+        Stwórz politykę zwrotów i reklamacji zgodną z prawem polskim
+        dla sprzedawcy opisanego w sekcji DANE DO POLITYKI ZWROTÓW na końcu zadania.
 
         ═══════════════════════════════════════════════════════════════════
-        FORMAT ODPOWIEDZI (JSON):
+        USTAWOWE WYJĄTKI OD PRAWA ODSTĄPIENIA (Art. 38):
         ═══════════════════════════════════════════════════════════════════
+""" + _WITHDRAWAL_EXCEPTIONS_TEXT + """
 
-        {{
-            "title": "REGULAMIN ŚWIADCZENIA USŁUG DROGĄ ELEKTRONICZNĄ",
-            "service_provider": "{company_name}",
-            "version": "1.0",
-            "effective_date": "{_get_current_date()}",
-            "legal_basis": [
-                "Ustawa z dnia 18 lipca 2002 r. o świadczeniu usług drogą elektroniczną",
-                "Ustawa z dnia 30 maja 2014 r. o prawach konsumenta",
-                "Kodeks cywilny"
-            ],
-            "sections": [
-                {{
-                    "number": "§ 1",
-                    "title": "POSTANOWIENIA OGÓLNE",
-                    "content": "treść sekcji z numerowanymi punktami",
-                    "legal_reference": "Art. 5 i 8 UŚUDE"
-                }}
+        ═══════════════════════════════════════════════════════════════════
+        STRUKTURA POLITYKI:
+        ═══════════════════════════════════════════════════════════════════
+
+        1. PRAWO ODSTĄPIENIA OD UMOWY (Art. 27-30)
+           - 14 dni od otrzymania towaru (lub okres odstąpienia z sekcji DANE)
+           - Bez podania przyczyny
+           - Jak liczyć termin
+
+        2. SPOSÓB ODSTĄPIENIA (Art. 30)
+           - Oświadczenie o odstąpieniu (email/formularz/pismo)
+           - Wzór formularza (Załącznik nr 2 do ustawy)
+
+        3. ZWROT TOWARU (Art. 34)
+           - Termin: 14 dni od złożenia oświadczenia
+           - Stan towaru
+           - Adres do zwrotów
+
+        4. ZWROT PŁATNOŚCI (Art. 32-33)
+           - Termin: 14 dni od otrzymania oświadczenia
+           - Ta sama metoda płatności
+           - Koszty dostawy (najtańszy sposób)
+
+        5. KOSZTY ZWROTU (Art. 34)
+           - Kto ponosi koszty odesłania
+
+        6. WYJĄTKI (Art. 38)
+           - Produkty niepodlegające zwrotowi
+
+        7. REKLAMACJE - RĘKOJMIA (Art. 556-576 KC)
+           - 2 lata odpowiedzialności
+           - Domniemanie wady (1 rok)
+           - Uprawnienia: naprawa/wymiana/obniżenie ceny/odstąpienie
+           - Termin rozpatrzenia: 14 dni
+
+        8. GWARANCJA (jeśli dotyczy)
+           - Oddzielnie od rękojmi
+
+        9. DANE KONTAKTOWE
+        """
+
+
+# Kształt odpowiedzi wymuszany przez Structured Outputs - zawsze poprawny JSON
+_RETURN_POLICY_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "ReturnPolicy",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "title": {"type": "string", "description": "POLITYKA ZWROTÓW I REKLAMACJI"},
+                "effective_date": {"type": "string", "description": "Data wejścia w życie z sekcji DANE"},
+                "legal_basis": {"type": "array", "items": {"type": "string"}},
+                "sections": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "number": {"type": "string"},
+                            "title": {"type": "string"},
+                            "content": {
+                                "type": "string",
+                                "description": "Treść z odniesieniami do artykułów",
+                            },
+                        },
+                        "required": ["number", "title", "content"],
+                        "additionalProperties": False,
+                    },
+                },
+                "full_text": {"type": "string", "description": "Pełna sformatowana treść polityki"},
+                "quick_facts": {
+                    "type": "array",
+                    "description": "Termin odstąpienia, termin zwrotu pieniędzy, rękojmia",
+                    "items": {
+                        "type": "object",
+                        "properties": {"label": {"type": "string"}, "value": {"type": "string"}},
+                        "required": ["label", "value"],
+                        "additionalProperties": False,
+                    },
+                },
+                "withdrawal_form": {"type": "string", "description": "Wzór formularza odstąpienia"},
+                "contact_info": {
+                    "type": "object",
+                    "description": "Dane kontaktowe z sekcji DANE",
+                    "properties": {
+                        "email": {"type": "string"},
+                        "phone": {"type": "string"},
+                        "address": {"type": "string"},
+                    },
+                    "required": ["email", "phone", "address"],
+                    "additionalProperties": False,
+                },
+            },
+            "required": [
+                "title",
+                "effective_date",
+                "legal_basis",
+                "sections",
+                "full_text",
+                "quick_facts",
+                "withdrawal_form",
+                "contact_info",
             ],
-            "full_text": "pełna sformatowana treść regulaminu",
-            "consumer_rights_summary": "podsumowanie praw konsumenta (jeśli B2C)",
-            "withdrawal_form": "wzór formularza odstąpienia (jeśli B2C)",
-            "technical_requirements": ["lista wymagań technicznych"],
-            "legal_notices": ["wymagane prawnie informacje"],
-            "disclaimer": "Niniejszy dokument stanowi wzór i wymaga weryfikacji przez radcę prawnego lub adwokata przed wdrożeniem."
-        }}
-        """,
-        agent=legal_writer,
-        expected_output="Regulamin w formacie JSON zgodny z polskim prawem",
-    )
+            "additionalProperties": False,
+        },
+        "strict": True,
+    },
+}
+
+
+# Wspólny limit równoległych wywołań OpenAI dla wszystkich generatorów modułu
+_LLM_SEMAPHORE = asyncio.Semaphore(settings.LEGAL_LLM_MAX_CONCURRENCY)
+
+# Czas odpowiedzi OpenAI ma długi ogon - zawieszone wywołanie przerywamy i ponawiamy
+_LLM_CALL_TIMEOUT = 45  # sekundy - jeden paragraf lub dodatki regulaminu
+_LLM_DOCUMENT_CALL_TIMEOUT = 90  # sekundy - cały dokument w jednym wywołaniu
+_LLM_CALL_ATTEMPTS = 2
 
-    crew = Crew(
-        agents=[legal_writer],
-        tasks=[task],
-        process=Process.sequential,
-        verbose=False,
+@uses_llm_http_clients
+@lru_cache(maxsize=1)
+def _get_llm():
+    """Get shared LLM instance for legal document generation.
+
+    Cached so all generators in this module reuse one client and its
+    connection pool.
+    """
+    return ChatOpenAI(
+        model="gpt-4o-mini",
+        temperature=0,  # Dokumenty prawne mają być powtarzalne, nie kreatywne
+        seed=42,
+        api_key=settings.OPENAI_API_KEY,
+        # Limit HTTP musi przepuścić najdłuższe wywołanie - zawieszenia łapie wait_for
+        timeout=httpx.Timeout(_LLM_DOCUMENT_CALL_TIMEOUT + 15, connect=5),
+        max_retries=2,
+        http_client=get_llm_http_client(),
+        # Generatory wołają ainvoke/astream - bez tego klient async ma domyślną pulę
+        http_async_client=get_llm_http_async_client(),
     )
 
-    result = crew.kickoff()
-    result_text = str(result)
 
-    # Parsowanie JSON
-    json_match = re.search(r'\{[\s\S]*\}', result_text)
+async def _invoke_with_retry(llm, messages: list, timeout: float = _LLM_CALL_TIMEOUT):
+    """Invoke the model, retrying once when a call stalls past the timeout.
 
-    parsed_result = None
-    if json_match:
+    The client's own retries only cover errors and rate limits; a call that
+    is slow but not failing would otherwise hold the request until the HTTP
+    timeout. Pass a longer timeout for calls that generate a whole document.
+    Raises TimeoutError when the last attempt also stalls.
+    """
+    for attempt in range(_LLM_CALL_ATTEMPTS):
         try:
-            parsed_result = json.loads(json_match.group())
-        except json.JSONDecodeError:
-            pass
+            async with _LLM_SEMAPHORE:
+                return await asyncio.wait_for(llm.ainvoke(messages), timeout=timeout)
+        except TimeoutError:
+            if attempt == _LLM_CALL_ATTEMPTS - 1:
+                raise
+
+
+def _fill_withdrawal_form(company_name: str, company_address: str, contact_email: str) -> str:
+    """Fill the statutory withdrawal form with the trader's details."""
+    return _WITHDRAWAL_FORM_FORMAT.format_map({
+        "company_name": company_name,
+        "company_address": company_address,
+        "contact_email": contact_email or "[EMAIL]",
+    })
+
+
+async def _generate_terms_part(
+    llm: ChatOpenAI,
+    prompt: str,
+    instruction: str,
+    response_format: dict,
+) -> tuple[dict | None, str]:
+    """Generate one part of the terms of service with Structured Outputs.
+
+    Returns:
+        Parsed part (None if the response was cut off) and the raw text
+    """
+    messages = [
+        SystemMessage(content=_TERMS_BACKSTORY),
+        HumanMessage(content=f"{prompt}\n{instruction}"),
+    ]
+    result = await _invoke_with_retry(llm.bind(response_format=response_format), messages)
+
+    try:
+        return orjson.loads(result.content), result.content
+    except orjson.JSONDecodeError:
+        return None, result.content
+
+
+async def _generate_terms_section(
+    llm: ChatOpenAI,
+    prompt: str,
+    number: str,
+    title: str,
+) -> tuple[dict, bool]:
+    """Generate one § of the terms; returns the section and whether it parsed."""
+    parsed, raw_text = await _generate_terms_part(
+        llm,
+        prompt,
+        _TERMS_SECTION_INSTRUCTION.format(number=number, title=title),
+        _TERMS_SECTION_FORMAT,
+    )
+    if parsed is None:
+        # Ucięta odpowiedź - zachowujemy surowy tekst jako treść paragrafu
+        return {"number": number, "title": title, "content": raw_text, "legal_reference": ""}, False
+    return {"number": number, "title": title, **parsed}, True
+
+
+async def _generate_terms_extras(llm: ChatOpenAI, prompt: str) -> tuple[dict, bool]:
+    """Generate the consumer summary, technical requirements and legal notices."""
+    parsed, _ = await _generate_terms_part(
+        llm, prompt, _TERMS_EXTRAS_INSTRUCTION, _TERMS_EXTRAS_FORMAT
+    )
+    if parsed is None:
+        return {"consumer_rights_summary": None, "technical_requirements": [], "legal_notices": []}, False
+    return parsed, True
+
+
+def _join_terms_text(sections: list[dict]) -> str:
+    """Build the full terms text from generated sections."""
+    return "\n\n".join(
+        ["REGULAMIN ŚWIADCZENIA USŁUG DROGĄ ELEKTRONICZNĄ"]
+        + [f"{s['number']}. {s['title']}\n{s['content']}" for s in sections]
+    )
+
+
+def _build_terms_dynamic_suffix(
+    company_name: str,
+    company_address: str,
+    company_nip: str,
+    company_regon: str,
+    company_krs: str,
+    contact_email: str,
+    contact_phone: str,
+    service_type: str,
+    service_description: str,
+    website_url: str,
+    pricing_model: str,
+    payment_terms: str,
+    subscription_based: bool,
+    free_trial: bool,
+    free_trial_days: int,
+    b2b_only: bool,
+    refund_policy: str,
+    digital_content: bool,
+    digital_content_description: str,
+    effective_date: str,
+) -> str:
+    """Build the per-company part of the terms prompt (after the static prefix)."""
+    # Mapowanie typów usług
+    service_types = {
+        "saas": "oprogramowanie jako usługa (SaaS)",
+        "ecommerce": "sprzedaż towarów przez internet",
+        "marketplace": "platforma pośrednictwa handlowego",
+        "consulting": "usługi doradcze online",
+        "agency": "usługi agencyjne",
+        "education": "usługi edukacyjne online",
+    }
+    service_type_pl = service_types.get(service_type.lower(), service_type)
+
+    # Sekcja konsumencka jest policzona z góry dla każdej kombinacji
+    exceptions_key = (bool(digital_content), service_type.lower() == "saas")
+    consumer_section = "" if b2b_only else _CONSUMER_SECTIONS[exceptions_key]
+
+    return f"""
+        ═══════════════════════════════════════════════════════════════════
+        DANE DO REGULAMINU
+        ═══════════════════════════════════════════════════════════════════
+
+        DANE USŁUGODAWCY (Art. 5 UŚUDE):
+        Nazwa: {company_name}
+        Adres: {company_address}
+        NIP: {company_nip or "[DO UZUPEŁNIENIA]"}
+        REGON: {company_regon or "[DO UZUPEŁNIENIA]"}
+        KRS: {company_krs or "nie dotyczy (działalność gospodarcza)"}
+        Email: {contact_email or "[DO UZUPEŁNIENIA]"}
+        Telefon: {contact_phone or "[DO UZUPEŁNIENIA]"}
+        Strona: {website_url or "[DO UZUPEŁNIENIA]"}
+
+        CHARAKTERYSTYKA USŁUGI:
+        Typ usługi: {service_type_pl}
+        Opis: {service_description or "[OPIS USŁUGI]"}
+        Odbiorcy: {"Wyłącznie przedsiębiorcy (B2B)" if b2b_only else "Konsumenci i przedsiębiorcy (B2C i B2B)"}
+        Model subskrypcyjny: {"Tak" if subscription_based else "Nie"}
+        Okres próbny: {"Tak - " + str(free_trial_days) + " dni" if free_trial else "Nie"}
+        Treści cyfrowe: {"Tak - " + digital_content_description if digital_content else "Nie"}
+
+        PŁATNOŚCI:
+        Model cenowy: {pricing_model or "wg cennika na stronie"}
+        Warunki płatności: {payment_terms or "przedpłata"}
+        Polityka zwrotów: {refund_policy or "zgodnie z ustawą o prawach konsumenta"}
+
+        DATA WEJŚCIA W ŻYCIE: {effective_date}
+        {consumer_section}"""
+
+
+def _build_return_policy_dynamic_suffix(
+    company_name: str,
+    company_address: str,
+    contact_email: str,
+    contact_phone: str,
+    business_type: str,
+    products_type: str,
+    actual_return_period: int,
+    extended_return_period: bool,
+    accepts_opened_products: bool,
+    requires_original_packaging: bool,
+    free_returns: bool,
+    return_shipping_cost: str,
+    effective_date: str,
+) -> str:
+    """Build the per-company part of the return policy prompt."""
+    return f"""
+        ═══════════════════════════════════════════════════════════════════
+        DANE DO POLITYKI ZWROTÓW
+        ═══════════════════════════════════════════════════════════════════
+
+        DANE SPRZEDAWCY:
+        Nazwa: {company_name}
+        Adres do zwrotów: {company_address}
+        Email: {contact_email or "[DO UZUPEŁNIENIA]"}
+        Telefon: {contact_phone or "[DO UZUPEŁNIENIA]"}
+
+        CHARAKTERYSTYKA:
+        Typ działalności: {business_type}
+        Rodzaj produktów: {products_type or "różne"}
+
+        WARUNKI ZWROTÓW:
+        Okres na odstąpienie: {actual_return_period} dni {"(wydłużony ponad ustawowe 14 dni)" if extended_return_period else "(ustawowe minimum)"}
+        Przyjmowanie otwartych produktów: {"Tak" if accepts_opened_products else "Nie"}
+        Wymagane oryginalne opakowanie: {"Tak" if requires_original_packaging else "Nie"}
+        Bezpłatne zwroty: {"Tak" if free_returns else "Nie - koszt: " + (return_shipping_cost or "wg cennika przewoźnika")}
+
+        DATA WEJŚCIA W ŻYCIE: {effective_date}"""
+
+
+def _return_policy_period(return_period_days: int, extended_return_period: bool, extended_days: int) -> int:
+    """Withdrawal period offered to consumers, never below the statutory 14 days."""
+    if extended_return_period:
+        return extended_days
+    return max(return_period_days, 14)
+
+
+def _match_withdrawal_exceptions(products: list[str]) -> list[dict]:
+    """Statutory withdrawal exceptions (Art. 38) for the given products.
+
+    Each product matching an exception example is returned with that
+    exception; products without a match are left out.
+    """
+    matched = []
+    for product in products:
+        product_lower = product.lower()
+        for keywords, exc in _EXCEPTION_KEYWORD_INDEX:
+            if any(keyword in product_lower for keyword in keywords):
+                matched.append({"product": product, **exc})
+                break
+    return matched
+
+
+def _return_policy_legal_basis(actual_return_period: int) -> dict:
+    """Statutory basis of the return policy for the given withdrawal period."""
+    return {
+        "prawo_odstąpienia": {
+            "articles": "Art. 27-38 ustawy o prawach konsumenta",
+            "period": f"{actual_return_period} dni",
+            "refund_deadline": "14 dni od otrzymania oświadczenia",
+        },
+        "rękojmia": {
+            "articles": "Art. 556-576 Kodeksu cywilnego",
+            "period": "24 miesiące od wydania rzeczy",
+            "presumption": "12 miesięcy domniemanie istnienia wady",
+        },
+    }
+
+
+_POLISH_MONTHS = (
+    "stycznia", "lutego", "marca", "kwietnia", "maja", "czerwca",
+    "lipca", "sierpnia", "września", "października", "listopada", "grudnia",
+)
+
+
+@lru_cache(maxsize=1)
+def _format_polish_date(day: date) -> str:
+    """Format a date in Polish, e.g. "5 marca 2025 r."."""
+    return f"{day.day} {_POLISH_MONTHS[day.month - 1]} {day.year} r."
+
+
+def _get_current_date() -> str:
+    """Get current date in Polish format."""
+    return _format_polish_date(date.today())
+
+
+# =============================================================================
+# GENERATOR REGULAMINU
+# =============================================================================
+
+async def generate_terms_of_service(
+    # Dane usługodawcy (Art. 5 UŚUDE)
+    company_name: str,
+    company_address: str,
+    company_nip: str = "",
+    company_regon: str = "",
+    company_krs: str = "",
+    contact_email: str = "",
+    contact_phone: str = "",
+
+    # Dane o usłudze
+    service_type: str = "saas",
+    service_description: str = "",
+    website_url: str = "",
+
+    # Model biznesowy
+    pricing_model: str = "",
+    payment_terms: str = "",
+    subscription_based: bool = False,
+    free_trial: bool = False,
+    free_trial_days: int = 14,
+
+    # Typ klientów
+    b2b_only: bool = False,
+
+    # Polityki
+    refund_policy: str = "",
+
+    # Treści cyfrowe (Art. 38 pkt 13)
+    digital_content: bool = False,
+    digital_content_description: str = "",
+) -> dict:
+    """Generuje regulamin świadczenia usług drogą elektroniczną.
+
+    Zgodny z:
+    - Art. 8 ustawy o świadczeniu usług drogą elektroniczną
+    - Ustawą o prawach konsumenta (jeśli B2C)
+    - Art. 384-385⁴ Kodeksu cywilnego (wzorce umowne)
+
+    Args:
+        company_name: Pełna nazwa firmy
+        company_address: Adres siedziby
+        company_nip: NIP
+        company_regon: REGON
+        company_krs: Numer KRS (jeśli dotyczy)
+        contact_email: Email kontaktowy
+        contact_phone: Telefon kontaktowy
+        service_type: Typ usługi (saas, ecommerce, marketplace, consulting, agency)
+        service_description: Opis usługi
+        website_url: Adres strony internetowej
+        pricing_model: Model cenowy
+        payment_terms: Warunki płatności
+        subscription_based: Czy model subskrypcyjny
+        free_trial: Czy oferowany okres próbny
+        free_trial_days: Liczba dni okresu próbnego
+        b2b_only: Czy tylko dla firm (B2B)
+        refund_policy: Polityka zwrotów
+        digital_content: Czy dostarcza treści cyfrowe
+        digital_content_description: Opis treści cyfrowych
+
+    Returns:
+        Słownik z pełnym regulaminem i metadanymi
+    """
+    llm = _get_llm()
+
+    applicable_exceptions = _TERMS_EXCEPTIONS[(bool(digital_content), service_type.lower() == "saas")]
+    effective_date = _get_current_date()
+
+    dynamic_suffix = _build_terms_dynamic_suffix(
+        company_name=company_name,
+        company_address=company_address,
+        company_nip=company_nip,
+        company_regon=company_regon,
+        company_krs=company_krs,
+        contact_email=contact_email,
+        contact_phone=contact_phone,
+        service_type=service_type,
+        service_description=service_description,
+        website_url=website_url,
+        pricing_model=pricing_model,
+        payment_terms=payment_terms,
+        subscription_based=subscription_based,
+        free_trial=free_trial,
+        free_trial_days=free_trial_days,
+        b2b_only=b2b_only,
+        refund_policy=refund_policy,
+        digital_content=digital_content,
+        digital_content_description=digital_content_description,
+        effective_date=effective_date,
+    )
+
+    # Identyczne dane (ponowienia, podglądy, podwójne wysłanie formularza) nie wołają modelu drugi raz
+    cache_key = document_cache_key(
+        "terms", llm.model_name, _TERMS_BACKSTORY, _TERMS_STATIC_PROMPT, dynamic_suffix
+    )
+    terms = await get_cached_document(cache_key)
+
+    if terms is None:
+        # Każdy paragraf to osobne, krótkie wywołanie - wspólny prefiks promptu, równoległe generowanie
+        prompt = f"{_TERMS_STATIC_PROMPT}\n{dynamic_suffix}"
+        section_specs = _TERMS_SECTIONS_B2B if b2b_only else _TERMS_SECTIONS_B2C
+
+        (extras, complete), *section_results = await asyncio.gather(
+            _generate_terms_extras(llm, prompt),
+            *[
+                _generate_terms_section(llm, prompt, number, title)
+                for number, title in section_specs
+            ],
+        )
+        sections = [section for section, _ in section_results]
+
+        terms = {"sections": sections, "full_text": _join_terms_text(sections), **extras}
+
+        # Do cache idzie tylko kompletny regulamin
+        if complete and all(ok for _, ok in section_results):
+            await cache_document(cache_key, terms)
+
+    # Dodaj wzór formularza odstąpienia dla B2C
+    withdrawal_form = None
+    if not b2b_only:
+        withdrawal_form = _fill_withdrawal_form(company_name, company_address, contact_email)
+
+    terms = {
+        "title": "REGULAMIN ŚWIADCZENIA USŁUG DROGĄ ELEKTRONICZNĄ",
+        "service_provider": company_name,
+        "version": "1.0",
+        "effective_date": effective_date,
+        "legal_basis": _TERMS_LEGAL_BASIS,
+        **terms,
+        "withdrawal_form": withdrawal_form,
+        "disclaimer": "Niniejszy dokument stanowi wzór i wymaga weryfikacji przez radcę prawnego lub adwokata przed wdrożeniem.",
+    }
+
+    return {
+        "success": True,
+        "terms_of_service": terms,
+        "legal_basis": _TERMS_LEGAL_REFS_B2B if b2b_only else _TERMS_LEGAL_REFS_B2C,
+        "withdrawal_form": withdrawal_form,
+        "withdrawal_exceptions": applicable_exceptions if not b2b_only else None,
+        "required_consumer_info": REQUIRED_CONSUMER_INFO if not b2b_only else None,
+        "is_b2c": not b2b_only,
+        "disclaimer": "Dokument wymaga weryfikacji przez radcę prawnego lub adwokata przed wdrożeniem.",
+    }
+
+
+async def generate_terms_of_service_stream(
+    company_name: str,
+    company_address: str,
+    company_nip: str = "",
+    company_regon: str = "",
+    company_krs: str = "",
+    contact_email: str = "",
+    contact_phone: str = "",
+    service_type: str = "saas",
+    service_description: str = "",
+    website_url: str = "",
+    pricing_model: str = "",
+    payment_terms: str = "",
+    subscription_based: bool = False,
+    free_trial: bool = False,
+    free_trial_days: int = 14,
+    b2b_only: bool = False,
+    refund_policy: str = "",
+    digital_content: bool = False,
+    digital_content_description: str = "",
+) -> AsyncIterator[dict]:
+    """Generuje regulamin strumieniowo - paragraf po paragrafie.
+
+    Te same argumenty co ``generate_terms_of_service``. Najpierw zwraca
+    metadane dokumentu, potem każdy paragraf jako ``{"section": {...}}``
+    od razu po jego wygenerowaniu (w kolejności ukończenia), a na końcu
+    pozostałe pola regulaminu razem z ``full_text`` ułożonym wg numeracji.
+    """
+    llm = _get_llm()
+    effective_date = _get_current_date()
 
-    # Dodaj wzór formularza odstąpienia dla B2C
     withdrawal_form = None
     if not b2b_only:
-        withdrawal_form = WITHDRAWAL_FORM_TEMPLATE.replace(
-            "[NAZWA PRZEDSIĘBIORCY]", company_name
-        ).replace(
-            "[ADRES PRZEDSIĘBIORCY]", company_address
-        ).replace(
-            "[EMAIL PRZEDSIĘBIORCY]", contact_email or "[EMAIL]"
-        )
-
-    return {
-        "success": True,
-        "terms_of_service": parsed_result or {"full_text": result_text},
-        "legal_basis": {
-            "uśude": POLISH_ECOMMERCE_LAW["uśude"],
-            "ustawa_konsumencka": POLISH_ECOMMERCE_LAW["ustawa_konsumencka"] if not b2b_only else None,
-        },
+        withdrawal_form = _fill_withdrawal_form(company_name, company_address, contact_email)
+
+    yield {
+        "title": "REGULAMIN ŚWIADCZENIA USŁUG DROGĄ ELEKTRONICZNĄ",
+        "service_provider": company_name,
+        "version": "1.0",
+        "effective_date": effective_date,
+        "legal_basis": _TERMS_LEGAL_BASIS,
         "withdrawal_form": withdrawal_form,
-        "withdrawal_exceptions": applicable_exceptions if not b2b_only else None,
-        "required_consumer_info": REQUIRED_CONSUMER_INFO if not b2b_only else None,
-        "is_b2c": not b2b_only,
-        "disclaimer": "Dokument wymaga weryfikacji przez radcę prawnego lub adwokata przed wdrożeniem.",
+    }
+
+    dynamic_suffix = _build_terms_dynamic_suffix(
+        company_name=company_name,
+        company_address=company_address,
+        company_nip=company_nip,
+        company_regon=company_regon,
+        company_krs=company_krs,
+        contact_email=contact_email,
+        contact_phone=contact_phone,
+        service_type=service_type,
+        service_description=service_description,
+        website_url=website_url,
+        pricing_model=pricing_model,
+        payment_terms=payment_terms,
+        subscription_based=subscription_based,
+        free_trial=free_trial,
+        free_trial_days=free_trial_days,
+        b2b_only=b2b_only,
+        refund_policy=refund_policy,
+        digital_content=digital_content,
+        digital_content_description=digital_content_description,
+        effective_date=effective_date,
+    )
+    prompt = f"{_TERMS_STATIC_PROMPT}\n{dynamic_suffix}"
+    section_specs = _TERMS_SECTIONS_B2B if b2b_only else _TERMS_SECTIONS_B2C
+
+    extras_task = asyncio.create_task(_generate_terms_extras(llm, prompt))
+    section_tasks = [
+        asyncio.create_task(_generate_terms_section(llm, prompt, number, title))
+        for number, title in section_specs
+    ]
+
+    try:
+        for finished in asyncio.as_completed(section_tasks):
+            section, _ = await finished
+            yield {"section": section}
+
+        extras, _ = await extras_task
+    finally:
+        # Klient przerwał strumień - nie generujemy reszty paragrafów na próżno
+        for task in (extras_task, *section_tasks):
+            task.cancel()
+
+    sections = [task.result()[0] for task in section_tasks]
+    yield {
+        "full_text": _join_terms_text(sections),
+        **extras,
+        "disclaimer": "Niniejszy dokument stanowi wzór i wymaga weryfikacji przez radcę prawnego lub adwokata przed wdrożeniem.",
     }
 
 
@@ -559,210 +1190,143 @@ async def generate_return_policy(
         free_returns: Czy zwroty są bezpłatne
         return_shipping_cost: Koszt zwrotu jeśli płatny
         non_returnable_products: Lista produktów niepodlegających zwrotowi
+            (dopasowana do wyjątków z Art. 38 w odpowiedzi)
 
     Returns:
         Słownik z polityką zwrotów
     """
     llm = _get_llm()
 
-    # Upewnij się że okres zwrotu nie jest krótszy niż ustawowy
-    if return_period_days < 14:
-        return_period_days = 14
-
-    actual_return_period = extended_days if extended_return_period else return_period_days
-
-    # Przygotuj listę wyjątków
-    exceptions_list = []
-    if non_returnable_products:
-        for product in non_returnable_products:
-            # Dopasuj do ustawowych wyjątków
-            for exc in WITHDRAWAL_EXCEPTIONS:
-                if any(keyword in product.lower() for keyword in exc["example"].lower().split(", ")):
-                    exceptions_list.append(exc)
-                    break
-
-    policy_writer = Agent(
-        role="Specjalista ds. Polityki Zwrotów",
-        goal="Tworzyć polityki zwrotów zgodne z polskim prawem konsumenckim",
-        backstory=f"""Jesteś ekspertem od praw konsumenta w Polsce. Znasz:
-
-        1. Ustawę o prawach konsumenta:
-           - Art. 27: 14 dni na odstąpienie bez przyczyny
-           - Art. 28-30: Bieg terminu odstąpienia
-           - Art. 31-33: Skutki odstąpienia (zwrot płatności)
-           - Art. 34: Obowiązki konsumenta przy odstąpieniu
-           - Art. 38: Wyjątki od prawa odstąpienia
-
-        2. Kodeks cywilny:
-           - Art. 556-576: Rękojmia za wady (2 lata)
-           - Art. 577-581: Gwarancja (dobrowolna)
-
-        Tworzysz polityki, które:
-        - Spełniają minimalne wymogi ustawowe
-        - Są zrozumiałe dla konsumentów
-        - Zawierają wzór formularza odstąpienia
-        - Jasno określają procedurę i terminy""",
-        tools=[],
-        llm=llm,
-        verbose=False,
+    # Okres zwrotu nie może być krótszy niż ustawowy
+    actual_return_period = _return_policy_period(
+        return_period_days, extended_return_period, extended_days
     )
 
-    exceptions_text = ""
-    for exc in WITHDRAWAL_EXCEPTIONS:
-        exceptions_text += f"\n- {exc['article']}: {exc['description']}"
-
-    task = Task(
-        description=f"""
-        Stwórz politykę zwrotów i reklamacji zgodną z prawem polskim.
-
-        ═══════════════════════════════════════════════════════════════════
-        DANE SPRZEDAWCY:
-        ═══════════════════════════════════════════════════════════════════
-        Nazwa: {company_name}
-        Adres do zwrotów: {company_address}
-        Email: {contact_email or "[DO UZUPEŁNIENIA]"}
-        Telefon: {contact_phone or "[DO UZUPEŁNIENIA]"}
-
-        ═══════════════════════════════════════════════════════════════════
-        CHARAKTERYSTYKA:
-        ═══════════════════════════════════════════════════════════════════
-        Typ działalności: {business_type}
-        Rodzaj produktów: {products_type or "różne"}
-
-        ═══════════════════════════════════════════════════════════════════
-        WARUNKI ZWROTÓW:
-        ═══════════════════════════════════════════════════════════════════
-        Okres na odstąpienie: {actual_return_period} dni {"(wydłużony ponad ustawowe 14 dni)" if extended_return_period else "(ustawowe minimum)"}
-        Przyjmowanie otwartych produktów: {"Tak" if accepts_opened_products else "Nie"}
-        Wymagane oryginalne opakowanie: {"Tak" if requires_original_packaging else "Nie"}
-        Bezpłatne zwroty: {"Tak" if free_returns else "Nie - koszt: " + (return_shipping_cost or "wg cennika przewoźnika")}
-
-        ═══════════════════════════════════════════════════════════════════
-        USTAWOWE WYJĄTKI OD PRAWA ODSTĄPIENIA (Art. 38):
-        ═══════════════════════════════════════════════════════════════════
-        {exceptions_text}
-
-        ═══════════════════════════════════════════════════════════════════
-        STRUKTURA POLITYKI:
-        ═══════════════════════════════════════════════════════════════════
-
-        1. PRAWO ODSTĄPIENIA OD UMOWY (Art. 27-30)
-           - 14 dni od otrzymania towaru (lub {actual_return_period} dni)
-           - Bez podania przyczyny
-           - Jak liczyć termin
-
-        2. SPOSÓB ODSTĄPIENIA (Art. 30)
-           - Oświadczenie o odstąpieniu (email/formularz/pismo)
-           - Wzór formularza (Załącznik nr 2 do ustawy)
-
-        3. ZWROT TOWARU (Art. 34)
-           - Termin: 14 dni od złożenia oświadczenia
-           - Stan towaru
-           - Adres do zwrotów
-
-        4. ZWROT PŁATNOŚCI (Art. 32-33)
-           - Termin: 14 dni od otrzymania oświadczenia
-           - Ta sama metoda płatności
-           - Koszty dostawy (najtańszy sposób)
-
-        5. KOSZTY ZWROTU (Art. 34)
-           - Kto ponosi koszty odesłania
-
-        6. WYJĄTKI (Art. 38)
-           - Produkty niepodlegające zwrotowi
-
-        7. REKLAMACJE - RĘKOJMIA (Art. 556-576 KC)
-           - 2 lata odpowiedzialności
-           - Domniemanie wady (1 rok)
-           - Uprawnienia: naprawa/wymiana/obniżenie ceny/odstąpienie
-           - Termin rozpatrzenia: 14 dni
-
-        8. GWARANCJA (jeśli dotyczy)
-           - Oddzielnie od rękojmi
-
-        9. DANE KONTAKTOWE
-
-        ═══════════════════════════════════════════════════════════════════
-        FORMAT ODPOWIEDZI (JSON):
-        ═══════════════════════════════════════════════════════════════════
-
-        {{
-            "title": "POLITYKA ZWROTÓW I REKLAMACJI",
-            "effective_date": "{_get_current_date()}",
-            "legal_basis": [
-                "Art. 27-38 ustawy o prawach konsumenta",
-                "Art. 556-576 Kodeksu cywilnego (rękojmia)"
-            ],
-            "sections": [
-                {{
-                    "number": "1",
-                    "title": "tytuł",
-                    "content": "treść z odniesieniami do artykułów"
-                }}
-            ],
-            "full_text": "pełna sformatowana treść polityki",
-            "quick_facts": [
-                {{"label": "Termin odstąpienia", "value": "{actual_return_period} dni"}},
-                {{"label": "Termin zwrotu pieniędzy", "value": "14 dni"}},
-                {{"label": "Rękojmia", "value": "24 miesiące"}}
-            ],
-            "withdrawal_form": "wzór formularza odstąpienia",
-            "contact_info": {{
-                "email": "{contact_email}",
-                "phone": "{contact_phone}",
-                "address": "{company_address}"
-            }}
-        }}
-        """,
-        agent=policy_writer,
-        expected_output="Polityka zwrotów w formacie JSON",
+    dynamic_suffix = _build_return_policy_dynamic_suffix(
+        company_name=company_name,
+        company_address=company_address,
+        contact_email=contact_email,
+        contact_phone=contact_phone,
+        business_type=business_type,
+        products_type=products_type,
+        actual_return_period=actual_return_period,
+        extended_return_period=extended_return_period,
+        accepts_opened_products=accepts_opened_products,
+        requires_original_packaging=requires_original_packaging,
+        free_returns=free_returns,
+        return_shipping_cost=return_shipping_cost,
+        effective_date=_get_current_date(),
     )
 
-    crew = Crew(
-        agents=[policy_writer],
-        tasks=[task],
-        process=Process.sequential,
-        verbose=False,
+    # Te same warunki zwrotów (podgląd, ponowny onboarding) nie wołają modelu drugi raz
+    cache_key = document_cache_key(
+        "return_policy",
+        llm.model_name,
+        _RETURN_POLICY_BACKSTORY,
+        _RETURN_POLICY_STATIC_PROMPT,
+        dynamic_suffix,
     )
+    return_policy = await get_cached_document(cache_key)
+
+    if return_policy is None:
+        messages = [
+            SystemMessage(content=_RETURN_POLICY_BACKSTORY),
+            HumanMessage(content=_RETURN_POLICY_STATIC_PROMPT + dynamic_suffix),
+        ]
+
+        result = await _invoke_with_retry(
+            llm.bind(response_format=_RETURN_POLICY_FORMAT),
+            messages,
+            timeout=_LLM_DOCUMENT_CALL_TIMEOUT,
+        )
+        result_text = result.content
 
-    result = crew.kickoff()
-    result_text = str(result)
-
-    json_match = re.search(r'\{[\s\S]*\}', result_text)
-
-    parsed_result = None
-    if json_match:
         try:
-            parsed_result = json.loads(json_match.group())
-        except json.JSONDecodeError:
-            pass
+            parsed_result = orjson.loads(result_text)
+        except orjson.JSONDecodeError:
+            # Ucięta odpowiedź (limit tokenów) - zwracamy surowy tekst
+            parsed_result = None
+
+        # Do cache idzie tylko poprawnie sparsowana polityka
+        if parsed_result:
+            await cache_document(cache_key, parsed_result)
+        return_policy = parsed_result or {"full_text": result_text}
 
     # Wzór formularza odstąpienia
-    withdrawal_form = WITHDRAWAL_FORM_TEMPLATE.replace(
-        "[NAZWA PRZEDSIĘBIORCY]", company_name
-    ).replace(
-        "[ADRES PRZEDSIĘBIORCY]", company_address
-    ).replace(
-        "[EMAIL PRZEDSIĘBIORCY]", contact_email or "[EMAIL]"
-    )
+    withdrawal_form = _fill_withdrawal_form(company_name, company_address, contact_email)
 
     return {
         "success": True,
-        "return_policy": parsed_result or {"full_text": result_text},
-        "legal_basis": {
-            "prawo_odstąpienia": {
-                "articles": "Art. 27-38 ustawy o prawach konsumenta",
-                "period": f"{actual_return_period} dni",
-                "refund_deadline": "14 dni od otrzymania oświadczenia",
-            },
-            "rękojmia": {
-                "articles": "Art. 556-576 Kodeksu cywilnego",
-                "period": "24 miesiące od wydania rzeczy",
-                "presumption": "12 miesięcy domniemanie istnienia wady",
-            },
-        },
+        "return_policy": return_policy,
+        "legal_basis": _return_policy_legal_basis(actual_return_period),
         "withdrawal_form": withdrawal_form,
         "withdrawal_exceptions": WITHDRAWAL_EXCEPTIONS,
+        "non_returnable_products": _match_withdrawal_exceptions(non_returnable_products or []),
+        "disclaimer": "Dokument wymaga weryfikacji przez radcę prawnego lub adwokata przed wdrożeniem.",
+    }
+
+
+async def generate_return_policy_stream(
+    company_name: str,
+    company_address: str,
+    contact_email: str = "",
+    contact_phone: str = "",
+    business_type: str = "ecommerce",
+    products_type: str = "",
+    return_period_days: int = 14,
+    extended_return_period: bool = False,
+    extended_days: int = 30,
+    accepts_opened_products: bool = True,
+    requires_original_packaging: bool = False,
+    free_returns: bool = False,
+    return_shipping_cost: str = "",
+) -> AsyncIterator[dict]:
+    """Strumieniuje politykę zwrotów pole po polu.
+
+    Te same dane co ``generate_return_policy``, ale zamiast czekać na cały
+    dokument, odpowiedź modelu jest strumieniowana i każde pole JSON polityki
+    (np. ``title``, ``sections``, ``quick_facts``) trafia do klienta jako
+    ``{pole: wartość}`` zaraz po domknięciu. Strumień modelu jest przerywany,
+    gdy obiekt JSON się zamknie. Ostatni element zawiera podstawę prawną,
+    ustawowy wzór formularza odstąpienia i zastrzeżenie.
+    """
+    actual_return_period = _return_policy_period(
+        return_period_days, extended_return_period, extended_days
+    )
+
+    messages = [
+        SystemMessage(content=_RETURN_POLICY_BACKSTORY),
+        HumanMessage(content=_RETURN_POLICY_STATIC_PROMPT + _build_return_policy_dynamic_suffix(
+            company_name=company_name,
+            company_address=company_address,
+            contact_email=contact_email,
+            contact_phone=contact_phone,
+            business_type=business_type,
+            products_type=products_type,
+            actual_return_period=actual_return_period,
+            extended_return_period=extended_return_period,
+            accepts_opened_products=accepts_opened_products,
+            requires_original_packaging=requires_original_packaging,
+            free_returns=free_returns,
+            return_shipping_cost=return_shipping_cost,
+            effective_date=_get_current_date(),
+        )),
+    ]
+    llm = _get_llm().bind(response_format=_RETURN_POLICY_FORMAT)
+    scanner = JsonFieldStream()
+
+    # aclosing - przerwany strumień zamyka odpowiedź HTTP przed zwolnieniem semafora
+    async with _LLM_SEMAPHORE, aclosing(llm.astream(messages)) as stream:
+        async for chunk in stream:
+            for key, value in scanner.feed(chunk.content):
+                yield {key: value}
+            if scanner.done:
+                break
+
+    yield {
+        "legal_basis": _return_policy_legal_basis(actual_return_period),
+        "withdrawal_form": _fill_withdrawal_form(company_name, company_address, contact_email),
+        "withdrawal_exceptions": WITHDRAWAL_EXCEPTIONS,
         "disclaimer": "Dokument wymaga weryfikacji przez radcę prawnego lub adwokata przed wdrożeniem.",
     }
 
@@ -771,6 +1335,63 @@ async def generate_return_policy(
 # GENERATOR ZGÓD MARKETINGOWYCH (RODO + PRAWO TELEKOMUNIKACYJNE)
 # =============================================================================
 
+# Klauzule zgód w kolejności wyświetlania - zmienia się tylko nazwa administratora
+_CONSENT_CATALOG = {
+    "newsletter": {
+        "id": "newsletter",
+        "type": "email_marketing",
+        "required": False,
+        "legal_basis": "Art. 6 ust. 1 lit. a) RODO, Art. 10 UŚUDE",
+        "text": "Wyrażam zgodę na otrzymywanie od {company_name} informacji handlowych "
+               "drogą elektroniczną (newsletter) na podany adres e-mail, zgodnie z art. 10 "
+               "ustawy o świadczeniu usług drogą elektroniczną.",
+        "withdrawal_info": "Zgodę można wycofać w każdym czasie poprzez kliknięcie w link "
+                          "rezygnacji w stopce wiadomości lub kontakt z administratorem.",
+    },
+    "sms_marketing": {
+        "id": "sms_marketing",
+        "type": "sms_marketing",
+        "required": False,
+        "legal_basis": "Art. 172 Prawa telekomunikacyjnego",
+        "text": "Wyrażam zgodę na otrzymywanie od {company_name} informacji handlowych "
+               "za pomocą wiadomości SMS na podany numer telefonu, zgodnie z art. 172 "
+               "ustawy Prawo telekomunikacyjne.",
+        "withdrawal_info": "Zgodę można wycofać w każdym czasie wysyłając SMS o treści STOP "
+                          "lub kontaktując się z administratorem.",
+    },
+    "phone_marketing": {
+        "id": "phone_marketing",
+        "type": "telemarketing",
+        "required": False,
+        "legal_basis": "Art. 172 Prawa telekomunikacyjnego",
+        "text": "Wyrażam zgodę na kontakt telefoniczny ze strony {company_name} "
+               "w celach marketingowych, zgodnie z art. 172 ustawy Prawo telekomunikacyjne.",
+        "withdrawal_info": "Zgodę można wycofać w każdym czasie kontaktując się z administratorem.",
+    },
+    "profiling": {
+        "id": "profiling",
+        "type": "profiling",
+        "required": False,
+        "legal_basis": "Art. 6 ust. 1 lit. a) RODO, Art. 22 RODO",
+        "text": "Wyrażam zgodę na profilowanie moich danych przez {company_name} "
+               "w celu dostosowania treści marketingowych do moich preferencji, "
+               "zgodnie z art. 22 RODO.",
+        "withdrawal_info": "Zgodę można wycofać w każdym czasie kontaktując się z administratorem. "
+                          "Wycofanie zgody nie wpływa na zgodność z prawem przetwarzania przed jej wycofaniem.",
+    },
+    "third_party_marketing": {
+        "id": "third_party",
+        "type": "third_party_marketing",
+        "required": False,
+        "legal_basis": "Art. 6 ust. 1 lit. a) RODO",
+        "text": "Wyrażam zgodę na udostępnienie moich danych osobowych przez {company_name} "
+               "zaufanym partnerom handlowym w celach marketingowych. Lista partnerów "
+               "dostępna jest w Polityce Prywatności.",
+        "withdrawal_info": "Zgodę można wycofać w każdym czasie kontaktując się z administratorem.",
+    },
+}
+
+
 async def generate_marketing_consents(
     company_name: str,
     newsletter: bool = True,
@@ -798,69 +1419,18 @@ async def generate_marketing_consents(
     Returns:
         Słownik z klauzulami zgód
     """
-    consents = []
-
-    if newsletter:
-        consents.append({
-            "id": "newsletter",
-            "type": "email_marketing",
-            "required": False,
-            "legal_basis": "Art. 6 ust. 1 lit. a) RODO, Art. 10 UŚUDE",
-            "text": f"Wyrażam zgodę na otrzymywanie od {company_name} informacji handlowych "
-                   f"drogą elektroniczną (newsletter) na podany adres e-mail, zgodnie z art. 10 "
-                   f"ustawy o świadczeniu usług drogą elektroniczną.",
-            "withdrawal_info": "Zgodę można wycofać w każdym czasie poprzez kliknięcie w link "
-                              "rezygnacji w stopce wiadomości lub kontakt z administratorem.",
-        })
-
-    if sms_marketing:
-        consents.append({
-            "id": "sms_marketing",
-            "type": "sms_marketing",
-            "required": False,
-            "legal_basis": "Art. 172 Prawa telekomunikacyjnego",
-            "text": f"Wyrażam zgodę na otrzymywanie od {company_name} informacji handlowych "
-                   f"za pomocą wiadomości SMS na podany numer telefonu, zgodnie z art. 172 "
-                   f"ustawy Prawo telekomunikacyjne.",
-            "withdrawal_info": "Zgodę można wycofać w każdym czasie wysyłając SMS o treści STOP "
-                              "lub kontaktując się z administratorem.",
-        })
-
-    if phone_marketing:
-        consents.append({
-            "id": "phone_marketing",
-            "type": "telemarketing",
-            "required": False,
-            "legal_basis": "Art. 172 Prawa telekomunikacyjnego",
-            "text": f"Wyrażam zgodę na kontakt telefoniczny ze strony {company_name} "
-                   f"w celach marketingowych, zgodnie z art. 172 ustawy Prawo telekomunikacyjne.",
-            "withdrawal_info": "Zgodę można wycofać w każdym czasie kontaktując się z administratorem.",
-        })
-
-    if profiling:
-        consents.append({
-            "id": "profiling",
-            "type": "profiling",
-            "required": False,
-            "legal_basis": "Art. 6 ust. 1 lit. a) RODO, Art. 22 RODO",
-            "text": f"Wyrażam zgodę na profilowanie moich danych przez {company_name} "
-                   f"w celu dostosowania treści marketingowych do moich preferencji, "
-                   f"zgodnie z art. 22 RODO.",
-            "withdrawal_info": "Zgodę można wycofać w każdym czasie kontaktując się z administratorem. "
-                              "Wycofanie zgody nie wpływa na zgodność z prawem przetwarzania przed jej wycofaniem.",
-        })
-
-    if third_party_marketing:
-        consents.append({
-            "id": "third_party",
-            "type": "third_party_marketing",
-            "required": False,
-            "legal_basis": "Art. 6 ust. 1 lit. a) RODO",
-            "text": f"Wyrażam zgodę na udostępnienie moich danych osobowych przez {company_name} "
-                   f"zaufanym partnerom handlowym w celach marketingowych. Lista partnerów "
-                   f"dostępna jest w Polityce Prywatności.",
-            "withdrawal_info": "Zgodę można wycofać w każdym czasie kontaktując się z administratorem.",
-        })
+    selected = {
+        "newsletter": newsletter,
+        "sms_marketing": sms_marketing,
+        "phone_marketing": phone_marketing,
+        "profiling": profiling,
+        "third_party_marketing": third_party_marketing,
+    }
+    consents = [
+        {**consent, "text": consent["text"].format_map({"company_name": company_name})}
+        for key, consent in _CONSENT_CATALOG.items()
+        if selected[key]
+    ]
 
     return {
         "success": True,
@@ -887,6 +1457,59 @@ async def generate_marketing_consents(
 # GENERATOR KLAUZULI INFORMACYJNEJ (Art. 13 RODO)
 # =============================================================================
 
+# Treści klauzuli niezależne od danych administratora - budowane raz przy imporcie
+_NOTICE_NO_DPO = "Administrator nie wyznaczył Inspektora Ochrony Danych."
+
+_NOTICE_NO_TRANSFER = "Dane nie są przekazywane poza Europejski Obszar Gospodarczy."
+
+_NOTICE_DEFAULT_RETENTION = (
+    "Dane przechowywane są przez okres niezbędny do realizacji celu, "
+    "a po jego zakończeniu przez okres wymagany przepisami prawa (np. podatkowego) "
+    "lub do czasu przedawnienia roszczeń."
+)
+
+# Sekcje 8-10 są identyczne w każdej klauzuli
+_NOTICE_STATIC_SECTIONS = (
+    {
+        "number": "8",
+        "title": "Prawa osoby",
+        "content": """Przysługuje Pani/Panu prawo do:
+                - dostępu do danych (Art. 15 RODO)
+                - sprostowania danych (Art. 16 RODO)
+                - usunięcia danych (Art. 17 RODO)
+                - ograniczenia przetwarzania (Art. 18 RODO)
+                - przenoszenia danych (Art. 20 RODO)
+                - sprzeciwu (Art. 21 RODO)
+                - wniesienia skargi do Prezesa UODO""",
+    },
+    {
+        "number": "9",
+        "title": "Dobrowolność podania danych",
+        "content": "Podanie danych jest dobrowolne, jednak niezbędne do zawarcia i realizacji umowy.",
+    },
+    {
+        "number": "10",
+        "title": "Zautomatyzowane podejmowanie decyzji",
+        "content": "Administrator nie podejmuje decyzji opartych wyłącznie na zautomatyzowanym przetwarzaniu, "
+                  "w tym profilowaniu, które wywołują skutki prawne lub istotnie wpływają na osobę.",
+    },
+)
+
+_NOTICE_REQUIRED_ELEMENTS = (
+    "Tożsamość i dane kontaktowe administratora",
+    "Dane kontaktowe IOD (jeśli powołany)",
+    "Cele przetwarzania i podstawa prawna",
+    "Prawnie uzasadnione interesy (jeśli dotyczy)",
+    "Odbiorcy danych",
+    "Informacja o transferze poza EOG (jeśli dotyczy)",
+    "Okres przechowywania",
+    "Prawa osoby",
+    "Informacja o prawie do skargi do organu nadzorczego",
+    "Czy podanie danych jest wymogiem ustawowym/umownym",
+    "Informacja o zautomatyzowanym podejmowaniu decyzji",
+)
+
+
 async def generate_data_collection_notice(
     company_name: str,
     company_address: str,
@@ -937,8 +1560,7 @@ async def generate_data_collection_notice(
             {
                 "number": "2",
                 "title": "Inspektor Ochrony Danych",
-                "content": f"Kontakt z IOD: {dpo_email}" if dpo_email
-                          else "Administrator nie wyznaczył Inspektora Ochrony Danych.",
+                "content": f"Kontakt z IOD: {dpo_email}" if dpo_email else _NOTICE_NO_DPO,
             },
             {
                 "number": "3",
@@ -963,64 +1585,181 @@ async def generate_data_collection_notice(
                 "content": (
                     f"Dane mogą być przekazywane do państw trzecich: {', '.join(transfer_countries or [])}. "
                     f"Transfer odbywa się na podstawie standardowych klauzul umownych zatwierdzonych przez Komisję Europejską."
-                ) if transfer_outside_eu else "Dane nie są przekazywane poza Europejski Obszar Gospodarczy.",
+                ) if transfer_outside_eu else _NOTICE_NO_TRANSFER,
             },
             {
                 "number": "7",
                 "title": "Okres przechowywania",
-                "content": retention_period or "Dane przechowywane są przez okres niezbędny do realizacji celu, "
-                          "a po jego zakończeniu przez okres wymagany przepisami prawa (np. podatkowego) "
-                          "lub do czasu przedawnienia roszczeń.",
-            },
-            {
-                "number": "8",
-                "title": "Prawa osoby",
-                "content": """Przysługuje Pani/Panu prawo do:
-                - dostępu do danych (Art. 15 RODO)
-                - sprostowania danych (Art. 16 RODO)
-                - usunięcia danych (Art. 17 RODO)
-                - ograniczenia przetwarzania (Art. 18 RODO)
-                - przenoszenia danych (Art. 20 RODO)
-                - sprzeciwu (Art. 21 RODO)
-                - wniesienia skargi do Prezesa UODO""",
-            },
-            {
-                "number": "9",
-                "title": "Dobrowolność podania danych",
-                "content": "Podanie danych jest dobrowolne, jednak niezbędne do zawarcia i realizacji umowy.",
-            },
-            {
-                "number": "10",
-                "title": "Zautomatyzowane podejmowanie decyzji",
-                "content": "Administrator nie podejmuje decyzji opartych wyłącznie na zautomatyzowanym przetwarzaniu, "
-                          "w tym profilowaniu, które wywołują skutki prawne lub istotnie wpływają na osobę.",
+                "content": retention_period or _NOTICE_DEFAULT_RETENTION,
             },
+            # Kopie - wynik może być modyfikowany (np. przez pakiety dokumentów)
+            *(dict(section) for section in _NOTICE_STATIC_SECTIONS),
         ],
     }
 
     # Wygeneruj pełny tekst
-    full_text = f"KLAUZULA INFORMACYJNA\n(Art. 13 RODO)\n\n"
-    for section in notice["sections"]:
-        full_text += f"{section['number']}. {section['title']}\n{section['content']}\n\n"
-
-    notice["full_text"] = full_text
+    notice["full_text"] = "KLAUZULA INFORMACYJNA\n(Art. 13 RODO)\n\n" + "".join(
+        f"{section['number']}. {section['title']}\n{section['content']}\n\n"
+        for section in notice["sections"]
+    )
 
     return {
         "success": True,
         "notice": notice,
         "legal_basis": "Art. 13 RODO - obowiązek informacyjny przy zbieraniu danych od osoby",
-        "required_elements": [
-            "Tożsamość i dane kontaktowe administratora",
-            "Dane kontaktowe IOD (jeśli powołany)",
-            "Cele przetwarzania i podstawa prawna",
-            "Prawnie uzasadnione interesy (jeśli dotyczy)",
-            "Odbiorcy danych",
-            "Informacja o transferze poza EOG (jeśli dotyczy)",
-            "Okres przechowywania",
-            "Prawa osoby",
-            "Informacja o prawie do skargi do organu nadzorczego",
-            "Czy podanie danych jest wymogiem ustawowym/umownym",
-            "Informacja o zautomatyzowanym podejmowaniu decyzji",
-        ],
+        "required_elements": list(_NOTICE_REQUIRED_ELEMENTS),
         "disclaimer": "Klauzula wymaga dostosowania do konkretnej sytuacji i weryfikacji prawnej.",
     }
+
+
+# =============================================================================
+# PAKIET ZGODNOŚCI
+# =============================================================================
+
+async def generate_compliance_bundle(
+    company_name: str,
+    company_address: str,
+    company_nip: str = "",
+    contact_email: str = "",
+    service_type: str = "saas",
+    service_description: str = "",
+    b2b_only: bool = False,
+    digital_content: bool = False,
+    iod_name: str = "",
+    iod_contact: str = "",
+    processing_activities: list[dict] | None = None,
+) -> dict:
+    """Generuje regulamin i szablon RCPD dla jednej firmy równolegle.
+
+    Oba dokumenty powstają z tych samych danych firmy i nie zależą od
+    siebie, więc wywołania LLM idą jednocześnie zamiast jedno po drugim.
+
+    Args:
+        company_name: Pełna nazwa firmy
+        company_address: Adres siedziby
+        company_nip: NIP
+        contact_email: Email kontaktowy
+        service_type: Typ usługi (saas, ecommerce, marketplace, consulting, agency)
+        service_description: Opis usługi
+        b2b_only: Czy tylko dla firm (B2B)
+        digital_content: Czy dostarcza treści cyfrowe
+        iod_name: Imię i nazwisko IOD (jeśli wyznaczony)
+        iod_contact: Kontakt do IOD
+        processing_activities: Czynności przetwarzania do RCPD
+
+    Returns:
+        Słownik z regulaminem i szablonem RCPD
+    """
+    terms, rcpd = await asyncio.gather(
+        generate_terms_of_service(
+            company_name=company_name,
+            company_address=company_address,
+            company_nip=company_nip,
+            contact_email=contact_email,
+            service_type=service_type,
+            service_description=service_description,
+            b2b_only=b2b_only,
+            digital_content=digital_content,
+        ),
+        generate_rcpd_template(
+            company_name=company_name,
+            company_nip=company_nip,
+            iod_name=iod_name,
+            iod_contact=iod_contact,
+            processing_activities=processing_activities,
+        ),
+    )
+
+    return {
+        "success": True,
+        "terms": terms,
+        "rcpd": rcpd["rcpd"],
+    }
+
+
+async def generate_all_legal_docs(
+    company_name: str,
+    company_address: str,
+    contact_email: str = "",
+    contact_phone: str = "",
+    company_nip: str = "",
+    service_type: str = "ecommerce",
+    service_description: str = "",
+    website_url: str = "",
+    b2b_only: bool = False,
+    digital_content: bool = False,
+    products_type: str = "",
+    non_returnable_products: list[str] | None = None,
+    newsletter: bool = True,
+    sms_marketing: bool = False,
+    dpo_email: Optional[str] = None,
+) -> dict:
+    """Generuje komplet dokumentów sklepu internetowego równolegle.
+
+    Regulamin, polityka zwrotów, zgody marketingowe i klauzula informacyjna
+    powstają z tych samych danych firmy. Dwa generatory korzystające z LLM
+    działają jednocześnie, a szablonowe kończą się od razu.
+
+    Args:
+        company_name: Pełna nazwa firmy
+        company_address: Adres siedziby (i zwrotów)
+        contact_email: Email kontaktowy
+        contact_phone: Telefon kontaktowy
+        company_nip: NIP
+        service_type: Typ usługi (saas, ecommerce, marketplace, consulting, agency)
+        service_description: Opis usługi
+        website_url: Adres strony
+        b2b_only: Czy tylko dla firm (B2B)
+        digital_content: Czy dostarcza treści cyfrowe
+        products_type: Rodzaj produktów
+        non_returnable_products: Lista produktów niepodlegających zwrotowi
+            (dopasowana do wyjątków z Art. 38 w odpowiedzi)
+        newsletter: Czy generować zgodę na newsletter
+        sms_marketing: Czy generować zgodę na SMS marketing
+        dpo_email: Email IOD (jeśli powołany)
+
+    Returns:
+        Słownik z czterema dokumentami
+    """
+    terms, return_policy, consents, notice = await asyncio.gather(
+        generate_terms_of_service(
+            company_name=company_name,
+            company_address=company_address,
+            company_nip=company_nip,
+            contact_email=contact_email,
+            contact_phone=contact_phone,
+            service_type=service_type,
+            service_description=service_description,
+            website_url=website_url,
+            b2b_only=b2b_only,
+            digital_content=digital_content,
+        ),
+        generate_return_policy(
+            company_name=company_name,
+            company_address=company_address,
+            contact_email=contact_email,
+            contact_phone=contact_phone,
+            business_type=service_type,
+            products_type=products_type,
+            non_returnable_products=non_returnable_products,
+        ),
+        generate_marketing_consents(
+            company_name=company_name,
+            newsletter=newsletter,
+            sms_marketing=sms_marketing,
+        ),
+        generate_data_collection_notice(
+            company_name=company_name,
+            company_address=company_address,
+            contact_email=contact_email,
+            dpo_email=dpo_email,
+        ),
+    )
+
+    return {
+        "success": True,
+        "terms": terms,
+        "return_policy": return_policy,
+        "marketing_consents": consents,
+        "data_collection_notice": notice,
+    }
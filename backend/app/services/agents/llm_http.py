@@ -0,0 +1,65 @@
+"""Wspólne pule połączeń HTTP dla klientów OpenAI agentów.
+
+Każdy ChatOpenAI/OpenAI tworzony bez http_client ma własną pulę, więc
+nowe połączenie (TCP + TLS) jest zestawiane osobno dla każdego klienta.
+Jedna pula na proces pozwala agentom używać tych samych połączeń keep-alive.
+
+Pule są tworzone przy pierwszym użyciu i zamykane przy zamknięciu aplikacji.
+Po zamknięciu kolejne wywołanie tworzy nowe (np. następny TestClient albo
+nowa pętla zdarzeń), a buforowane klienty LLM, które trzymały stare pule,
+są czyszczone - dlatego funkcje je budujące oznacza się uses_llm_http_clients.
+"""
+
+from collections.abc import Callable
+from typing import TypeVar
+
+import httpx
+
+LLM_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=32)
+
+_http_client: httpx.Client | None = None
+_http_async_client: httpx.AsyncClient | None = None
+
+# Bufory (lru_cache) obiektów trzymających pule - czyszczone razem z pulami
+_dependent_caches: list[Callable] = []
+
+CachedFactory = TypeVar("CachedFactory", bound=Callable)
+
+
+def get_llm_http_client() -> httpx.Client:
+    """Get the shared sync pool, creating a new one if it was closed."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.Client(limits=LLM_HTTP_LIMITS)
+    return _http_client
+
+
+def get_llm_http_async_client() -> httpx.AsyncClient:
+    """Get the shared async pool, creating a new one if it was closed."""
+    global _http_async_client
+    if _http_async_client is None or _http_async_client.is_closed:
+        _http_async_client = httpx.AsyncClient(limits=LLM_HTTP_LIMITS)
+    return _http_async_client
+
+
+def uses_llm_http_clients(factory: CachedFactory) -> CachedFactory:
+    """Register an lru_cached factory whose result holds the shared pools.
+
+    Its cache is cleared when the pools are closed, so the next call builds
+    the client again on fresh pools.
+    """
+    _dependent_caches.append(factory)
+    return factory
+
+
+async def close_llm_http_clients() -> None:
+    """Close the shared pools on application shutdown."""
+    global _http_client, _http_async_client
+    for factory in _dependent_caches:
+        factory.cache_clear()
+    if _http_client is not None:
+        _http_client.close()
+        _http_client = None
+    if _http_async_client is not None:
+        await _http_async_client.aclose()
+        _http_async_client = None
@@ -0,0 +1,43 @@
+"""Uruchamianie crew marketingowych - raportowanie etapów i limit czasu.
+
+Crew działa w wątku roboczym, więc callbacki zadań CrewAI przekazują wyniki
+z powrotem do pętli zdarzeń, a wywołujący może na bieżąco pokazać research
+i szkic, zanim recenzent skończy.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from crewai import Crew
+
+# (etap, tekst) - etapy: "research", "draft"
+ProgressCallback = Callable[[str, str], Awaitable[None]]
+
+
+def task_progress_callback(
+    on_progress: ProgressCallback | None,
+    stage: str,
+) -> Callable[[Any], None] | None:
+    """Build a CrewAI Task callback reporting its output from the worker thread."""
+    if on_progress is None:
+        return None
+
+    loop = asyncio.get_running_loop()
+
+    def report(task_output: Any) -> None:
+        asyncio.run_coroutine_threadsafe(on_progress(stage, str(task_output)), loop)
+
+    return report
+
+
+async def kickoff_with_timeout(crew: Crew, timeout_s: float | None) -> Any | None:
+    """Run crew.kickoff in a thread; None when it does not finish within timeout_s.
+
+    A thread cannot be cancelled - on timeout the crew finishes in the
+    background and its result is dropped.
+    """
+    try:
+        return await asyncio.wait_for(asyncio.to_thread(crew.kickoff), timeout=timeout_s)
+    except TimeoutError:
+        return None
@@ -0,0 +1,118 @@
+"""Cache odpowiedzi agentów marketingowych.
+
+Dwa poziomy, oba w obrębie firmy, typu treści i kontekstu marki:
+- identyczny brief - wpis w Redis pod skrótem treści, bez embeddingu;
+- prawie identyczny brief (podobieństwo cosinusowe >= 0.95) - wpis
+  w kolekcji pamięci agentów w Qdrant.
+Trafienie zwraca zapisany wynik zamiast uruchamiać cały crew.
+"""
+
+import hashlib
+from typing import Any
+
+from redis.exceptions import RedisError
+
+from app.services.agents.memory import memory_service
+from app.services.cache import get_cache_service
+
+RESPONSE_CACHE_MIN_SCORE = 0.95
+RESPONSE_CACHE_TTL = 86400  # 24 godziny
+RESPONSE_EXACT_CACHE_TTL = 3600  # 1 godzina
+
+# Liczniki w tym procesie - widoczne w /health/cache
+_stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0}
+
+
+def response_context_hash(*context_parts: Any) -> str:
+    """Hash the brand context and generation parameters a response depends on."""
+    digest = hashlib.sha256()
+    for part in context_parts:
+        digest.update(b"\0")
+        digest.update(str(part).encode())
+    return digest.hexdigest()
+
+
+def response_cache_stats() -> dict[str, int]:
+    """Response cache hits and misses counted by this process."""
+    return dict(_stats)
+
+
+def _exact_cache_key(brief: str, namespace: str, company_id: str, context_hash: str) -> str:
+    """Redis key for a response to exactly this brief."""
+    digest = hashlib.sha256()
+    for part in (namespace, company_id, context_hash, brief):
+        digest.update(b"\0")
+        digest.update(part.encode())
+    return f"marketing:response:{digest.hexdigest()}"
+
+
+async def semantic_cache_lookup(
+    brief: str,
+    namespace: str,
+    company_id: str,
+    context_hash: str,
+) -> tuple[dict[str, Any] | None, list[float] | None]:
+    """Look up a cached response; returns (hit, brief embedding for the store).
+
+    An exact brief is checked in Redis first, skipping the embedding.
+    Cache errors never fail generation - on any problem this is a miss.
+    """
+    try:
+        cache = await get_cache_service()
+        cached = await cache.get(_exact_cache_key(brief, namespace, company_id, context_hash))
+        if cached:
+            _stats["exact_hits"] += 1
+            return cached, None
+    except (RuntimeError, RedisError):
+        pass
+
+    try:
+        embedding = await memory_service.embed(brief)
+        if embedding is None:
+            _stats["misses"] += 1
+            return None, None
+        cached = await memory_service.find_cached_response(
+            company_id=company_id,
+            namespace=namespace,
+            embedding=embedding,
+            context_hash=context_hash,
+            min_score=RESPONSE_CACHE_MIN_SCORE,
+        )
+        _stats["semantic_hits" if cached else "misses"] += 1
+        return cached, embedding
+    except Exception:
+        _stats["misses"] += 1
+        return None, None
+
+
+async def semantic_cache_store(
+    brief: str,
+    namespace: str,
+    company_id: str,
+    context_hash: str,
+    embedding: list[float],
+    response: dict[str, Any],
+) -> None:
+    """Store a freshly generated response; cache errors never fail generation."""
+    try:
+        cache = await get_cache_service()
+        await cache.set(
+            _exact_cache_key(brief, namespace, company_id, context_hash),
+            response,
+            ttl=RESPONSE_EXACT_CACHE_TTL,
+        )
+    except (RuntimeError, RedisError):
+        pass
+
+    try:
+        await memory_service.store_cached_response(
+            company_id=company_id,
+            namespace=namespace,
+            embedding=embedding,
+            context_hash=context_hash,
+            brief=brief,
+            response=response,
+            ttl=RESPONSE_CACHE_TTL,
+        )
+    except Exception:
+        pass
@@ -1,42 +1,152 @@
 """Copywriter agent with Tavily web search and memory for SEO and market research."""
 
+import asyncio
+from functools import lru_cache
+
 from crewai import Agent, Task, Crew, Process
 from langchain_openai import ChatOpenAI
 
 from app.core.config import settings
-from app.services.agents.tools.web_search import TavilySearchTool, TavilyCompetitorTool
-from app.services.agents.memory import memory_service
-from app.services.agents.seasonal_context import build_seasonal_context
+from app.services.agents.llm_http import (
+    get_llm_http_async_client,
+    get_llm_http_client,
+    uses_llm_http_clients,
+)
+from app.services.agents.tools.web_search import copy_research_tool
+from app.services.agents.marketing._crew_runner import (
+    ProgressCallback,
+    kickoff_with_timeout,
+    task_progress_callback,
+)
+from app.services.agents.memory import MEMORY_CONTEXT_MAX_CHARS, memory_service
+from app.services.agents.marketing._response_cache import (
+    response_context_hash,
+    semantic_cache_lookup,
+    semantic_cache_store,
+)
+from app.services.agents.seasonal_context import get_todays_seasonal_context
+
+BATCH_MAX_CONCURRENCY = 4  # Równoległe crew w batchu (limity OpenAI)
+
+
+@uses_llm_http_clients
+@lru_cache(maxsize=4)
+def _get_llm(model: str, temperature: float) -> ChatOpenAI:
+    """Get a shared LLM instance for the given model and temperature.
+
+    Cached so requests reuse one client instead of building it per call.
+    """
+    return ChatOpenAI(
+        model=model,
+        api_key=settings.OPENAI_API_KEY,
+        temperature=temperature,
+        http_client=get_llm_http_client(),
+        http_async_client=get_llm_http_async_client(),
+    )
 
 
-async def get_copywriter_memory_context(company_id: str, brief: str) -> str:
-    """Get relevant memory context for copywriting task."""
-    context_parts = []
+def _research_llm() -> ChatOpenAI:
+    """LLM for the researcher - mostly tool calls, so small and focused."""
+    return _get_llm(settings.MARKETING_RESEARCH_MODEL, 0.3)
+
+
+def _writer_llm() -> ChatOpenAI:
+    """LLM for the creative writing agent."""
+    return _get_llm(settings.MARKETING_WRITER_MODEL, 0.7)
+
+
+def _review_llm() -> ChatOpenAI:
+    """LLM for the reviewer - it picks and polishes the final text."""
+    return _get_llm(settings.MARKETING_REVIEW_MODEL, 0.3)
+
+
+# ============================================================================
+# STAŁE CZĘŚCI PROMPTÓW
+# ============================================================================
+# Niezmienne instrukcje idą na początek promptu, a brief, research i kontekst
+# marki na koniec - wtedy prefiks jest identyczny między wywołaniami
+# i łapie się w automatyczny cache promptów OpenAI.
+
+_SEO_RESEARCHER_BACKSTORY = """Jestes specjalista od SEO i badan rynku.
+        Uzywasz narzedzi wyszukiwania aby znalezc:
+        - Popularne slowa kluczowe w branzy
+        - Co robi konkurencja
+        - Jakie teksty najlepiej konwertuja
+        Dostarczasz dane ktore pomagaja tworzyc skuteczniejsze teksty."""
+
+_COPYWRITER_BACKSTORY = """Jestes doswiadczonym copywriterem specjalizujacym sie w polskim rynku.
+        Znasz techniki perswazji i wiesz jak pisac teksty ktore konwertuja.
+        Wykorzystujesz dane z researchu do tworzenia lepszych tekstow.
+        Zawsze piszesz po polsku."""
 
-    # Get similar successful tasks
-    similar_tasks = await memory_service.get_similar_successful_tasks(
-        company_id=company_id,
-        brief=brief,
-        agent="copywriter",
-        limit=2,
+_MANAGER_BACKSTORY = """Jestes Marketing Managerem z doswiadczeniem w polskich firmach.
+        Oceniasz teksty pod katem skutecznosci i zgodnosci z brandom."""
+
+_RESEARCH_TASK_INSTRUCTIONS = """Przeprowadz research dla tekstu marketingowego (brief i typ tekstu na koncu).
+
+Twoje zadania:
+1. Uzyj RAZ narzedzia 'tavily_research_bundle' - zwraca jednoczesnie wyniki wyszukiwania
+   (popularne slowa kluczowe) i analize konkurencji (jak komunikuje podobne produkty/uslugi)
+2. Znajdz przykladowe teksty ktore dobrze konwertuja w tej branzy
+
+Zwroc:
+- SLOWA KLUCZOWE: 5-10 popularnych fraz do wykorzystania
+- KONKURENCJA: jak konkurencja komunikuje podobne rzeczy
+- BEST PRACTICES: co dziala w tego typu tekstach"""
+
+_WRITE_TASK_INSTRUCTIONS = """Na podstawie researchu napisz tekst marketingowy (rodzaj tekstu, brief i research na koncu).
+
+Wymagania:
+1. Jezyk polski
+2. Styl zgodny z tonem komunikacji z kontekstu marki
+3. Adresuj bolaczki grupy docelowej (jesli okreslone w kontekscie)
+4. Podkresl jak produkt/usluga realizuje cele klientow
+5. Wykorzystaj slowa kluczowe z researchu
+6. Uzywaj preferowanych slow i unikaj slow zabronionych (jesli okreslone w kontekscie)
+7. Zastosuj techniki ktore dzialaja u konkurencji
+8. Wykorzystaj USP produktow/uslug (jesli dostepne w kontekscie)
+9. DOSTOSUJ tresc do PORY ROKU i nadchodzacych swiat/okazji z kontekstu czasowego!
+
+Stworz 2-3 warianty tekstu do wyboru.
+Dla kazdego wariantu:
+- Oznacz wykorzystane slowa kluczowe
+- Wyjasnij jaka technike perswazji zastosowales
+- Wskazac ktore bolaczki/cele klienta adresujesz"""
+
+
+async def get_copywriter_memory_context(company_id: str, brief: str, brand_context: str = "") -> str:
+    """Get relevant memory context for copywriting task."""
+    # Both lookups hit the vector store independently - run them together.
+    # A failure of one still leaves the other's context.
+    similar_tasks, company_context = await asyncio.gather(
+        memory_service.get_similar_successful_tasks(
+            company_id=company_id,
+            brief=brief,
+            agent="copywriter",
+            limit=2,
+        ),
+        memory_service.get_company_context(
+            company_id=company_id,
+            query=brief,
+            limit=3,
+            max_entry_chars=300,
+            exclude_text=brand_context,
+        ),
+        return_exceptions=True,
     )
 
-    if similar_tasks:
+    context_parts = []
+
+    if similar_tasks and not isinstance(similar_tasks, BaseException):
         context_parts.append("INSPIRACJE Z POPRZEDNICH UDANYCH TEKSTOW:")
         for task in similar_tasks:
-            context_parts.append(f"- {task['content'][:300]}...")
-
-    # Get company context
-    company_context = await memory_service.get_company_context(
-        company_id=company_id,
-        query=brief,
-        limit=3,
-    )
+            context_parts.append(f"- {task['content'].strip()[:300]}...")
 
-    if company_context:
+    if company_context and not isinstance(company_context, BaseException):
         context_parts.append(company_context)
 
-    return "\n\n".join(context_parts) if context_parts else ""
+    # Kontekst trafia do promptu kilku agentów - trzymaj go w stałym limicie
+    return "\n\n".join(context_parts)[:MEMORY_CONTEXT_MAX_CHARS]
 
 
 async def generate_marketing_copy(
@@ -48,26 +158,29 @@ async def generate_marketing_copy(
     max_length: int | None = None,
     company_id: str = "",
     brand_context: str = "",
+    on_progress: ProgressCallback | None = None,
+    timeout_s: float | None = None,
 ) -> dict:
-    """Generate marketing copy using CrewAI agents with Tavily research, memory, and brand context."""
-
-    # Get memory context if company_id provided
-    memory_context = ""
-    if company_id:
-        try:
-            memory_context = await get_copywriter_memory_context(company_id, brief)
-        except Exception:
-            pass  # Memory is optional
+    """Generate marketing copy using CrewAI agents with Tavily research, memory, and brand context.
 
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        api_key=settings.OPENAI_API_KEY,
-        temperature=0.7,
-    )
+    on_progress receives the research and the draft variants as soon as they
+    are ready. If writing and review take longer than timeout_s, the draft is
+    returned with partial=True instead of the reviewed text.
+    """
 
-    # Initialize Tavily tools
-    search_tool = TavilySearchTool()
-    competitor_tool = TavilyCompetitorTool()
+    # Near-identical brief for the same company and context - skip the crew
+    cache_namespace = f"copywriter:{copy_type}"
+    cache_context = ""
+    brief_embedding = None
+    if company_id:
+        cache_context = response_context_hash(
+            brand_context, brand_voice, target_audience, language, max_length
+        )
+        cached, brief_embedding = await semantic_cache_lookup(
+            brief, cache_namespace, company_id, cache_context
+        )
+        if cached:
+            return {**cached, "brief": brief, "used_cache": True}
 
     copy_type_desc = {
         "ad": "tekst reklamowy",
@@ -79,8 +192,53 @@ async def generate_marketing_copy(
 
     length_instruction = f"Maksymalna dlugosc: {max_length} znakow." if max_length else ""
 
+    # SEO/Market Researcher
+    seo_researcher = Agent(
+        role="SEO & Market Researcher",
+        goal="Zbadaj rynek i znajdz slowa kluczowe oraz inspiracje",
+        backstory=_SEO_RESEARCHER_BACKSTORY,
+        llm=_research_llm(),
+        tools=[copy_research_tool],
+        verbose=False,
+    )
+
+    # Task 1: Research keywords and competitors
+    research_task = Task(
+        description=f"""{_RESEARCH_TASK_INSTRUCTIONS}
+
+BRIEF: {brief}
+TYP TEKSTU: {copy_type_desc}""",
+        expected_output="Research ze slowami kluczowymi i analiza konkurencji",
+        agent=seo_researcher,
+    )
+
+    # Research only needs the brief - run it alongside the memory lookup
+    # instead of before the copywriter
+    research_crew = Crew(
+        agents=[seo_researcher],
+        tasks=[research_task],
+        process=Process.sequential,
+        verbose=False,
+    )
+
+    async def fetch_memory_context() -> str:
+        if not company_id:
+            return ""
+        try:
+            return await get_copywriter_memory_context(company_id, brief, brand_context)
+        except Exception:
+            return ""  # Memory is optional
+
+    memory_context, research_result = await asyncio.gather(
+        fetch_memory_context(),
+        asyncio.to_thread(research_crew.kickoff),
+    )
+
+    if on_progress:
+        await on_progress("research", str(research_result))
+
     # Build seasonal context
-    seasonal_context = build_seasonal_context()
+    seasonal_context = get_todays_seasonal_context()
 
     # Build comprehensive brand info from context
     brand_info = ""
@@ -102,21 +260,6 @@ async def generate_marketing_copy(
 
         {seasonal_context}"""
 
-    # SEO/Market Researcher
-    seo_researcher = Agent(
-        role="SEO & Market Researcher",
-        goal="Zbadaj rynek i znajdz slowa kluczowe oraz inspiracje",
-        backstory="""Jestes specjalista od SEO i badan rynku.
-        Uzywasz narzedzi wyszukiwania aby znalezc:
-        - Popularne slowa kluczowe w branzy
-        - Co robi konkurencja
-        - Jakie teksty najlepiej konwertuja
-        Dostarczasz dane ktore pomagaja tworzyc skuteczniejsze teksty.""",
-        llm=llm,
-        tools=[search_tool, competitor_tool],
-        verbose=False,
-    )
-
     # Build memory context for agent
     memory_info = ""
     if memory_context:
@@ -130,71 +273,35 @@ async def generate_marketing_copy(
     copywriter = Agent(
         role="Copywriter",
         goal="Tworz przekonujace teksty marketingowe ktore sprzedaja",
-        backstory=f"""Jestes doswiadczonym copywriterem specjalizujacym sie w polskim rynku.
-        Znasz techniki perswazji i wiesz jak pisac teksty ktore konwertuja.
-        Wykorzystujesz dane z researchu do tworzenia lepszych tekstow.{brand_info}{memory_info}
-        Zawsze piszesz po polsku.""",
-        llm=llm,
+        backstory=f"{_COPYWRITER_BACKSTORY}{brand_info}{memory_info}",
+        llm=_writer_llm(),
         verbose=False,
     )
 
     marketing_manager = Agent(
         role="Marketing Manager",
         goal="Upewnij sie ze teksty sa zgodne z brandom i skuteczne",
-        backstory=f"""Jestes Marketing Managerem z doswiadczeniem w polskich firmach.
-        Oceniasz teksty pod katem skutecznosci i zgodnosci z brandom.{brand_info}""",
-        llm=llm,
+        backstory=f"{_MANAGER_BACKSTORY}{brand_info}",
+        llm=_review_llm(),
         verbose=False,
     )
 
-    # Task 1: Research keywords and competitors
-    research_task = Task(
-        description=f"""Przeprowadz research dla tekstu marketingowego:
-
-BRIEF: {brief}
-TYP TEKSTU: {copy_type_desc}
-
-Twoje zadania:
-1. Uzyj 'tavily_search' aby znalezc popularne slowa kluczowe zwiazane z tematem
-2. Uzyj 'tavily_competitor' aby sprawdzic jak konkurencja komunikuje podobne produkty/uslugi
-3. Znajdz przykladowe teksty ktore dobrze konwertuja w tej branzy
-
-Zwroc:
-- SLOWA KLUCZOWE: 5-10 popularnych fraz do wykorzystania
-- KONKURENCJA: jak konkurencja komunikuje podobne rzeczy
-- BEST PRACTICES: co dziala w tego typu tekstach""",
-        expected_output="Research ze slowami kluczowymi i analiza konkurencji",
-        agent=seo_researcher,
-    )
-
     # Task 2: Write copy based on research
     write_task = Task(
-        description=f"""Na podstawie researchu napisz {copy_type_desc}:
-
-BRIEF: {brief}
+        description=f"""{_WRITE_TASK_INSTRUCTIONS}
 
 {'WAZNE: Masz dostep do szczegolowego kontekstu marki w swoim backstory. Wykorzystaj informacje o produktach, bolaczkach klientow, ich celach i przewagach konkurencyjnych.' if brand_context else ''}
-
-Wymagania:
-1. Jezyk polski
-2. Styl zgodny z tonem komunikacji z kontekstu marki
-3. Adresuj bolaczki grupy docelowej (jesli okreslone w kontekscie)
-4. Podkresl jak produkt/usluga realizuje cele klientow
-5. Wykorzystaj slowa kluczowe z researchu
-6. Uzywaj preferowanych slow i unikaj slow zabronionych (jesli okreslone w kontekscie)
-7. Zastosuj techniki ktore dzialaja u konkurencji
-8. Wykorzystaj USP produktow/uslug (jesli dostepne w kontekscie)
-9. DOSTOSUJ tresc do PORY ROKU i nadchodzacych swiat/okazji z kontekstu czasowego!
 {length_instruction}
 
-Stworz 2-3 warianty tekstu do wyboru.
-Dla kazdego wariantu:
-- Oznacz wykorzystane slowa kluczowe
-- Wyjasnij jaka technike perswazji zastosowales
-- Wskazac ktore bolaczki/cele klienta adresujesz""",
+RODZAJ TEKSTU: {copy_type_desc}
+
+BRIEF: {brief}
+
+RESEARCH:
+{research_result}""",
         expected_output="2-3 warianty tekstu marketingowego z uzasadnieniem",
         agent=copywriter,
-        context=[research_task],
+        callback=task_progress_callback(on_progress, "draft"),
     )
 
     # Task 3: Review and select best
@@ -218,26 +325,71 @@ Zwroc w formacie:
 - WYBRANY TEKST: [finalny tekst]
 - UZASADNIENIE: [dlaczego ten wariant jest najlepszy]
 - SLOWA KLUCZOWE: [wykorzystane slowa kluczowe]
-- ALTERNATYWNE WARIANTY: [pozostale warianty jako backup]""",
+- ALTERNATYWNE WARIANTY: [pozostale warianty jako backup]
+
+RESEARCH:
+{research_result}""",
         expected_output="Najlepszy wariant tekstu z uzasadnieniem",
         agent=marketing_manager,
-        context=[research_task, write_task],
+        context=[write_task],
     )
 
     crew = Crew(
-        agents=[seo_researcher, copywriter, marketing_manager],
-        tasks=[research_task, write_task, review_task],
+        agents=[copywriter, marketing_manager],
+        tasks=[write_task, review_task],
         process=Process.sequential,
         verbose=False,
     )
 
-    result = crew.kickoff()
+    # kickoff is synchronous and takes seconds - keep the event loop free
+    result = await kickoff_with_timeout(crew, timeout_s)
+
+    partial = result is None
+    if partial:
+        # Review ran out of time - the draft variants are the best we have
+        if write_task.output is None:
+            raise TimeoutError(f"Generowanie tekstu przekroczylo limit {timeout_s}s")
+        result = write_task.output
 
-    return {
+    output = {
         "content": str(result),
         "copy_type": copy_type,
         "brief": brief,
         "used_tavily": True,
         "used_memory": bool(memory_context),
         "used_brand_context": bool(brand_context),
+        "used_cache": False,
+        "partial": partial,
     }
+
+    if brief_embedding is not None and not partial:
+        await semantic_cache_store(
+            brief, cache_namespace, company_id, cache_context, brief_embedding, output
+        )
+
+    return output
+
+
+async def generate_marketing_copy_batch(
+    requests: list[dict],
+    max_concurrency: int = BATCH_MAX_CONCURRENCY,
+) -> list[dict]:
+    """Generate several copies concurrently, bounded to respect OpenAI rate limits.
+
+    Args:
+        requests: Keyword arguments for generate_marketing_copy, one dict per copy
+        max_concurrency: Maximum number of crews running at once
+
+    Returns:
+        Results in the order of requests; a failed copy becomes {"error": ...}
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(kwargs: dict) -> dict:
+        async with semaphore:
+            try:
+                return await generate_marketing_copy(**kwargs)
+            except Exception as e:
+                return {"error": str(e)}
+
+    return await asyncio.gather(*(run(kwargs) for kwargs in requests))
@@ -1,185 +1,109 @@
 """Instagram content creation agent with Tavily web search and memory capabilities."""
 
+import asyncio
+import json
+import re
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any
+
 from crewai import Agent, Task, Crew, Process
 from langchain_openai import ChatOpenAI
+from openai import AsyncOpenAI
 
 from app.core.config import settings
-from app.services.agents.tools.web_search import TavilySearchTool, TavilyTrendsTool
-from app.services.agents.memory import memory_service, MemoryType
-from app.services.agents.seasonal_context import build_seasonal_context
-
-
-async def get_memory_context(company_id: str, brief: str) -> str:
-    """Get relevant memory context for the task."""
-    context_parts = []
-
-    # Get similar successful tasks
-    similar_tasks = await memory_service.get_similar_successful_tasks(
-        company_id=company_id,
-        brief=brief,
-        agent="instagram_specialist",
-        limit=2,
+from app.services.agents.llm_http import (
+    get_llm_http_async_client,
+    get_llm_http_client,
+    uses_llm_http_clients,
+)
+from app.services.agents.tools.web_search import social_research_tool
+from app.services.agents.marketing._crew_runner import (
+    ProgressCallback,
+    kickoff_with_timeout,
+    task_progress_callback,
+)
+from app.services.agents.memory import MEMORY_CONTEXT_MAX_CHARS, memory_service, MemoryType
+from app.services.agents.marketing._response_cache import (
+    response_context_hash,
+    semantic_cache_lookup,
+    semantic_cache_store,
+)
+from app.services.agents.seasonal_context import get_todays_seasonal_context
+
+
+@uses_llm_http_clients
+@lru_cache(maxsize=4)
+def _get_llm(model: str, temperature: float) -> ChatOpenAI:
+    """Get a shared LLM instance for the given model and temperature.
+
+    Cached so requests reuse one client instead of building it per call.
+    """
+    return ChatOpenAI(
+        model=model,
+        api_key=settings.OPENAI_API_KEY,
+        temperature=temperature,
+        http_client=get_llm_http_client(),
+        http_async_client=get_llm_http_async_client(),
     )
 
-    if similar_tasks:
-        context_parts.append("INSPIRACJE Z POPRZEDNICH UDANYCH POSTOW:")
-        for task in similar_tasks:
-            context_parts.append(f"- {task['content'][:300]}...")
 
-    # Get company context
-    company_context = await memory_service.get_company_context(
-        company_id=company_id,
-        query=brief,
-        limit=3,
-    )
+def _research_llm() -> ChatOpenAI:
+    """LLM for the researcher - mostly tool calls, so small and focused."""
+    return _get_llm(settings.MARKETING_RESEARCH_MODEL, 0.3)
 
-    if company_context:
-        context_parts.append(company_context)
 
-    return "\n\n".join(context_parts) if context_parts else ""
+def _writer_llm() -> ChatOpenAI:
+    """LLM for the creative writing agent."""
+    return _get_llm(settings.MARKETING_WRITER_MODEL, 0.7)
 
 
-def create_instagram_crew(
-    brief: str,
-    brand_voice: str = "profesjonalny",
-    target_audience: str = "",
-    language: str = "pl",
-    include_hashtags: bool = True,
-    post_type: str = "post",
-    memory_context: str = "",
-    brand_context: str = "",
-) -> Crew:
-    """Create a CrewAI crew for Instagram content creation with web research."""
+def _review_llm() -> ChatOpenAI:
+    """LLM for the reviewer - it picks and polishes the final text."""
+    return _get_llm(settings.MARKETING_REVIEW_MODEL, 0.3)
 
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        api_key=settings.OPENAI_API_KEY,
-        temperature=0.7,
-    )
 
-    # Initialize Tavily tools
-    search_tool = TavilySearchTool()
-    trends_tool = TavilyTrendsTool()
+# ============================================================================
+# STAŁE CZĘŚCI PROMPTÓW
+# ============================================================================
+# Niezmienne instrukcje idą na początek promptu, a brief, research i kontekst
+# marki na koniec - wtedy prefiks jest identyczny między wywołaniami
+# i łapie się w automatyczny cache promptów OpenAI.
 
-    # Content Researcher - uses Tavily to research trends
-    content_researcher = Agent(
-        role="Content Researcher",
-        goal="Zbadaj aktualne trendy i znajdz inspiracje dla contentu",
-        backstory="""Jestes specjalista od researchu social media.
+_RESEARCHER_BACKSTORY = """Jestes specjalista od researchu social media.
         Uzywasz narzedzi do wyszukiwania aby znalezc:
         - Aktualne trendy w branzy
         - Popularne hashtagi
         - Co dziala u konkurencji
-        Dostarczasz dane ktore pomagaja tworzyc lepszy content.""",
-        llm=llm,
-        tools=[search_tool, trends_tool],
-        verbose=False,
-    )
-
-    # Build seasonal context
-    seasonal_context = build_seasonal_context()
-
-    # Build comprehensive brand info from context
-    brand_info = ""
-    if brand_context:
-        brand_info = f"""
-
-        SZCZEGOLOWY KONTEKST MARKI:
-        {brand_context}
-
-        {seasonal_context}
-
-        Wykorzystaj te informacje przy tworzeniu i ocenie contentu.
-        Dostosuj tresc do aktualnej pory roku i nadchodzacych okazji!"""
-    else:
-        # Fallback for backward compatibility
-        brand_info = f"""
-        Brand voice firmy: {brand_voice}.
-        Grupa docelowa: {target_audience or 'szeroka publicznosc'}.
-
-        {seasonal_context}"""
-
-    # Marketing Manager - oversees and approves content
-    marketing_manager = Agent(
-        role="Marketing Manager",
-        goal="Nadzoruj tworzenie contentu i upewnij sie ze jest zgodny z brandom",
-        backstory=f"""Jestes doswiadczonym Marketing Managerem w polskiej firmie.
-        Znasz sie na social media i wiesz co dziala na Instagramie.{brand_info}
-        Zawsze odpowiadasz po polsku.""",
-        llm=llm,
-        verbose=False,
-    )
-
-    # Build memory context for agent
-    memory_info = ""
-    if memory_context:
-        memory_info = f"""
-
-        PAMIEC I DOSWIADCZENIE:
-        {memory_context}
+        Dostarczasz dane ktore pomagaja tworzyc lepszy content."""
 
-        Wykorzystaj te informacje aby tworzyc lepszy content."""
+_MANAGER_BACKSTORY = """Jestes doswiadczonym Marketing Managerem w polskiej firmie.
+        Znasz sie na social media i wiesz co dziala na Instagramie.
+        Zawsze odpowiadasz po polsku."""
 
-    # Instagram Specialist - creates the actual content
-    instagram_specialist = Agent(
-        role="Instagram Specialist",
-        goal="Tworz angazujace posty na Instagram ktore przyciagaja uwage",
-        backstory=f"""Jestes specjalista od Instagrama z wieloletnim doswiadczeniem.
+_SPECIALIST_BACKSTORY = """Jestes specjalista od Instagrama z wieloletnim doswiadczeniem.
         Wiesz jak pisac teksty ktore generuja zaangazowanie.
-        Korzystasz z danych z researchu aby tworzyc lepszy content.{brand_info}{memory_info}
-        Zawsze piszesz po polsku.""",
-        llm=llm,
-        verbose=False,
-    )
-
-    # Define the content type
-    content_type_desc = {
-        "post": "standardowy post na feed",
-        "story": "krotka tresc na Instagram Story",
-        "reel": "scenariusz dla krotkiego video Reels",
-        "carousel": "seria slajdow karuzeli (3-5 slajdow)",
-    }.get(post_type, "standardowy post na feed")
-
-    # Task 1: Research trends and hashtags
-    research_task = Task(
-        description=f"""Przeprowadz research dla posta na Instagram:
+        Korzystasz z danych z researchu aby tworzyc lepszy content.
+        Zawsze piszesz po polsku."""
 
-BRIEF: {brief}
-BRANZA/TEMAT: {brief[:50]}
+_RESEARCH_TASK_INSTRUCTIONS = """Przeprowadz research dla posta na Instagram (brief i temat na koncu).
 
 Twoje zadania:
-1. Uzyj narzedzia 'tavily_trends' aby znalezc aktualne trendy zwiazane z tematem
-2. Uzyj narzedzia 'tavily_search' aby znalezc popularne hashtagi dla tego tematu
-3. Sprawdz co dziala w social media w tej branzy
+1. Uzyj RAZ narzedzia 'tavily_research_bundle' - zwraca jednoczesnie aktualne trendy
+   i wyniki wyszukiwania (popularne hashtagi) dla tematu
+2. Sprawdz co dziala w social media w tej branzy
 
 Zwroc:
 - TRENDY: 3-5 aktualnych trendow
 - HASHTAGI: 10-15 popularnych hashtagow
-- INSPIRACJE: 2-3 pomysly na content""",
-        expected_output="Research z trendami, hashtagami i inspiracjami",
-        agent=content_researcher,
-    )
+- INSPIRACJE: 2-3 pomysly na content"""
 
-    # Build hashtag instruction based on brand context
-    hashtag_instruction = "Bez hashtagow"
-    if include_hashtags:
-        if brand_context and "Hashtagi firmowe:" in brand_context:
-            hashtag_instruction = "Uzyj hashtagow firmowych z kontekstu marki oraz dodaj 3-5 hashtagow z researchu"
-        else:
-            hashtag_instruction = "Uzyj hashtagow z researchu (wybierz 5-10 najlepszych)"
-
-    # Task 2: Create content based on research
-    create_content_task = Task(
-        description=f"""Na podstawie researchu stworz {content_type_desc} na Instagram:
-
-BRIEF: {brief}
-
-{'WAZNE: Masz dostep do szczegolowego kontekstu marki w swoim backstory. Wykorzystaj informacje o produktach, stylach komunikacji i hashtagach firmowych.' if brand_context else ''}
+_CREATE_TASK_INSTRUCTIONS = """Na podstawie researchu stworz tresc na Instagram (rodzaj tresci, brief i research na koncu).
 
 Wymagania:
 1. Tekst musi byc w jezyku polskim
 2. Tekst musi byc angazujacy i zgodny ze stylem komunikacji z kontekstu marki
-3. {hashtag_instruction}
+3. Hashtagi zgodnie z instrukcja HASHTAGI na koncu
 4. Uwzglednij grupe docelowa z kontekstu marki
 5. Wykorzystaj trendy znalezione w researchu
 6. Jesli masz informacje o produktach/uslugach firmy, mozesz je naturalnie wplatac w tresc
@@ -203,21 +127,15 @@ Zwroc wynik w formacie:
 - HASHTAGI: [hashtagi jesli wymagane]
 - CZAS PUBLIKACJI: [sugerowany czas]
 - OPIS GRAFIKI: [opis w jezyku angielskim, bez elementow niemozliwych do wygenerowania]
-- WYKORZYSTANE TRENDY: [jakie trendy zostaly wykorzystane]""",
-        expected_output="Gotowy post na Instagram z tekstem, hashtagami i sugestiami",
-        agent=instagram_specialist,
-        context=[research_task],
-    )
+- WYKORZYSTANE TRENDY: [jakie trendy zostaly wykorzystane]"""
 
-    # Task 3: Review and approve
-    review_task = Task(
-        description=f"""Przejrzyj stworzony content pod katem:
+_REVIEW_TASK_INSTRUCTIONS = """Przejrzyj stworzony content pod katem:
 1. Zgodnosci ze stylem komunikacji marki (formalnosc, ton, uzywane slowa)
 2. Atrakcyjnosci dla grupy docelowej okreslonej w kontekscie marki
 3. Poprawnosci jezykowej
 4. Wykorzystania trendow z researchu
 5. Potencjalu wiralowego
-6. {'Uzyte zostaly hashtagi firmowe marki' if brand_context and 'Hashtagi firmowe:' in brand_context else 'Hashtagi sa odpowiednie'}
+6. Hashtagow - zgodnie z punktem HASHTAGI na koncu
 7. Nie uzyto slow zabronionych (jesli okreslone w kontekscie)
 8. SEZONOWOSC - czy tresc jest dostosowana do aktualnej pory roku i nadchodzacych okazji?
 
@@ -238,15 +156,203 @@ Zwroc finalny, zatwierdzony content w formacie:
 - TEKST POSTU: [tekst]
 - HASHTAGI: [hashtagi]
 - CZAS PUBLIKACJI: [czas]
-- OPIS GRAFIKI: [opis po angielsku, bez niemozliwych elementow]""",
+- OPIS GRAFIKI: [opis po angielsku, bez niemozliwych elementow]"""
+
+
+async def get_memory_context(company_id: str, brief: str, brand_context: str = "") -> str:
+    """Get relevant memory context for the task."""
+    # Both lookups hit the vector store independently - run them together.
+    # A failure of one still leaves the other's context.
+    similar_tasks, company_context = await asyncio.gather(
+        memory_service.get_similar_successful_tasks(
+            company_id=company_id,
+            brief=brief,
+            agent="instagram_specialist",
+            limit=2,
+        ),
+        memory_service.get_company_context(
+            company_id=company_id,
+            query=brief,
+            limit=3,
+            max_entry_chars=300,
+            exclude_text=brand_context,
+        ),
+        return_exceptions=True,
+    )
+
+    context_parts = []
+
+    if similar_tasks and not isinstance(similar_tasks, BaseException):
+        context_parts.append("INSPIRACJE Z POPRZEDNICH UDANYCH POSTOW:")
+        for task in similar_tasks:
+            context_parts.append(f"- {task['content'].strip()[:300]}...")
+
+    if company_context and not isinstance(company_context, BaseException):
+        context_parts.append(company_context)
+
+    # Kontekst trafia do promptu kilku agentów - trzymaj go w stałym limicie
+    return "\n\n".join(context_parts)[:MEMORY_CONTEXT_MAX_CHARS]
+
+
+def _brand_info(brand_voice: str, target_audience: str, brand_context: str) -> str:
+    """Brand and seasonal context appended to the agents' backstories."""
+    seasonal_context = get_todays_seasonal_context()
+
+    if brand_context:
+        return f"""
+
+        SZCZEGOLOWY KONTEKST MARKI:
+        {brand_context}
+
+        {seasonal_context}
+
+        Wykorzystaj te informacje przy tworzeniu i ocenie contentu.
+        Dostosuj tresc do aktualnej pory roku i nadchodzacych okazji!"""
+
+    # Fallback for backward compatibility
+    return f"""
+        Brand voice firmy: {brand_voice}.
+        Grupa docelowa: {target_audience or 'szeroka publicznosc'}.
+
+        {seasonal_context}"""
+
+
+def _content_type_description(post_type: str) -> str:
+    """Describe the post type for the writing prompt."""
+    return {
+        "post": "standardowy post na feed",
+        "story": "krotka tresc na Instagram Story",
+        "reel": "scenariusz dla krotkiego video Reels",
+        "carousel": "seria slajdow karuzeli (3-5 slajdow)",
+    }.get(post_type, "standardowy post na feed")
+
+
+def _hashtag_instruction(include_hashtags: bool, brand_context: str) -> str:
+    """Hashtag instruction based on the brand context."""
+    if not include_hashtags:
+        return "Bez hashtagow"
+    if brand_context and "Hashtagi firmowe:" in brand_context:
+        return "Uzyj hashtagow firmowych z kontekstu marki oraz dodaj 3-5 hashtagow z researchu"
+    return "Uzyj hashtagow z researchu (wybierz 5-10 najlepszych)"
+
+
+def create_instagram_research_crew(brief: str) -> Crew:
+    """Create a CrewAI crew researching trends and hashtags for an Instagram post."""
+
+    # Content Researcher - uses Tavily to research trends
+    content_researcher = Agent(
+        role="Content Researcher",
+        goal="Zbadaj aktualne trendy i znajdz inspiracje dla contentu",
+        backstory=_RESEARCHER_BACKSTORY,
+        llm=_research_llm(),
+        tools=[social_research_tool],
+        verbose=False,
+    )
+
+    # Task 1: Research trends and hashtags
+    research_task = Task(
+        description=f"""{_RESEARCH_TASK_INSTRUCTIONS}
+
+BRIEF: {brief}
+BRANZA/TEMAT: {brief[:50]}""",
+        expected_output="Research z trendami, hashtagami i inspiracjami",
+        agent=content_researcher,
+    )
+
+    return Crew(
+        agents=[content_researcher],
+        tasks=[research_task],
+        process=Process.sequential,
+        verbose=False,
+    )
+
+
+def create_instagram_crew(
+    brief: str,
+    brand_voice: str = "profesjonalny",
+    target_audience: str = "",
+    language: str = "pl",
+    include_hashtags: bool = True,
+    post_type: str = "post",
+    memory_context: str = "",
+    brand_context: str = "",
+    research: str = "",
+    draft_callback: Callable[[Any], None] | None = None,
+) -> Crew:
+    """Create a CrewAI crew that writes and reviews an Instagram post from research.
+
+    The first task writes the draft (draft_callback gets its output), the
+    second reviews it.
+    """
+
+    brand_info = _brand_info(brand_voice, target_audience, brand_context)
+
+    # Marketing Manager - oversees and approves content
+    marketing_manager = Agent(
+        role="Marketing Manager",
+        goal="Nadzoruj tworzenie contentu i upewnij sie ze jest zgodny z brandom",
+        backstory=f"{_MANAGER_BACKSTORY}{brand_info}",
+        llm=_review_llm(),
+        verbose=False,
+    )
+
+    # Build memory context for agent
+    memory_info = ""
+    if memory_context:
+        memory_info = f"""
+
+        PAMIEC I DOSWIADCZENIE:
+        {memory_context}
+
+        Wykorzystaj te informacje aby tworzyc lepszy content."""
+
+    # Instagram Specialist - creates the actual content
+    instagram_specialist = Agent(
+        role="Instagram Specialist",
+        goal="Tworz angazujace posty na Instagram ktore przyciagaja uwage",
+        backstory=f"{_SPECIALIST_BACKSTORY}{brand_info}{memory_info}",
+        llm=_writer_llm(),
+        verbose=False,
+    )
+
+    content_type_desc = _content_type_description(post_type)
+    hashtag_instruction = _hashtag_instruction(include_hashtags, brand_context)
+
+    # Task 2: Create content based on research
+    create_content_task = Task(
+        description=f"""{_CREATE_TASK_INSTRUCTIONS}
+
+{'WAZNE: Masz dostep do szczegolowego kontekstu marki w swoim backstory. Wykorzystaj informacje o produktach, stylach komunikacji i hashtagach firmowych.' if brand_context else ''}
+
+HASHTAGI: {hashtag_instruction}
+
+RODZAJ TRESCI: {content_type_desc}
+
+BRIEF: {brief}
+
+RESEARCH:
+{research}""",
+        expected_output="Gotowy post na Instagram z tekstem, hashtagami i sugestiami",
+        agent=instagram_specialist,
+        callback=draft_callback,
+    )
+
+    # Task 3: Review and approve
+    review_task = Task(
+        description=f"""{_REVIEW_TASK_INSTRUCTIONS}
+
+HASHTAGI: {'Uzyte zostaly hashtagi firmowe marki' if brand_context and 'Hashtagi firmowe:' in brand_context else 'Hashtagi sa odpowiednie'}
+
+RESEARCH:
+{research}""",
         expected_output="Zatwierdzony post gotowy do publikacji",
         agent=marketing_manager,
-        context=[research_task, create_content_task],
+        context=[create_content_task],
     )
 
     crew = Crew(
-        agents=[content_researcher, instagram_specialist, marketing_manager],
-        tasks=[research_task, create_content_task, review_task],
+        agents=[instagram_specialist, marketing_manager],
+        tasks=[create_content_task, review_task],
         process=Process.sequential,
         verbose=False,
     )
@@ -254,6 +360,44 @@ Zwroc finalny, zatwierdzony content w formacie:
     return crew
 
 
+# Sekcje odpowiedzi recenzenta -> klucze wyniku
+_POST_SECTION_KEYS = {
+    "TEKST POSTU": "post_text",
+    "HASHTAGI": "hashtags",
+    "CZAS PUBLIKACJI": "suggested_time",
+    "OPIS GRAFIKI": "image_prompt",
+}
+
+# One pass over the output: a section runs until the next label at the start
+# of a line (optionally as a "- " list item or in **bold**) or the end of the text
+_POST_SECTION_RE = re.compile(
+    r"\**(TEKST POSTU|HASHTAGI|CZAS PUBLIKACJI|OPIS GRAFIKI)\**:\**(.*?)"
+    r"(?=^[ \t]*(?:[-*][ \t]*)?\**(?:(?:TEKST POSTU|HASHTAGI|CZAS PUBLIKACJI|OPIS GRAFIKI)\**:|WYKORZYSTANE)|\Z)",
+    re.M | re.S,
+)
+
+# Komentarz recenzenta po ostatniej sekcji
+_POST_TRAILER_RE = re.compile(r"---|\n\n\n")
+
+
+def parse_post_sections(text: str) -> dict[str, str]:
+    """Extract post text, hashtags, time and image prompt from the crew output.
+
+    The first occurrence of each section wins, like the agent's own format.
+    """
+    sections: dict[str, str] = {}
+    for match in _POST_SECTION_RE.finditer(text):
+        key = _POST_SECTION_KEYS[match.group(1)]
+        if key not in sections:
+            sections[key] = match.group(2)
+
+    # Image prompt is the last section - cut off any trailing commentary
+    if "image_prompt" in sections:
+        sections["image_prompt"] = _POST_TRAILER_RE.split(sections["image_prompt"], 1)[0]
+
+    return {key: value.strip() for key, value in sections.items()}
+
+
 async def generate_instagram_post(
     brief: str,
     brand_voice: str = "profesjonalny",
@@ -263,16 +407,48 @@ async def generate_instagram_post(
     post_type: str = "post",
     company_id: str = "",
     brand_context: str = "",
+    on_progress: ProgressCallback | None = None,
+    timeout_s: float | None = None,
 ) -> dict:
-    """Generate Instagram post using CrewAI agents with Tavily research, memory, and brand context."""
+    """Generate Instagram post using CrewAI agents with Tavily research, memory, and brand context.
 
-    # Get memory context if company_id provided
-    memory_context = ""
+    on_progress receives the research and the draft post as soon as they are
+    ready. If writing and review take longer than timeout_s, the draft is
+    returned with partial=True instead of the reviewed post.
+    """
+
+    # Near-identical brief for the same company and context - skip the crew
+    cache_namespace = f"instagram_specialist:{post_type}"
+    cache_context = ""
+    brief_embedding = None
     if company_id:
+        cache_context = response_context_hash(
+            brand_context, brand_voice, target_audience, language, include_hashtags
+        )
+        cached, brief_embedding = await semantic_cache_lookup(
+            brief, cache_namespace, company_id, cache_context
+        )
+        if cached:
+            return {**cached, "brief": brief, "used_cache": True}
+
+    # Research only needs the brief - run it alongside the memory lookup
+    research_crew = create_instagram_research_crew(brief)
+
+    async def fetch_memory_context() -> str:
+        if not company_id:
+            return ""
         try:
-            memory_context = await get_memory_context(company_id, brief)
+            return await get_memory_context(company_id, brief, brand_context)
         except Exception:
-            pass  # Memory is optional, continue without it
+            return ""  # Memory is optional, continue without it
+
+    memory_context, research_result = await asyncio.gather(
+        fetch_memory_context(),
+        asyncio.to_thread(research_crew.kickoff),
+    )
+
+    if on_progress:
+        await on_progress("research", str(research_result))
 
     crew = create_instagram_crew(
         brief=brief,
@@ -283,10 +459,20 @@ async def generate_instagram_post(
         post_type=post_type,
         memory_context=memory_context,
         brand_context=brand_context,
+        research=str(research_result),
+        draft_callback=task_progress_callback(on_progress, "draft"),
     )
 
-    # Run the crew (this is synchronous in CrewAI, we wrap it)
-    result = crew.kickoff()
+    # Run the crew (this is synchronous in CrewAI, so it runs in a thread)
+    result = await kickoff_with_timeout(crew, timeout_s)
+
+    partial = result is None
+    if partial:
+        # Review ran out of time - fall back to the unreviewed draft
+        draft = crew.tasks[0].output
+        if draft is None:
+            raise TimeoutError(f"Generowanie posta przekroczylo limit {timeout_s}s")
+        result = draft
 
     # Parse the result
     result_text = str(result)
@@ -299,32 +485,190 @@ async def generate_instagram_post(
         "used_tavily": True,
         "used_memory": bool(memory_context),
         "used_brand_context": bool(brand_context),
+        "used_cache": False,
+        "partial": partial,
     }
 
     # Try to extract structured data
-    if "TEKST POSTU:" in result_text:
-        parts = result_text.split("TEKST POSTU:")
-        if len(parts) > 1:
-            text_part = parts[1].split("HASHTAGI:")[0] if "HASHTAGI:" in parts[1] else parts[1]
-            output["post_text"] = text_part.strip()
-
-    if "HASHTAGI:" in result_text:
-        hashtag_part = result_text.split("HASHTAGI:")[1]
-        hashtag_part = hashtag_part.split("CZAS")[0] if "CZAS" in hashtag_part else hashtag_part
-        output["hashtags"] = hashtag_part.strip()
-
-    if "CZAS PUBLIKACJI:" in result_text:
-        time_part = result_text.split("CZAS PUBLIKACJI:")[1]
-        time_part = time_part.split("OPIS")[0] if "OPIS" in time_part else time_part
-        output["suggested_time"] = time_part.strip()
-
-    if "OPIS GRAFIKI:" in result_text:
-        image_part = result_text.split("OPIS GRAFIKI:")[1]
-        # Handle case where there might be more sections after
-        for delimiter in ["WYKORZYSTANE", "---", "\n\n\n"]:
-            if delimiter in image_part:
-                image_part = image_part.split(delimiter)[0]
-                break
-        output["image_prompt"] = image_part.strip()
+    output.update(parse_post_sections(result_text))
+
+    if brief_embedding is not None and not partial:
+        await semantic_cache_store(
+            brief, cache_namespace, company_id, cache_context, brief_embedding, output
+        )
 
     return output
+
+
+# ============================================================================
+# TRYB BATCH (OpenAI Batch API)
+# ============================================================================
+# Dla generowania bez pospiechu (np. tydzien postow na noc): ~50% taniej,
+# wynik do 24h. Jedno wywolanie na post zamiast crew - bez narzedzi
+# researchu i bez osobnego recenzenta, wytyczne recenzji sa w prompcie.
+
+INSTAGRAM_BATCH_COMPLETION_WINDOW = "24h"
+INSTAGRAM_BATCH_POLL_INTERVAL = 300  # s
+
+_BATCH_SELF_REVIEW = """Zanim oddasz wynik, sprawdz go jak Marketing Manager:
+1. Zgodnosc ze stylem komunikacji marki i grupa docelowa
+2. Poprawnosc jezykowa i brak slow zabronionych
+3. Dopasowanie do pory roku i nadchodzacych okazji
+4. OPIS GRAFIKI po angielsku, bez zrzutow ekranu, interfejsow, logo i prawdziwych osob
+Popraw to, co tego wymaga, i zwroc tylko finalna wersje."""
+
+
+@uses_llm_http_clients
+@lru_cache(maxsize=1)
+def _batch_client() -> AsyncOpenAI:
+    """Shared OpenAI client for Batch API calls."""
+    return AsyncOpenAI(api_key=settings.OPENAI_API_KEY, http_client=get_llm_http_async_client())
+
+
+def build_instagram_batch_request(
+    custom_id: str,
+    brief: str,
+    brand_voice: str = "profesjonalny",
+    target_audience: str = "",
+    include_hashtags: bool = True,
+    post_type: str = "post",
+    brand_context: str = "",
+) -> dict[str, Any]:
+    """Build one Batch API request line for an Instagram post."""
+    user_prompt = f"""{_CREATE_TASK_INSTRUCTIONS}
+
+{_BATCH_SELF_REVIEW}
+
+HASHTAGI: {_hashtag_instruction(include_hashtags, brand_context)}
+
+RODZAJ TRESCI: {_content_type_description(post_type)}
+
+BRIEF: {brief}
+
+RESEARCH:
+Brak - oprzyj sie na wlasnej wiedzy o aktualnych trendach i hashtagach."""
+
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": settings.MARKETING_WRITER_MODEL,
+            "temperature": 0.7,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": _SPECIALIST_BACKSTORY
+                    + _brand_info(brand_voice, target_audience, brand_context),
+                },
+                {"role": "user", "content": user_prompt},
+            ],
+        },
+    }
+
+
+async def submit_instagram_posts_batch(posts: list[dict[str, Any]]) -> str:
+    """Submit Instagram posts to the OpenAI Batch API.
+
+    Args:
+        posts: Argumenty build_instagram_batch_request dla kazdego posta
+            (brief i opcjonalnie brand_voice, target_audience,
+            include_hashtags, post_type, brand_context)
+
+    Returns:
+        ID batcha do sprawdzania w fetch_instagram_posts_batch
+    """
+    lines = [
+        json.dumps(build_instagram_batch_request(str(index), **post), ensure_ascii=False)
+        for index, post in enumerate(posts)
+    ]
+
+    client = _batch_client()
+    input_file = await client.files.create(
+        file=("instagram_posts.jsonl", "\n".join(lines).encode()),
+        purpose="batch",
+    )
+    batch = await client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window=INSTAGRAM_BATCH_COMPLETION_WINDOW,
+    )
+    return batch.id
+
+
+async def fetch_instagram_posts_batch(
+    batch_id: str,
+    posts: list[dict[str, Any]],
+) -> list[dict[str, Any]] | None:
+    """Get the generated posts of a finished batch, or None while it runs.
+
+    Results follow the order of posts (the list passed to
+    submit_instagram_posts_batch). A post that failed in the batch gets an
+    "error" entry instead of content.
+
+    Raises:
+        RuntimeError: The batch failed, expired or was cancelled
+    """
+    client = _batch_client()
+    batch = await client.batches.retrieve(batch_id)
+
+    if batch.status in ("failed", "expired", "cancelled"):
+        raise RuntimeError(f"Batch {batch_id} zakonczony ze statusem {batch.status}")
+    if batch.status != "completed":
+        return None
+
+    texts: dict[str, str] = {}
+    errors: dict[str, str] = {}
+    # Successful requests are in the output file, failed ones in the error file
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        content = await client.files.content(file_id)
+        for line in content.text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            response = item.get("response") or {}
+            if response.get("status_code") == 200:
+                texts[item["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+            else:
+                errors[item["custom_id"]] = str(item.get("error") or response.get("body"))
+
+    results = []
+    for index, post in enumerate(posts):
+        output = {
+            "brief": post["brief"],
+            "post_type": post.get("post_type", "post"),
+            "used_tavily": False,
+            "used_memory": False,
+            "used_brand_context": bool(post.get("brand_context")),
+            "used_cache": False,
+            "partial": False,
+            "batch": True,
+        }
+        text = texts.get(str(index))
+        if text is None:
+            output["error"] = errors.get(str(index), "Brak wyniku w batchu")
+        else:
+            output["content"] = text
+            output.update(parse_post_sections(text))
+        results.append(output)
+
+    return results
+
+
+async def generate_instagram_posts_batch(
+    posts: list[dict[str, Any]],
+    poll_interval: float = INSTAGRAM_BATCH_POLL_INTERVAL,
+) -> list[dict[str, Any]]:
+    """Generate Instagram posts through the Batch API and wait for the result.
+
+    Can take up to 24h - for background jobs only. The task queue submits
+    and polls in separate jobs instead of waiting here.
+    """
+    batch_id = await submit_instagram_posts_batch(posts)
+    while True:
+        results = await fetch_instagram_posts_batch(batch_id, posts)
+        if results is not None:
+            return results
+        await asyncio.sleep(poll_interval)
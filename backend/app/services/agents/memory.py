@@ -6,20 +6,74 @@ Umożliwia agentom:
 - Dostęp do historii i kontekstu firmy
 """
 
+import asyncio
 import hashlib
+import reprlib
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
+import numpy as np
 from openai import OpenAI
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
 from qdrant_client.http.models import PointStruct, Filter, FieldCondition, MatchValue
 
 from app.core.config import settings
+from app.services.agents.llm_http import get_llm_http_client, uses_llm_http_clients
 
 COLLECTION_NAME = "agent_memory"
 VECTOR_SIZE = 1536  # OpenAI text-embedding-3-small
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_CACHE_SIZE = 2048
+EMBEDDING_CACHE_TTL = 3600  # 1 godzina
+# Cache wyników wyszukiwania - zapytanie prawie identyczne z niedawnym
+# (np. przeformułowany brief) dostaje te same wspomnienia bez Qdranta
+RECALL_CACHE_MIN_SIMILARITY = 0.97
+RECALL_CACHE_PER_COMPANY = 64
+RECALL_CACHE_TTL = 300  # 5 minut
+# Limit kontekstu z pamięci w prompcie (~800 tokenów) - prompt agenta
+# jest wysyłany kilka razy w jednym crew
+MEMORY_CONTEXT_MAX_CHARS = 3000
+# Pola payloadu zwracane osobno - reszta trafia do metadata
+MEMORY_PAYLOAD_FIELDS = frozenset(
+    {"content", "memory_type", "agent", "rating", "created_at", "company_id"}
+)
+
+# Wektory int8 w RAM (4x mniej pamięci); top-K z nadpróbkowaniem
+# jest przeliczany na pełnych wektorach, więc trafność się nie zmienia
+QUANTIZATION_CONFIG = models.ScalarQuantization(
+    scalar=models.ScalarQuantizationConfig(
+        type=models.ScalarType.INT8,
+        quantile=0.99,
+        always_ram=True,
+    )
+)
+# Każde wyszukiwanie filtruje po firmie - payload_m buduje graf HNSW
+# w obrębie każdej firmy (company_id jako tenant)
+HNSW_CONFIG = models.HnswConfigDiff(m=16, ef_construct=200, payload_m=16)
+PAYLOAD_INDEXES = {
+    "company_id": models.KeywordIndexParams(
+        type=models.KeywordIndexType.KEYWORD,
+        is_tenant=True,
+    ),
+    "memory_type": models.PayloadSchemaType.KEYWORD,
+    "agent": models.PayloadSchemaType.KEYWORD,
+    "context_hash": models.PayloadSchemaType.KEYWORD,
+    "expires_at": models.PayloadSchemaType.FLOAT,
+}
+SEARCH_PARAMS = models.SearchParams(
+    hnsw_ef=64,
+    quantization=models.QuantizationSearchParams(
+        ignore=False,
+        rescore=True,
+        oversampling=2.0,
+    )
+)
 
 
 class MemoryType:
@@ -29,6 +83,151 @@ class MemoryType:
     COMPANY_FACT = "company_fact"  # Fakt o firmie
     BRAND_STYLE = "brand_style"  # Styl komunikacji marki
     USER_PREFERENCE = "user_preference"  # Preferencje użytkownika
+    RESPONSE_CACHE = "response_cache"  # Cache wygenerowanych odpowiedzi agentów
+
+
+# repr z limitami - duży wynik zadania nie jest serializowany w całości,
+# żeby zachować z niego tylko początek
+_SUMMARY_REPR = reprlib.Repr()
+_SUMMARY_REPR.maxlevel = 4
+_SUMMARY_REPR.maxdict = 30
+_SUMMARY_REPR.maxlist = 30
+_SUMMARY_REPR.maxstring = 1000
+_SUMMARY_REPR.maxother = 1000
+
+
+def _summarize(value: Any, limit: int) -> str:
+    """Short repr of value, bounded work even for very large values."""
+    return _SUMMARY_REPR.repr(value)[:limit]
+
+
+# Warunki filtrów budowane raz - Qdrant ich nie modyfikuje, więc ten sam
+# obiekt może trafić do wielu zapytań bez ponownej walidacji
+@lru_cache(maxsize=1024)
+def _company_condition(company_id: str) -> FieldCondition:
+    """Filter condition matching one company's points."""
+    return FieldCondition(key="company_id", match=MatchValue(value=company_id))
+
+
+_RESPONSE_CACHE_CONDITION = FieldCondition(
+    key="memory_type", match=MatchValue(value=MemoryType.RESPONSE_CACHE)
+)
+
+
+class EmbeddingCache:
+    """Process-local LRU cache of text embeddings with a TTL.
+
+    Keyed by a SHA-256 of model and text. Embeddings never go stale for the
+    same model, the TTL only bounds how long unused entries are kept.
+    Vectors are held as contiguous float32 arrays (~6 KB each instead of
+    ~50 KB of boxed Python floats). Thread-safe - agent tools embed from
+    crew worker threads.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple[float, np.ndarray]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def key(model: str, text: str) -> bytes:
+        """Build the cache key for a model and text."""
+        return hashlib.sha256(f"{model}:{text}".encode()).digest()
+
+    def get(self, key: bytes) -> list[float] | None:
+        """Get an embedding, or None on a miss or an expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1].tolist()
+
+    def set(self, key: bytes, embedding: list[float]) -> None:
+        """Store an embedding, evicting the least recently used entry when full."""
+        with self._lock:
+            vector = np.asarray(embedding, dtype=np.float32)
+            self._entries[key] = (time.monotonic() + self.ttl, vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters for monitoring."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._entries),
+            }
+
+
+class RecallCache:
+    """Per-company cache of recent recall results keyed by query vector.
+
+    A new query whose cosine similarity to a cached query vector reaches
+    min_similarity (with the same filters) gets the cached results. OpenAI
+    embeddings are unit length, so one matrix-vector product gives all
+    similarities. Writes for a company drop its entries.
+    """
+
+    def __init__(self, per_company: int, ttl: float, min_similarity: float):
+        self.per_company = per_company
+        self.ttl = ttl
+        self.min_similarity = min_similarity
+        # company_id -> [(filter_key, vector, results, expires_at)], newest last
+        self._entries: dict[str, list[tuple[tuple, np.ndarray, list, float]]] = {}
+        self._lock = threading.RLock()
+
+    def get(self, company_id: str, filter_key: tuple, vector: list[float]) -> list | None:
+        """Get results cached for a near-identical query, or None."""
+        with self._lock:
+            now = time.monotonic()
+            entries = [
+                entry for entry in self._entries.get(company_id, [])
+                if entry[0] == filter_key and entry[3] > now
+            ]
+            if not entries:
+                return None
+
+            query = np.asarray(vector, dtype=np.float32)
+            similarities = np.stack([entry[1] for entry in entries]) @ query
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.min_similarity:
+                return None
+            return list(entries[best][2])
+
+    def set(self, company_id: str, filter_key: tuple, vector: list[float], results: list) -> None:
+        """Cache results, dropping expired and the oldest entries over the limit."""
+        with self._lock:
+            now = time.monotonic()
+            entries = [e for e in self._entries.get(company_id, []) if e[3] > now]
+            entries.append(
+                (filter_key, np.asarray(vector, dtype=np.float32), results, now + self.ttl)
+            )
+            self._entries[company_id] = entries[-self.per_company:]
+
+    def invalidate(self, company_id: str) -> None:
+        """Forget a company's cached results after its memories change."""
+        with self._lock:
+            self._entries.pop(company_id, None)
+
+
+@uses_llm_http_clients
+@lru_cache(maxsize=1)
+def _openai_client() -> OpenAI:
+    """Shared OpenAI client for embeddings, rebuilt when the HTTP pool is closed."""
+    return OpenAI(api_key=settings.OPENAI_API_KEY, http_client=get_llm_http_client())
 
 
 class AgentMemoryService:
@@ -36,30 +235,60 @@ class AgentMemoryService:
 
     def __init__(self):
         self.client: QdrantClient | None = None
-        self.openai: OpenAI | None = None
+        self._openai_ready = False
         self._initialized = False
+        # Agent tools initialize lazily from parallel worker threads
+        self._init_lock = threading.Lock()
+        self._embedding_cache = EmbeddingCache(EMBEDDING_CACHE_SIZE, EMBEDDING_CACHE_TTL)
+        self._recall_cache = RecallCache(
+            RECALL_CACHE_PER_COMPANY, RECALL_CACHE_TTL, RECALL_CACHE_MIN_SIMILARITY
+        )
+
+    @property
+    def openai(self) -> OpenAI | None:
+        """OpenAI client for embeddings, or None until initialization succeeds."""
+        return _openai_client() if self._openai_ready else None
+
+    @property
+    def embedding_cache_stats(self) -> dict[str, Any]:
+        """Query embedding cache statistics (hits, misses, hit_rate, size)."""
+        return self._embedding_cache.stats
 
     async def initialize(self) -> None:
         """Initialize connections to Qdrant and OpenAI."""
+        # Sync SDK - collection setup runs off the event loop
+        await asyncio.to_thread(self.initialize_sync)
+
+    def initialize_sync(self) -> None:
+        """Initialize connections from sync code, e.g. agent tools in a worker thread."""
         if self._initialized:
             return
 
-        try:
-            self.client = QdrantClient(url=settings.QDRANT_URL)
-            self.openai = OpenAI(api_key=settings.OPENAI_API_KEY)
-            await self._ensure_collection()
-            self._initialized = True
-        except Exception as e:
-            print(f"Memory service initialization failed: {e}")
-            self._initialized = False
-
-    async def _ensure_collection(self) -> None:
+        with self._init_lock:
+            # Another thread may have finished while this one waited
+            if self._initialized:
+                return
+
+            try:
+                self.client = QdrantClient(
+                    url=settings.QDRANT_URL,
+                    prefer_grpc=settings.QDRANT_PREFER_GRPC,
+                )
+                _openai_client()
+                self._openai_ready = True
+                self._ensure_collection()
+                self._initialized = True
+            except Exception as e:
+                print(f"Memory service initialization failed: {e}")
+                self._initialized = False
+
+    def _ensure_collection(self) -> None:
         """Ensure the memory collection exists with proper schema."""
         if not self.client:
             return
 
         try:
-            self.client.get_collection(COLLECTION_NAME)
+            info = self.client.get_collection(COLLECTION_NAME)
         except Exception:
             self.client.create_collection(
                 collection_name=COLLECTION_NAME,
@@ -67,34 +296,54 @@ class AgentMemoryService:
                     size=VECTOR_SIZE,
                     distance=models.Distance.COSINE,
                 ),
+                hnsw_config=HNSW_CONFIG,
+                quantization_config=QUANTIZATION_CONFIG,
             )
-            # Create payload indexes for filtering
-            self.client.create_payload_index(
-                collection_name=COLLECTION_NAME,
-                field_name="company_id",
-                field_schema=models.PayloadSchemaType.KEYWORD,
-            )
-            self.client.create_payload_index(
-                collection_name=COLLECTION_NAME,
-                field_name="memory_type",
-                field_schema=models.PayloadSchemaType.KEYWORD,
-            )
-            self.client.create_payload_index(
-                collection_name=COLLECTION_NAME,
-                field_name="agent",
-                field_schema=models.PayloadSchemaType.KEYWORD,
+            payload_schema = {}
+        else:
+            # Collections created earlier (or by QdrantService at startup)
+            # are brought up to date in place
+            updates: dict[str, Any] = {}
+            if info.config.quantization_config is None:
+                updates["quantization_config"] = QUANTIZATION_CONFIG
+            if info.config.hnsw_config.payload_m != HNSW_CONFIG.payload_m:
+                updates["hnsw_config"] = HNSW_CONFIG
+            if updates:
+                self.client.update_collection(collection_name=COLLECTION_NAME, **updates)
+            payload_schema = info.payload_schema
+
+        # Create payload indexes for filtering
+        for field_name, field_schema in PAYLOAD_INDEXES.items():
+            current = payload_schema.get(field_name)
+            tenant_missing = (
+                isinstance(field_schema, models.KeywordIndexParams)
+                and not getattr(current and current.params, "is_tenant", False)
             )
+            if current is None or tenant_missing:
+                self.client.create_payload_index(
+                    collection_name=COLLECTION_NAME,
+                    field_name=field_name,
+                    field_schema=field_schema,
+                )
 
     def _get_embedding(self, text: str) -> list[float]:
-        """Generate embedding for text using OpenAI."""
+        """Generate embedding for text using OpenAI, reusing cached ones."""
         if not self.openai:
             raise RuntimeError("OpenAI client not initialized")
 
+        # The same brief is embedded by several lookups in one request
+        cache_key = EmbeddingCache.key(EMBEDDING_MODEL, text)
+        embedding = self._embedding_cache.get(cache_key)
+        if embedding is not None:
+            return embedding
+
         response = self.openai.embeddings.create(
-            model="text-embedding-3-small",
+            model=EMBEDDING_MODEL,
             input=text,
         )
-        return response.data[0].embedding
+        embedding = response.data[0].embedding
+        self._embedding_cache.set(cache_key, embedding)
+        return embedding
 
     def _generate_id(self, content: str, company_id: str) -> str:
         """Generate deterministic ID for deduplication."""
@@ -129,36 +378,47 @@ class AgentMemoryService:
         if not self.client:
             raise RuntimeError("Memory service not available")
 
-        # Generate embedding
-        embedding = self._get_embedding(content)
-
-        # Generate ID (for deduplication)
-        memory_id = self._generate_id(content, company_id)
-
-        # Prepare payload
-        payload = {
-            "company_id": company_id,
-            "content": content,
-            "memory_type": memory_type,
-            "agent": agent,
-            "rating": rating,
-            "created_at": datetime.utcnow().isoformat(),
-            **(metadata or {}),
-        }
+        # Generate embedding (blocking clients run off the event loop)
+        embedding = await asyncio.to_thread(self._get_embedding, content)
+
+        point = self._build_point(
+            embedding, company_id, content, memory_type, agent, metadata, rating
+        )
 
         # Upsert point
-        self.client.upsert(
+        await asyncio.to_thread(
+            self.client.upsert,
             collection_name=COLLECTION_NAME,
-            points=[
-                PointStruct(
-                    id=memory_id,
-                    vector=embedding,
-                    payload=payload,
-                )
-            ],
+            points=[point],
         )
+        self._recall_cache.invalidate(company_id)
 
-        return memory_id
+        return point.id
+
+    def _build_point(
+        self,
+        embedding: list[float],
+        company_id: str,
+        content: str,
+        memory_type: str,
+        agent: str,
+        metadata: dict[str, Any] | None,
+        rating: int | None,
+    ) -> PointStruct:
+        """Build the Qdrant point for a memory (ID is deterministic for deduplication)."""
+        return PointStruct(
+            id=self._generate_id(content, company_id),
+            vector=embedding,
+            payload={
+                "company_id": company_id,
+                "content": content,
+                "memory_type": memory_type,
+                "agent": agent,
+                "rating": rating,
+                "created_at": datetime.utcnow().isoformat(),
+                **(metadata or {}),
+            },
+        )
 
     async def recall_memories(
         self,
@@ -188,13 +448,16 @@ class AgentMemoryService:
         if not self.client:
             return []
 
-        # Generate query embedding
-        query_embedding = self._get_embedding(query)
+        # Generate query embedding (blocking clients run off the event loop)
+        query_embedding = await asyncio.to_thread(self._get_embedding, query)
+
+        filter_key = (tuple(memory_types or ()), agent, limit, min_score)
+        cached = self._recall_cache.get(company_id, filter_key, query_embedding)
+        if cached is not None:
+            return cached
 
         # Build filter conditions
-        must_conditions = [
-            FieldCondition(key="company_id", match=MatchValue(value=company_id))
-        ]
+        must_conditions = [_company_condition(company_id)]
 
         if memory_types:
             must_conditions.append(
@@ -209,19 +472,23 @@ class AgentMemoryService:
                 FieldCondition(key="agent", match=MatchValue(value=agent))
             )
 
+        # Cached agent responses share the collection but are not memories
+        must_not_conditions = [_RESPONSE_CACHE_CONDITION]
+
         # Search
-        results = self.client.search(
+        results = await asyncio.to_thread(
+            self.client.search,
             collection_name=COLLECTION_NAME,
             query_vector=query_embedding,
-            query_filter=Filter(must=must_conditions),
+            query_filter=Filter(must=must_conditions, must_not=must_not_conditions),
             limit=limit,
             score_threshold=min_score,
+            search_params=SEARCH_PARAMS,
         )
 
         # Format results
-        memories = []
-        for hit in results:
-            memories.append({
+        memories = [
+            {
                 "id": hit.id,
                 "content": hit.payload.get("content", ""),
                 "memory_type": hit.payload.get("memory_type", ""),
@@ -230,11 +497,13 @@ class AgentMemoryService:
                 "score": hit.score,
                 "created_at": hit.payload.get("created_at"),
                 "metadata": {
-                    k: v for k, v in hit.payload.items()
-                    if k not in ["content", "memory_type", "agent", "rating", "created_at", "company_id"]
+                    k: v for k, v in hit.payload.items() if k not in MEMORY_PAYLOAD_FIELDS
                 },
-            })
+            }
+            for hit in results
+        ]
 
+        self._recall_cache.set(company_id, filter_key, query_embedding, memories)
         return memories
 
     async def store_successful_task(
@@ -255,15 +524,18 @@ class AgentMemoryService:
             return ""
 
         # Create content for embedding
+        result = task_output.get("content") or task_output.get("post_text")
+        if result is None:
+            result = _summarize(task_output, 500)
         content = f"""
 Zadanie: {task_input.get('brief', '')}
 Typ: {task_input.get('type', task_input.get('post_type', ''))}
-Wynik: {task_output.get('content', task_output.get('post_text', str(task_output)[:500]))}
+Wynik: {result}
 """
 
         metadata = {
             "task_input": task_input,
-            "task_output_summary": str(task_output)[:1000],
+            "task_output_summary": _summarize(task_output, 1000),
         }
 
         return await self.store_memory(
@@ -321,10 +593,19 @@ Wynik: {task_output.get('content', task_output.get('post_text', str(task_output)
         company_id: str,
         query: str,
         limit: int = 5,
+        max_entry_chars: int | None = None,
+        exclude_text: str = "",
     ) -> str:
         """Get relevant company context for a query.
 
         Zwraca sformatowany kontekst o firmie do użycia przez agenta.
+
+        Args:
+            company_id: ID firmy
+            query: Zapytanie do wyszukania
+            limit: Maksymalna liczba faktów
+            max_entry_chars: Przytnij każdy fakt do tylu znaków
+            exclude_text: Pomiń fakty, które już w nim są (np. kontekst marki)
         """
         memories = await self.recall_memories(
             company_id=company_id,
@@ -339,30 +620,227 @@ Wynik: {task_output.get('content', task_output.get('post_text', str(task_output)
 
         context_parts = ["KONTEKST FIRMY:"]
         for mem in memories:
-            context_parts.append(f"- {mem['content']}")
+            content = mem["content"].strip()
+            if exclude_text and content in exclude_text:
+                continue
+            if max_entry_chars and len(content) > max_entry_chars:
+                content = f"{content[:max_entry_chars]}..."
+            context_parts.append(f"- {content}")
+
+        if len(context_parts) == 1:
+            return ""
 
         return "\n".join(context_parts)
 
+    async def embed(self, text: str) -> list[float] | None:
+        """Embed text once so the vector can be reused for lookup and store."""
+        return await asyncio.to_thread(self.embed_sync, text)
+
+    def embed_sync(self, text: str) -> list[float] | None:
+        """Blocking variant of embed for agent tools."""
+        if not self._initialized:
+            self.initialize_sync()
+
+        if not self.openai:
+            return None
+
+        return self._get_embedding(text)
+
+    async def find_cached_response(
+        self,
+        company_id: str,
+        namespace: str,
+        embedding: list[float],
+        context_hash: str,
+        min_score: float = 0.95,
+    ) -> dict[str, Any] | None:
+        """Find a cached agent response for a near-identical brief.
+
+        Szuka tylko w obrębie firmy, przestrzeni nazw (agent + typ treści)
+        i tego samego kontekstu marki. Wygasłe wpisy są pomijane.
+        """
+        return await asyncio.to_thread(
+            self.find_cached_response_sync,
+            company_id, namespace, embedding, context_hash, min_score,
+        )
+
+    def find_cached_response_sync(
+        self,
+        company_id: str,
+        namespace: str,
+        embedding: list[float],
+        context_hash: str,
+        min_score: float = 0.95,
+    ) -> dict[str, Any] | None:
+        """Blocking variant of find_cached_response for agent tools."""
+        if not self._initialized:
+            self.initialize_sync()
+
+        if not self.client:
+            return None
+
+        results = self.client.search(
+            collection_name=COLLECTION_NAME,
+            query_vector=embedding,
+            query_filter=Filter(must=[
+                _company_condition(company_id),
+                _RESPONSE_CACHE_CONDITION,
+                FieldCondition(key="agent", match=MatchValue(value=namespace)),
+                FieldCondition(key="context_hash", match=MatchValue(value=context_hash)),
+                FieldCondition(key="expires_at", range=models.Range(gt=time.time())),
+            ]),
+            limit=1,
+            score_threshold=min_score,
+            search_params=SEARCH_PARAMS,
+        )
+
+        if not results:
+            return None
+
+        return results[0].payload.get("response")
+
+    async def store_cached_response(
+        self,
+        company_id: str,
+        namespace: str,
+        embedding: list[float],
+        context_hash: str,
+        brief: str,
+        response: dict[str, Any],
+        ttl: int,
+    ) -> str:
+        """Store an agent response under the already computed brief embedding.
+
+        Args:
+            company_id: ID firmy
+            namespace: Agent i typ treści, np. "copywriter:ad"
+            embedding: Embedding briefu z find_cached_response
+            context_hash: Skrót kontekstu marki i parametrów generowania
+            brief: Brief zadania
+            response: Wynik do zwrócenia przy trafieniu
+            ttl: Czas życia wpisu w sekundach
+
+        Returns:
+            ID zapisanego wpisu
+        """
+        return await asyncio.to_thread(
+            self.store_cached_response_sync,
+            company_id, namespace, embedding, context_hash, brief, response, ttl,
+        )
+
+    def store_cached_response_sync(
+        self,
+        company_id: str,
+        namespace: str,
+        embedding: list[float],
+        context_hash: str,
+        brief: str,
+        response: dict[str, Any],
+        ttl: int,
+    ) -> str:
+        """Blocking variant of store_cached_response for agent tools."""
+        if not self._initialized:
+            self.initialize_sync()
+
+        if not self.client:
+            raise RuntimeError("Memory service not available")
+
+        entry_id = self._generate_id(f"{namespace}:{context_hash}:{brief}", company_id)
+
+        self.client.upsert(
+            collection_name=COLLECTION_NAME,
+            points=[
+                PointStruct(
+                    id=entry_id,
+                    vector=embedding,
+                    payload={
+                        "company_id": company_id,
+                        "content": brief,
+                        "memory_type": MemoryType.RESPONSE_CACHE,
+                        "agent": namespace,
+                        "context_hash": context_hash,
+                        "response": response,
+                        "created_at": datetime.utcnow().isoformat(),
+                        "expires_at": time.time() + ttl,
+                    },
+                )
+            ],
+        )
+
+        return entry_id
+
+    async def purge_expired_cached_responses(self) -> int:
+        """Delete cached responses past their expires_at; returns the number deleted."""
+        return await asyncio.to_thread(self.purge_expired_cached_responses_sync)
+
+    def purge_expired_cached_responses_sync(self) -> int:
+        """Blocking variant of purge_expired_cached_responses.
+
+        expires_at only hides entries from lookups, so without this every
+        cached brief and search query would stay in the collection for good.
+        """
+        if not self._initialized:
+            self.initialize_sync()
+
+        if not self.client:
+            return 0
+
+        expired_filter = Filter(must=[
+            _RESPONSE_CACHE_CONDITION,
+            FieldCondition(key="expires_at", range=models.Range(lt=time.time())),
+        ])
+        count = self.client.count(
+            collection_name=COLLECTION_NAME,
+            count_filter=expired_filter,
+            exact=True,
+        ).count
+
+        if count:
+            self.client.delete(
+                collection_name=COLLECTION_NAME,
+                points_selector=models.FilterSelector(filter=expired_filter),
+                wait=False,
+            )
+
+        return count
+
     async def delete_company_memories(self, company_id: str) -> int:
         """Delete all memories for a company (e.g., when company is deleted)."""
         if not self._initialized:
             await self.initialize()
 
+        return await asyncio.to_thread(self.delete_company_memories_sync, company_id)
+
+    def delete_company_memories_sync(self, company_id: str) -> int:
+        """Blocking variant of delete_company_memories; returns the number deleted.
+
+        The count comes from the indexed company_id; Qdrant applies the
+        delete in the background (wait=False).
+        """
+        if not self._initialized:
+            self.initialize_sync()
+
         if not self.client:
             return 0
 
-        result = self.client.delete(
-            collection_name=COLLECTION_NAME,
-            points_selector=models.FilterSelector(
-                filter=Filter(
-                    must=[
-                        FieldCondition(key="company_id", match=MatchValue(value=company_id))
-                    ]
-                )
-            ),
+        company_filter = Filter(
+            must=[_company_condition(company_id)]
         )
+        count = self.client.count(
+            collection_name=COLLECTION_NAME,
+            count_filter=company_filter,
+            exact=True,
+        ).count
+
+        if count:
+            self.client.delete(
+                collection_name=COLLECTION_NAME,
+                points_selector=models.FilterSelector(filter=company_filter),
+                wait=False,
+            )
+        self._recall_cache.invalidate(company_id)
 
-        return getattr(result, 'deleted_count', 0)
+        return count
 
 
 # Singleton instance
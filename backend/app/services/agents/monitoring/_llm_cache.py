@@ -0,0 +1,49 @@
+"""Cache odpowiedzi LLM dla monitorów.
+
+Wpis w Redis pod skrótem firmy, modelu, temperatury i pełnego promptu.
+Tylko identyczny prompt daje trafienie: prompty monitorów to stały szablon
+z liczbami i krótkimi polami, więc podobieństwo embeddingów nie odróżnia
+np. różnych sald - trafienie semantyczne zwracałoby analizę innych danych.
+Trafienie zwraca zapisany tekst zamiast uruchamiać crew.
+"""
+
+import hashlib
+import json
+
+from redis.exceptions import RedisError
+
+from app.services.cache import get_cache_service
+
+LLM_CACHE_TTL = 3600  # 1 godzina
+
+
+def llm_cache_key(company_id: str, model: str, temperature: float, prompt: str) -> str:
+    """Redis key for a company's response to exactly this prompt."""
+    payload = json.dumps(
+        {
+            "company_id": company_id,
+            "model": model,
+            "temperature": temperature,
+            "prompt": prompt,
+        },
+        sort_keys=True,
+    )
+    return f"monitoring:llm:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
+async def get_cached_llm_response(key: str) -> str | None:
+    """Get a cached response, or None on a miss or when Redis is unavailable."""
+    try:
+        cache = await get_cache_service()
+        return await cache.get(key)
+    except (RuntimeError, RedisError):
+        return None
+
+
+async def cache_llm_response(key: str, response_text: str) -> None:
+    """Store a fresh response; cache errors never fail generation."""
+    try:
+        cache = await get_cache_service()
+        await cache.set(key, response_text, ttl=LLM_CACHE_TTL)
+    except (RuntimeError, RedisError):
+        pass
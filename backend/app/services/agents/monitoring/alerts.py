@@ -72,6 +72,24 @@ class Alert(BaseModel):
     source_entity_id: str | None = None
 
 
+def _utc_midnight() -> datetime:
+    """Start of the current UTC day."""
+    return datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _alert_from_doc(doc: dict[str, Any]) -> Alert:
+    """Build an Alert from a stored document without re-validating it.
+
+    Documents are written from validated Alert models, so only the enums
+    need converting back from their stored values.
+    """
+    fields = {k: v for k, v in doc.items() if k in Alert.model_fields}
+    fields["id"] = str(doc["_id"])
+    fields["type"] = AlertType(doc["type"])
+    fields["priority"] = AlertPriority(doc["priority"])
+    return Alert.model_construct(**fields)
+
+
 class AlertService:
     """Service for managing alerts."""
 
@@ -111,27 +129,53 @@ class AlertService:
             expires_at=expires_at,
         )
 
-        # Check for duplicate recent alerts
-        existing = await self.collection.find_one({
-            "company_id": company_id,
-            "type": alert_type.value,
-            "source_entity_id": source_entity_id,
+        return (await self.create_alerts_bulk([alert]))[0]
+
+    async def create_alerts_bulk(self, alerts: list[Alert]) -> list[Alert]:
+        """Create many alerts with one duplicate check and one insert.
+
+        Returns alerts in input order. An alert that repeats one created
+        today for the same entity (or earlier in the batch) is replaced by
+        the existing alert, like in create_alert.
+        """
+        if not alerts:
+            return []
+
+        keys = [(a.company_id, a.type.value, a.source_entity_id) for a in alerts]
+
+        # Check for duplicate recent alerts - one query for the whole batch
+        cursor = self.collection.find({
+            "$or": [
+                {"company_id": company_id, "type": alert_type, "source_entity_id": entity_id}
+                for company_id, alert_type, entity_id in dict.fromkeys(keys)
+            ],
             "dismissed": False,
-            "created_at": {"$gte": datetime.utcnow().replace(hour=0, minute=0, second=0)},
+            "created_at": {"$gte": _utc_midnight()},
         })
+        existing: dict[tuple, Alert] = {}
+        async for doc in cursor:
+            key = (doc["company_id"], doc["type"], doc.get("source_entity_id"))
+            existing[key] = _alert_from_doc(doc)
 
-        if existing:
-            # Don't create duplicate alerts for same entity on same day
-            return Alert(**{**existing, "id": str(existing["_id"])})
+        # Don't create duplicate alerts for same entity on same day
+        result = []
+        new_docs = []
+        for alert, key in zip(alerts, keys):
+            if key in existing:
+                result.append(existing[key])
+                continue
 
-        # Insert alert
-        doc = alert.model_dump()
-        doc["_id"] = ObjectId(alert.id)
-        del doc["id"]
+            doc = alert.model_dump()
+            doc["_id"] = ObjectId(alert.id)
+            del doc["id"]
+            new_docs.append(doc)
+            existing[key] = alert
+            result.append(alert)
 
-        await self.collection.insert_one(doc)
+        if new_docs:
+            await self.collection.insert_many(new_docs, ordered=False)
 
-        return alert
+        return result
 
     async def get_alerts(
         self,
@@ -166,9 +210,7 @@ class AlertService:
         cursor = self.collection.find(query).sort("created_at", -1).limit(limit)
 
         async for doc in cursor:
-            doc["id"] = str(doc["_id"])
-            del doc["_id"]
-            alerts.append(Alert(**doc))
+            alerts.append(_alert_from_doc(doc))
 
         return alerts
 
@@ -204,6 +246,51 @@ class AlertService:
 
         return counts
 
+    async def get_alerts_overview(
+        self,
+        company_id: str,
+        limit: int = 50,
+    ) -> tuple[list[Alert], dict[str, int]]:
+        """Get active alerts and unread counts by priority in one aggregation."""
+        pipeline = [
+            {
+                "$match": {
+                    "company_id": company_id,
+                    "dismissed": False,
+                    "$or": [
+                        {"expires_at": None},
+                        {"expires_at": {"$gt": datetime.utcnow()}},
+                    ],
+                }
+            },
+            {
+                "$facet": {
+                    "alerts": [
+                        {"$sort": {"created_at": -1}},
+                        {"$limit": limit},
+                    ],
+                    "unread": [
+                        {"$match": {"read": False}},
+                        {"$group": {"_id": "$priority", "count": {"$sum": 1}}},
+                    ],
+                }
+            },
+        ]
+
+        result = await self.collection.aggregate(pipeline).to_list(length=1)
+        facets = result[0] if result else {"alerts": [], "unread": []}
+
+        alerts = []
+        for doc in facets["alerts"]:
+            alerts.append(_alert_from_doc(doc))
+
+        counts = {"total": 0, "urgent": 0, "high": 0, "medium": 0, "low": 0}
+        for doc in facets["unread"]:
+            counts[doc["_id"]] = doc["count"]
+            counts["total"] += doc["count"]
+
+        return alerts, counts
+
     async def mark_as_read(self, alert_id: str, company_id: str) -> bool:
         """Mark an alert as read."""
         result = await self.collection.update_one(
@@ -1,25 +1,51 @@
 """Cashflow Monitor - Proactive cashflow alerts."""
 
+import json
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any
 
 from crewai import Agent, Task, Crew, Process
 from langchain_openai import ChatOpenAI
 
 from app.core.config import settings
+from app.services.agents.llm_http import (
+    get_llm_http_async_client,
+    get_llm_http_client,
+    uses_llm_http_clients,
+)
+from app.services.agents.monitoring._llm_cache import (
+    cache_llm_response,
+    get_cached_llm_response,
+    llm_cache_key,
+)
 from app.services.agents.monitoring.alerts import (
+    Alert,
     AlertService,
     AlertType,
     AlertPriority,
 )
 
 
+_JSON_DECODER = json.JSONDecoder()
+
+LLM_MODEL = "gpt-4o-mini"
+LLM_TEMPERATURE = 0.3
+
+
+@uses_llm_http_clients
+@lru_cache(maxsize=1)
 def _get_llm():
-    """Get LLM instance."""
+    """Get shared LLM instance.
+
+    Cached so every call reuses one client and its connection pool.
+    """
     return ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.3,
+        model=LLM_MODEL,
+        temperature=LLM_TEMPERATURE,
         api_key=settings.OPENAI_API_KEY,
+        http_client=get_llm_http_client(),
+        http_async_client=get_llm_http_async_client(),
     )
 
 
@@ -51,7 +77,7 @@ class CashflowMonitor:
         Returns:
             List of generated alerts
         """
-        generated_alerts = []
+        drafts = []
 
         # Calculate threshold (default: 2 months of expenses)
         threshold = low_balance_threshold or (monthly_expenses * 2)
@@ -64,9 +90,9 @@ class CashflowMonitor:
                 AlertPriority.HIGH if months_runway < 2 else AlertPriority.MEDIUM
             )
 
-            alert = await self.alert_service.create_alert(
+            drafts.append(Alert(
                 company_id=company_id,
-                alert_type=AlertType.CASHFLOW_LOW_BALANCE,
+                type=AlertType.CASHFLOW_LOW_BALANCE,
                 priority=priority,
                 title="Niski stan konta",
                 message=f"Obecne saldo ({current_balance:,.2f} PLN) jest poniżej "
@@ -86,41 +112,43 @@ class CashflowMonitor:
                     "Sprawdź możliwości redukcji kosztów",
                 ],
                 source_monitor="cashflow_monitor",
-            )
-            generated_alerts.append(alert.model_dump())
+            ))
 
         # Analyze recent transactions for unusual spending
         if recent_transactions:
-            analysis = await self._analyze_transactions(
+            drafts.extend(self._analyze_transactions(
                 company_id=company_id,
                 transactions=recent_transactions,
                 monthly_average=monthly_expenses,
-            )
-            if analysis:
-                generated_alerts.extend(analysis)
+            ))
 
-        return generated_alerts
+        alerts = await self.alert_service.create_alerts_bulk(drafts)
+        return [alert.model_dump() for alert in alerts]
 
-    async def _analyze_transactions(
+    def _analyze_transactions(
         self,
         company_id: str,
         transactions: list[dict],
         monthly_average: float,
-    ) -> list[dict]:
-        """Analyze transactions for unusual patterns."""
-        alerts = []
-
-        # Calculate recent spending
-        recent_expenses = sum(
-            t.get("amount", 0) for t in transactions
-            if t.get("type") == "expense"
-        )
+    ) -> list[Alert]:
+        """Analyze transactions for unusual patterns; returns alerts to create."""
+        drafts = []
+
+        # Calculate recent spending and income in one pass
+        recent_expenses = 0.0
+        recent_income = 0.0
+        for t in transactions:
+            transaction_type = t.get("type")
+            if transaction_type == "expense":
+                recent_expenses += t.get("amount", 0)
+            elif transaction_type == "income":
+                recent_income += t.get("amount", 0)
 
         # Check if spending is unusually high (>150% of average)
         if recent_expenses > monthly_average * 1.5:
-            alert = await self.alert_service.create_alert(
+            drafts.append(Alert(
                 company_id=company_id,
-                alert_type=AlertType.CASHFLOW_UNUSUAL_SPENDING,
+                type=AlertType.CASHFLOW_UNUSUAL_SPENDING,
                 priority=AlertPriority.MEDIUM,
                 title="Nietypowo wysokie wydatki",
                 message=f"Ostatnie wydatki ({recent_expenses:,.2f} PLN) są znacznie "
@@ -137,19 +165,13 @@ class CashflowMonitor:
                     "Zweryfikuj, czy wszystkie transakcje są prawidłowe",
                 ],
                 source_monitor="cashflow_monitor",
-            )
-            alerts.append(alert.model_dump())
+            ))
 
         # Check for positive trend (income > expenses)
-        recent_income = sum(
-            t.get("amount", 0) for t in transactions
-            if t.get("type") == "income"
-        )
-
         if recent_income > recent_expenses * 1.3:
-            alert = await self.alert_service.create_alert(
+            drafts.append(Alert(
                 company_id=company_id,
-                alert_type=AlertType.CASHFLOW_POSITIVE_TREND,
+                type=AlertType.CASHFLOW_POSITIVE_TREND,
                 priority=AlertPriority.LOW,
                 title="Pozytywny trend cashflow",
                 message=f"Gratulacje! Ostatnie przychody ({recent_income:,.2f} PLN) "
@@ -166,10 +188,9 @@ class CashflowMonitor:
                     "Sprawdź możliwości inwestycji w rozwój",
                 ],
                 source_monitor="cashflow_monitor",
-            )
-            alerts.append(alert.model_dump())
+            ))
 
-        return alerts
+        return drafts
 
     async def generate_cashflow_insights(
         self,
@@ -185,20 +206,7 @@ class CashflowMonitor:
         Returns:
             Dictionary with insights and recommendations
         """
-        llm = _get_llm()
-
-        analyst = Agent(
-            role="Financial Analyst",
-            goal="Analizować cashflow i dostarczać praktyczne rekomendacje",
-            backstory="""Jesteś doświadczonym analitykiem finansowym dla MŚP.
-            Potrafisz szybko ocenić sytuację finansową i zaproponować działania.""",
-            tools=[],
-            llm=llm,
-            verbose=False,
-        )
-
-        task = Task(
-            description=f"""
+        prompt = f"""
             Przeanalizuj dane finansowe firmy i dostarcz insights:
 
             DANE FINANSOWE:
@@ -225,29 +233,45 @@ class CashflowMonitor:
                 ],
                 "summary": "podsumowanie 2-3 zdania"
             }}
-            """,
-            agent=analyst,
-            expected_output="Cashflow insights in JSON format",
-        )
-
-        crew = Crew(
-            agents=[analyst],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=False,
-        )
+            """
+
+        cache_key = llm_cache_key(company_id, LLM_MODEL, LLM_TEMPERATURE, prompt)
+        result_text = await get_cached_llm_response(cache_key)
+
+        if result_text is None:
+            llm = _get_llm()
+
+            analyst = Agent(
+                role="Financial Analyst",
+                goal="Analizować cashflow i dostarczać praktyczne rekomendacje",
+                backstory="""Jesteś doświadczonym analitykiem finansowym dla MŚP.
+                Potrafisz szybko ocenić sytuację finansową i zaproponować działania.""",
+                tools=[],
+                llm=llm,
+                verbose=False,
+            )
 
-        result = crew.kickoff()
+            task = Task(
+                description=prompt,
+                agent=analyst,
+                expected_output="Cashflow insights in JSON format",
+            )
 
-        import json
-        import re
+            crew = Crew(
+                agents=[analyst],
+                tasks=[task],
+                process=Process.sequential,
+                verbose=False,
+            )
 
-        result_text = str(result)
-        json_match = re.search(r'\{[\s\S]*\}', result_text)
+            result_text = str(crew.kickoff())
+            await cache_llm_response(cache_key, result_text)
 
-        if json_match:
+        # Obiekt zaczyna się od pierwszego "{" - tekst po nim jest pomijany
+        start = result_text.find("{")
+        if start != -1:
             try:
-                parsed = json.loads(json_match.group())
+                parsed, _ = _JSON_DECODER.raw_decode(result_text, start)
                 return {"success": True, "insights": parsed}
             except json.JSONDecodeError:
                 pass
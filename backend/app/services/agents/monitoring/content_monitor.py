@@ -1,25 +1,58 @@
 """Content Monitor - Proactive content calendar alerts."""
 
+import json
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any
 
+import numpy as np
 from crewai import Agent, Task, Crew, Process
 from langchain_openai import ChatOpenAI
 
 from app.core.config import settings
+from app.services.agents.llm_http import (
+    get_llm_http_async_client,
+    get_llm_http_client,
+    uses_llm_http_clients,
+)
+from app.services.agents.monitoring._llm_cache import (
+    cache_llm_response,
+    get_cached_llm_response,
+    llm_cache_key,
+)
 from app.services.agents.monitoring.alerts import (
+    Alert,
     AlertService,
     AlertType,
     AlertPriority,
 )
 
 
+_JSON_DECODER = json.JSONDecoder()
+
+LLM_MODEL = "gpt-4o-mini"
+LLM_TEMPERATURE = 0.7
+
+
+@lru_cache(maxsize=1024)
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO 8601 date string, accepting a trailing "Z"."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+@uses_llm_http_clients
+@lru_cache(maxsize=1)
 def _get_llm():
-    """Get LLM instance."""
+    """Get shared LLM instance.
+
+    Cached so every call reuses one client and its connection pool.
+    """
     return ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.7,
+        model=LLM_MODEL,
+        temperature=LLM_TEMPERATURE,
         api_key=settings.OPENAI_API_KEY,
+        http_client=get_llm_http_client(),
+        http_async_client=get_llm_http_async_client(),
     )
 
 
@@ -50,24 +83,29 @@ class ContentMonitor:
         Returns:
             List of generated alerts
         """
-        generated_alerts = []
+        drafts = []
         today = datetime.utcnow()
         week_end = today + timedelta(days=days_to_check)
 
-        # Filter upcoming posts
+        # Filter upcoming posts - datetime values skip parsing entirely
+        parse_iso = _parse_iso
         upcoming_posts = [
             p for p in scheduled_posts
             if p.get("status") != "published"
-            and today <= self._parse_date(p.get("scheduled_at", today)) <= week_end
+            and today <= (
+                d if isinstance(d := p.get("scheduled_at", today), datetime)
+                else parse_iso(d) if isinstance(d, str)
+                else today
+            ) <= week_end
         ]
 
         post_count = len(upcoming_posts)
 
         # Check if calendar is empty or low
         if post_count == 0:
-            alert = await self.alert_service.create_alert(
+            drafts.append(Alert(
                 company_id=company_id,
-                alert_type=AlertType.CONTENT_CALENDAR_EMPTY,
+                type=AlertType.CONTENT_CALENDAR_EMPTY,
                 priority=AlertPriority.HIGH,
                 title="Pusty kalendarz treści",
                 message=f"Nie masz zaplanowanych żadnych postów na najbliższe "
@@ -85,13 +123,12 @@ class ContentMonitor:
                     "Przygotuj content na nadchodzące święta",
                 ],
                 source_monitor="content_monitor",
-            )
-            generated_alerts.append(alert.model_dump())
+            ))
 
         elif post_count < min_posts_per_week:
-            alert = await self.alert_service.create_alert(
+            drafts.append(Alert(
                 company_id=company_id,
-                alert_type=AlertType.CONTENT_CALENDAR_EMPTY,
+                type=AlertType.CONTENT_CALENDAR_EMPTY,
                 priority=AlertPriority.MEDIUM,
                 title="Mało zaplanowanych postów",
                 message=f"Masz tylko {post_count} postów na najbliższe {days_to_check} dni. "
@@ -108,10 +145,10 @@ class ContentMonitor:
                     "Sprawdź jakie treści działały najlepiej",
                 ],
                 source_monitor="content_monitor",
-            )
-            generated_alerts.append(alert.model_dump())
+            ))
 
-        return generated_alerts
+        alerts = await self.alert_service.create_alerts_bulk(drafts)
+        return [alert.model_dump() for alert in alerts]
 
     async def check_content_performance(
         self,
@@ -130,36 +167,36 @@ class ContentMonitor:
         Returns:
             List of generated alerts
         """
-        generated_alerts = []
-
         if not recent_posts:
-            return generated_alerts
-
-        # Calculate engagement rates
-        high_performers = []
-        low_performers = []
-
-        for post in recent_posts:
-            impressions = post.get("impressions", 0)
-            if impressions == 0:
-                continue
+            return []
 
-            engagements = post.get("likes", 0) + post.get("comments", 0) + post.get("shares", 0)
-            engagement_rate = (engagements / impressions) * 100
+        drafts = []
 
-            post["engagement_rate"] = round(engagement_rate, 2)
+        # Calculate engagement rates for all posts at once
+        count = len(recent_posts)
+        impressions = np.fromiter(
+            (p.get("impressions", 0) for p in recent_posts), dtype=np.float64, count=count
+        )
+        engagements = np.fromiter(
+            (p.get("likes", 0) + p.get("comments", 0) + p.get("shares", 0) for p in recent_posts),
+            dtype=np.float64,
+            count=count,
+        )
+        valid = impressions > 0
+        rates = np.zeros(count)
+        np.divide(engagements * 100, impressions, out=rates, where=valid)
 
-            if engagement_rate >= engagement_threshold * 2:
-                high_performers.append(post)
-            elif engagement_rate < engagement_threshold / 2:
-                low_performers.append(post)
+        high_idx = np.flatnonzero(valid & (rates >= engagement_threshold * 2))
+        low_idx = np.flatnonzero(valid & (rates < engagement_threshold / 2))
 
         # Alert for viral content
-        if high_performers:
-            best = max(high_performers, key=lambda p: p["engagement_rate"])
-            alert = await self.alert_service.create_alert(
+        if high_idx.size:
+            best_idx = high_idx[np.argmax(rates[high_idx])]
+            best = recent_posts[best_idx]
+            best["engagement_rate"] = round(float(rates[best_idx]), 2)
+            drafts.append(Alert(
                 company_id=company_id,
-                alert_type=AlertType.CONTENT_VIRAL_POST,
+                type=AlertType.CONTENT_VIRAL_POST,
                 priority=AlertPriority.LOW,
                 title="Post z wysokim engagement!",
                 message=f"Twój post osiągnął {best['engagement_rate']}% engagement rate! "
@@ -179,21 +216,20 @@ class ContentMonitor:
                 ],
                 source_monitor="content_monitor",
                 source_entity_id=best.get("id"),
-            )
-            generated_alerts.append(alert.model_dump())
+            ))
 
         # Alert for low engagement
-        if len(low_performers) >= 3:
-            avg_engagement = sum(p["engagement_rate"] for p in low_performers) / len(low_performers)
-            alert = await self.alert_service.create_alert(
+        if low_idx.size >= 3:
+            avg_engagement = float(rates[low_idx].mean())
+            drafts.append(Alert(
                 company_id=company_id,
-                alert_type=AlertType.CONTENT_LOW_ENGAGEMENT,
+                type=AlertType.CONTENT_LOW_ENGAGEMENT,
                 priority=AlertPriority.MEDIUM,
                 title="Niski engagement ostatnich postów",
-                message=f"Ostatnie {len(low_performers)} postów ma średni engagement "
+                message=f"Ostatnie {low_idx.size} postów ma średni engagement "
                         f"tylko {avg_engagement:.1f}%. Rozważ zmianę strategii content.",
                 data={
-                    "low_performing_count": len(low_performers),
+                    "low_performing_count": int(low_idx.size),
                     "average_engagement": round(avg_engagement, 2),
                     "threshold": engagement_threshold,
                 },
@@ -206,10 +242,10 @@ class ContentMonitor:
                     "Przeprowadź test A/B",
                 ],
                 source_monitor="content_monitor",
-            )
-            generated_alerts.append(alert.model_dump())
+            ))
 
-        return generated_alerts
+        alerts = await self.alert_service.create_alerts_bulk(drafts)
+        return [alert.model_dump() for alert in alerts]
 
     async def suggest_content_ideas(
         self,
@@ -229,27 +265,13 @@ class ContentMonitor:
         Returns:
             Dictionary with content suggestions
         """
-        llm = _get_llm()
-
-        content_strategist = Agent(
-            role="Content Strategist",
-            goal="Generować kreatywne pomysły na content dopasowane do branży",
-            backstory="""Jesteś strategiem content marketingu z wieloletnim
-            doświadczeniem w polskich social media. Wiesz co działa na
-            Instagramie, Facebooku i LinkedIn.""",
-            tools=[],
-            llm=llm,
-            verbose=False,
-        )
-
         recent_text = ", ".join(recent_topics or ["brak danych"])
         events_text = ""
         if upcoming_events:
             for e in upcoming_events[:5]:
                 events_text += f"- {e.get('date', '?')}: {e.get('name', '?')}\n"
 
-        task = Task(
-            description=f"""
+        prompt = f"""
             Zaproponuj pomysły na content dla firmy z branży: {industry}
 
             OSTATNIO PORUSZANE TEMATY (unikaj powtórek):
@@ -293,39 +315,48 @@ class ContentMonitor:
                     "friday": "typ contentu"
                 }}
             }}
-            """,
-            agent=content_strategist,
-            expected_output="Content ideas in JSON format",
-        )
-
-        crew = Crew(
-            agents=[content_strategist],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=False,
-        )
+            """
+
+        cache_key = llm_cache_key(company_id, LLM_MODEL, LLM_TEMPERATURE, prompt)
+        result_text = await get_cached_llm_response(cache_key)
+
+        if result_text is None:
+            llm = _get_llm()
+
+            content_strategist = Agent(
+                role="Content Strategist",
+                goal="Generować kreatywne pomysły na content dopasowane do branży",
+                backstory="""Jesteś strategiem content marketingu z wieloletnim
+                doświadczeniem w polskich social media. Wiesz co działa na
+                Instagramie, Facebooku i LinkedIn.""",
+                tools=[],
+                llm=llm,
+                verbose=False,
+            )
 
-        result = crew.kickoff()
+            task = Task(
+                description=prompt,
+                agent=content_strategist,
+                expected_output="Content ideas in JSON format",
+            )
 
-        import json
-        import re
+            crew = Crew(
+                agents=[content_strategist],
+                tasks=[task],
+                process=Process.sequential,
+                verbose=False,
+            )
 
-        result_text = str(result)
-        json_match = re.search(r'\{[\s\S]*\}', result_text)
+            result_text = str(crew.kickoff())
+            await cache_llm_response(cache_key, result_text)
 
-        if json_match:
+        # Obiekt zaczyna się od pierwszego "{" - tekst po nim jest pomijany
+        start = result_text.find("{")
+        if start != -1:
             try:
-                parsed = json.loads(json_match.group())
+                parsed, _ = _JSON_DECODER.raw_decode(result_text, start)
                 return {"success": True, "ideas": parsed}
             except json.JSONDecodeError:
                 pass
 
         return {"success": True, "ideas": {"raw_content": result_text}}
-
-    def _parse_date(self, date_value) -> datetime:
-        """Parse date from various formats."""
-        if isinstance(date_value, datetime):
-            return date_value
-        if isinstance(date_value, str):
-            return datetime.fromisoformat(date_value.replace("Z", "+00:00"))
-        return datetime.utcnow()
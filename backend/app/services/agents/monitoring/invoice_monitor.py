@@ -8,6 +8,7 @@ from langchain_openai import ChatOpenAI
 
 from app.core.config import settings
 from app.services.agents.monitoring.alerts import (
+    Alert,
     AlertService,
     AlertType,
     AlertPriority,
@@ -49,7 +50,8 @@ class InvoiceMonitor:
         Returns:
             List of generated alerts
         """
-        generated_alerts = []
+        # Alerts are created in one batch after the loop
+        drafts: list[Alert] = []
         today = datetime.utcnow().date()
 
         for invoice in invoices:
@@ -78,9 +80,9 @@ class InvoiceMonitor:
                     AlertPriority.HIGH if days_overdue > 7 else AlertPriority.MEDIUM
                 )
 
-                alert = await self.alert_service.create_alert(
+                drafts.append(Alert(
                     company_id=company_id,
-                    alert_type=AlertType.INVOICE_OVERDUE,
+                    type=AlertType.INVOICE_OVERDUE,
                     priority=priority,
                     title=f"Faktura przeterminowana: {invoice_number}",
                     message=f"Faktura {invoice_number} dla {client} na kwotę "
@@ -102,14 +104,13 @@ class InvoiceMonitor:
                     ],
                     source_monitor="invoice_monitor",
                     source_entity_id=invoice_id,
-                )
-                generated_alerts.append(alert.model_dump())
+                ))
 
             # Due soon
             elif days_until_due <= reminder_days_before:
-                alert = await self.alert_service.create_alert(
+                drafts.append(Alert(
                     company_id=company_id,
-                    alert_type=AlertType.INVOICE_DUE_SOON,
+                    type=AlertType.INVOICE_DUE_SOON,
                     priority=AlertPriority.MEDIUM,
                     title=f"Faktura płatna wkrótce: {invoice_number}",
                     message=f"Faktura {invoice_number} dla {client} na kwotę "
@@ -130,10 +131,10 @@ class InvoiceMonitor:
                     ],
                     source_monitor="invoice_monitor",
                     source_entity_id=invoice_id,
-                )
-                generated_alerts.append(alert.model_dump())
+                ))
 
-        return generated_alerts
+        alerts = await self.alert_service.create_alerts_bulk(drafts)
+        return [alert.model_dump() for alert in alerts]
 
     async def generate_payment_reminder(
         self,
@@ -4,7 +4,8 @@ Provides awareness of current date, season, upcoming holidays,
 and seasonal suggestions for content creation.
 """
 
-from datetime import datetime, timedelta
+from datetime import date as date_type, datetime, timedelta
+from functools import lru_cache
 from typing import TypedDict
 
 
@@ -232,6 +233,21 @@ def build_seasonal_context(date: datetime | None = None) -> str:
     return "\n".join(lines)
 
 
+@lru_cache(maxsize=1)
+def _seasonal_context_for(day: date_type) -> str:
+    """Build the context once per calendar day."""
+    return build_seasonal_context(datetime(day.year, day.month, day.day))
+
+
+def get_todays_seasonal_context() -> str:
+    """Get today's seasonal context, built at most once per day.
+
+    The text only depends on the date, so every prompt of the day gets the
+    same bytes - which also keeps the prompt prefix cacheable.
+    """
+    return _seasonal_context_for(datetime.now().date())
+
+
 def get_seasonal_context_data(date: datetime | None = None) -> SeasonalContext:
     """Get seasonal context as structured data.
 
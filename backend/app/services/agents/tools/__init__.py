@@ -5,6 +5,8 @@ from app.services.agents.tools.web_search import (
     TavilyTrendsTool,
     TavilyCompetitorTool,
     TavilyMarketDataTool,
+    TavilyBundleTool,
+    CachedTavilyTool,
     get_tavily_tool,
     get_marketing_tools,
     get_finance_tools,
@@ -58,6 +60,8 @@ __all__ = [
     "TavilyTrendsTool",
     "TavilyCompetitorTool",
     "TavilyMarketDataTool",
+    "TavilyBundleTool",
+    "CachedTavilyTool",
     "get_tavily_tool",
     "get_marketing_tools",
     "get_finance_tools",
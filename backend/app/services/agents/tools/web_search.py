@@ -4,11 +4,22 @@ Tavily is optimized for LLM/AI applications, providing clean, structured
 search results with relevance scoring and optional answer extraction.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 from crewai.tools import BaseTool
 from pydantic import Field
 from tavily import TavilyClient
 
 from app.core.config import settings
+from app.services.agents.memory import memory_service
+
+# Wspólna pula wątków dla TavilyBundleTool - wyszukiwania to czekanie na HTTP
+_BUNDLE_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tavily")
+
+# Cache wyników wyszukiwania - wyniki nie zależą od firmy, więc są wspólne
+SEARCH_CACHE_MIN_SCORE = 0.92
+SEARCH_CACHE_TTL = 3600  # 1 godzina
+_SEARCH_CACHE_SCOPE = "tavily"
 
 
 class TavilySearchTool(BaseTool):
@@ -247,6 +258,95 @@ class TavilyMarketDataTool(BaseTool):
             return f"Blad wyszukiwania danych rynkowych: {e!s}"
 
 
+class CachedTavilyTool(BaseTool):
+    """Wraps a Tavily tool with a semantic cache of its results.
+
+    A query within cosine similarity SEARCH_CACHE_MIN_SCORE of an earlier one
+    for the same tool returns the stored result instead of calling Tavily.
+    Entries live in the agent memory vector store; any cache problem just
+    falls through to a normal search.
+    """
+
+    name: str = ""
+    description: str = ""
+    inner: BaseTool = Field(exclude=True)
+
+    def __init__(self, inner: BaseTool, **kwargs):
+        super().__init__(
+            inner=inner,
+            name=inner.name,
+            description=inner.description,
+            **kwargs,
+        )
+
+    def _run(self, query: str) -> str:
+        """Return a cached result for a similar query, or search and cache."""
+        namespace = f"{_SEARCH_CACHE_SCOPE}:{self.name}"
+        embedding = None
+        try:
+            embedding = memory_service.embed_sync(query)
+            if embedding is not None:
+                cached = memory_service.find_cached_response_sync(
+                    company_id="",
+                    namespace=namespace,
+                    embedding=embedding,
+                    context_hash="",
+                    min_score=SEARCH_CACHE_MIN_SCORE,
+                )
+                if cached:
+                    return cached["text"]
+        except Exception:
+            pass  # Cache is optional
+
+        result = self.inner._run(query)
+
+        # Errors and empty results are not worth remembering
+        if embedding is not None and not result.startswith(("Blad", "Nie znaleziono", "Brak")):
+            try:
+                memory_service.store_cached_response_sync(
+                    company_id="",
+                    namespace=namespace,
+                    embedding=embedding,
+                    context_hash="",
+                    brief=query,
+                    response={"text": result},
+                    ttl=SEARCH_CACHE_TTL,
+                )
+            except Exception:
+                pass
+
+        return result
+
+
+class TavilyBundleTool(BaseTool):
+    """Runs several Tavily tools on one query concurrently.
+
+    One tool call instead of a chain of them saves the agent a planning step
+    per extra search and overlaps the HTTP round-trips.
+    """
+
+    name: str = "tavily_research_bundle"
+    description: str = """Kompleksowy research w jednym wywolaniu - jednoczesnie
+    wyszukuje informacje, trendy lub analize konkurencji dla tego samego tematu.
+    Uzyj tego narzedzia RAZ zamiast kilku osobnych wyszukiwan.
+
+    Input: temat lub branza (np. 'kawiarnia specialty Krakow')"""
+
+    tools: list[BaseTool] = Field(default_factory=list, exclude=True)
+
+    def _run(self, query: str) -> str:
+        """Run all bundled tools in parallel and label their sections."""
+        if not self.tools:
+            return "Blad: Brak narzedzi w pakiecie researchu."
+
+        results = _BUNDLE_EXECUTOR.map(lambda tool: tool._run(query), self.tools)
+
+        return "\n\n".join(
+            f"=== {tool.name.upper()} ===\n{result}"
+            for tool, result in zip(self.tools, results)
+        )
+
+
 # Factory function for getting tools
 def get_tavily_tool(tool_type: str = "search") -> BaseTool:
     """Get a Tavily tool instance by type.
@@ -285,5 +385,10 @@ def get_finance_tools() -> list[BaseTool]:
     ]
 
 
-# Default search tool instance for convenience imports
-search_tool = TavilySearchTool()
+# Shared tool instances - agents reuse them instead of building a Tavily
+# client per request
+search_tool = CachedTavilyTool(TavilySearchTool())
+trends_tool = CachedTavilyTool(TavilyTrendsTool())
+competitor_tool = CachedTavilyTool(TavilyCompetitorTool())
+copy_research_tool = TavilyBundleTool(tools=[search_tool, competitor_tool])
+social_research_tool = TavilyBundleTool(tools=[search_tool, trends_tool])
@@ -32,3 +32,19 @@ async def create_indexes(db: AsyncIOMotorDatabase) -> None:
         ("department", 1),
         ("created_at", -1),
     ])
+
+    # Alerts - duplicate check in AlertService.create_alert
+    await db.alerts.create_index([
+        ("company_id", 1),
+        ("type", 1),
+        ("source_entity_id", 1),
+        ("dismissed", 1),
+        ("created_at", -1),
+    ])
+    # Alerts - active alert listing and unread counts
+    await db.alerts.create_index([
+        ("company_id", 1),
+        ("dismissed", 1),
+        ("expires_at", 1),
+        ("created_at", -1),
+    ])
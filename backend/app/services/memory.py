@@ -1,3 +1,4 @@
+import asyncio
 import hashlib
 from datetime import datetime
 from typing import Any
@@ -10,6 +11,7 @@ from qdrant_client.http import models
 from app.core.config import settings
 
 COLLECTION_NAME = "agent_memory"
+PAYLOAD_FIELDS = frozenset({"company_id", "content", "memory_type"})
 
 
 class AgentMemory:
@@ -40,7 +42,7 @@ class AgentMemory:
         metadata: dict[str, Any] | None = None,
     ) -> str:
         """Store a memory entry for a company."""
-        embedding = self._get_embedding(content)
+        embedding = await asyncio.to_thread(self._get_embedding, content)
         point_id = str(uuid4())
 
         payload = {
@@ -51,7 +53,8 @@ class AgentMemory:
             **(metadata or {}),
         }
 
-        self.qdrant.upsert(
+        await asyncio.to_thread(
+            self.qdrant.upsert,
             collection_name=COLLECTION_NAME,
             points=[
                 models.PointStruct(
@@ -72,7 +75,7 @@ class AgentMemory:
         limit: int = 5,
     ) -> list[dict[str, Any]]:
         """Search for relevant memories."""
-        embedding = self._get_embedding(query)
+        embedding = await asyncio.to_thread(self._get_embedding, query)
 
         filter_conditions = [
             models.FieldCondition(
@@ -89,7 +92,8 @@ class AgentMemory:
                 )
             )
 
-        results = self.qdrant.search(
+        results = await asyncio.to_thread(
+            self.qdrant.search,
             collection_name=COLLECTION_NAME,
             query_vector=embedding,
             query_filter=models.Filter(must=filter_conditions),
@@ -104,7 +108,7 @@ class AgentMemory:
                 "score": result.score,
                 "metadata": {
                     k: v for k, v in result.payload.items()
-                    if k not in ["company_id", "content", "memory_type"]
+                    if k not in PAYLOAD_FIELDS
                 },
             }
             for result in results
@@ -173,7 +177,8 @@ class AgentMemory:
 
     async def delete_company_memories(self, company_id: str) -> int:
         """Delete all memories for a company."""
-        result = self.qdrant.delete(
+        result = await asyncio.to_thread(
+            self.qdrant.delete,
             collection_name=COLLECTION_NAME,
             points_selector=models.FilterSelector(
                 filter=models.Filter(
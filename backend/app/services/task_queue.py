@@ -1,20 +1,28 @@
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any
 
 from arq import create_pool, cron
 from arq.connections import RedisSettings, ArqRedis
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
 
 from app.core.config import settings
-from app.services.agents.marketing.instagram import generate_instagram_post
+from app.services.agents.marketing.instagram import (
+    INSTAGRAM_BATCH_POLL_INTERVAL,
+    fetch_instagram_posts_batch,
+    generate_instagram_post,
+    submit_instagram_posts_batch,
+)
 from app.services.agents.marketing.copywriter import generate_marketing_copy
 from app.services.agents.finance.invoice import generate_invoice_draft
 from app.services.agents.finance.cashflow import analyze_cashflow
 from app.services.agents.brand_context import build_brand_context, get_fallback_context
 from app.services.agents.tools.image_generator import image_service
 
+MARKETING_CREW_TIMEOUT = 120  # s - po tym czasie zwracamy szkic bez recenzji
+
 
 async def get_mongodb():
     """Get MongoDB client for worker."""
@@ -22,20 +30,38 @@ async def get_mongodb():
     return client[settings.MONGODB_DB_NAME]
 
 
-async def process_instagram_task(ctx: dict, task_id: str, task_input: dict[str, Any]) -> dict:
-    """Process Instagram content generation task."""
-    db = await get_mongodb()
+async def _start_task(db, task_id: str) -> tuple[dict, dict | None]:
+    """Mark the task as processing and load it with its company.
 
-    try:
-        # Update status to processing
+    The status update returns the updated task, saving a separate find_one.
+    """
+    task = await db.tasks.find_one_and_update(
+        {"_id": ObjectId(task_id)},
+        {"$set": {"status": "processing", "updated_at": datetime.utcnow()}},
+        return_document=ReturnDocument.AFTER,
+    )
+    company = await db.companies.find_one({"_id": ObjectId(task["company_id"])})
+    return task, company
+
+
+def _progress_reporter(db, task_id: str):
+    """Store each finished crew stage on the task so the UI can show it early."""
+    async def report(stage: str, text: str) -> None:
         await db.tasks.update_one(
             {"_id": ObjectId(task_id)},
-            {"$set": {"status": "processing", "updated_at": datetime.utcnow()}}
+            {"$set": {f"partial_output.{stage}": text, "updated_at": datetime.utcnow()}}
         )
 
-        # Get company settings and knowledge
-        task = await db.tasks.find_one({"_id": ObjectId(task_id)})
-        company = await db.companies.find_one({"_id": ObjectId(task["company_id"])})
+    return report
+
+
+async def process_instagram_task(ctx: dict, task_id: str, task_input: dict[str, Any]) -> dict:
+    """Process Instagram content generation task."""
+    db = await get_mongodb()
+
+    try:
+        # Mark as processing and get company settings and knowledge
+        task, company = await _start_task(db, task_id)
 
         company_settings = company.get("settings", {}) if company else {}
         company_knowledge = company.get("knowledge", {}) if company else {}
@@ -84,6 +110,8 @@ async def process_instagram_task(ctx: dict, task_id: str, task_input: dict[str,
             post_type=task_input.get("post_type", "post"),
             company_id=task["company_id"],
             brand_context=brand_context,
+            on_progress=_progress_reporter(db, task_id),
+            timeout_s=MARKETING_CREW_TIMEOUT,
         )
 
         # Store the params used for transparency
@@ -135,18 +163,107 @@ async def process_instagram_task(ctx: dict, task_id: str, task_input: dict[str,
         raise
 
 
-async def process_copywriter_task(ctx: dict, task_id: str, task_input: dict[str, Any]) -> dict:
-    """Process copywriting task."""
+async def process_instagram_batch_task(ctx: dict, task_id: str, task_input: dict[str, Any]) -> dict:
+    """Process Instagram posts through the OpenAI Batch API.
+
+    The first run submits the batch and leaves the task pending; every later
+    run checks the batch and re-enqueues itself until the posts are ready.
+    """
     db = await get_mongodb()
 
     try:
+        task = await db.tasks.find_one({"_id": ObjectId(task_id)})
+        batch_id = task.get("batch_id")
+
+        if batch_id:
+            posts = task["batch_posts"]
+            brand_context = task.get("batch_brand_context", "")
+        else:
+            task, company = await _start_task(db, task_id)
+
+            company_settings = company.get("settings", {}) if company else {}
+            brand_context = build_brand_context(
+                knowledge=company.get("knowledge", {}) if company else {},
+                settings=company_settings,
+                agent_type="instagram",
+            )
+            default_brand_voice, default_target_audience = get_fallback_context(company_settings)
+
+            # Brand context is shared - stored once on the task, not in every post
+            posts = [
+                {
+                    "brief": post["brief"],
+                    "post_type": post.get("post_type", "post"),
+                    "include_hashtags": post.get("include_hashtags", True),
+                    "brand_voice": default_brand_voice,
+                    "target_audience": default_target_audience,
+                }
+                for post in task_input.get("posts", [])
+            ]
+            batch_id = await submit_instagram_posts_batch(
+                [{**post, "brand_context": brand_context} for post in posts]
+            )
+
+            # Pending, not processing - cleanup_stuck_tasks would fail a batch
+            # that legitimately takes hours
+            await db.tasks.update_one(
+                {"_id": ObjectId(task_id)},
+                {"$set": {
+                    "status": "pending",
+                    "batch_id": batch_id,
+                    "batch_posts": posts,
+                    "batch_brand_context": brand_context,
+                    "updated_at": datetime.utcnow(),
+                }}
+            )
+
+        results = await fetch_instagram_posts_batch(
+            batch_id, [{**post, "brand_context": brand_context} for post in posts]
+        )
+        if results is None:
+            await ctx["redis"].enqueue_job(
+                "process_instagram_batch_task",
+                task_id,
+                task_input,
+                _defer_by=timedelta(seconds=INSTAGRAM_BATCH_POLL_INTERVAL),
+            )
+            return {"batch_id": batch_id, "status": "pending"}
+
+        result = {"batch_id": batch_id, "posts": results}
         await db.tasks.update_one(
             {"_id": ObjectId(task_id)},
-            {"$set": {"status": "processing", "updated_at": datetime.utcnow()}}
+            {
+                "$set": {
+                    "status": "completed",
+                    "output": result,
+                    "completed_at": datetime.utcnow(),
+                    "updated_at": datetime.utcnow(),
+                }
+            }
         )
 
-        task = await db.tasks.find_one({"_id": ObjectId(task_id)})
-        company = await db.companies.find_one({"_id": ObjectId(task["company_id"])})
+        return result
+
+    except Exception as e:
+        await db.tasks.update_one(
+            {"_id": ObjectId(task_id)},
+            {
+                "$set": {
+                    "status": "failed",
+                    "error": str(e),
+                    "updated_at": datetime.utcnow(),
+                }
+            }
+        )
+        raise
+
+
+async def process_copywriter_task(ctx: dict, task_id: str, task_input: dict[str, Any]) -> dict:
+    """Process copywriting task."""
+    db = await get_mongodb()
+
+    try:
+        task, company = await _start_task(db, task_id)
 
         company_settings = company.get("settings", {}) if company else {}
         company_knowledge = company.get("knowledge", {}) if company else {}
@@ -177,6 +294,8 @@ async def process_copywriter_task(ctx: dict, task_id: str, task_input: dict[str,
             max_length=task_input.get("max_length"),
             company_id=task["company_id"],
             brand_context=brand_context,
+            on_progress=_progress_reporter(db, task_id),
+            timeout_s=MARKETING_CREW_TIMEOUT,
         )
 
         # Store the params used for transparency
@@ -218,13 +337,7 @@ async def process_invoice_task(ctx: dict, task_id: str, task_input: dict[str, An
     db = await get_mongodb()
 
     try:
-        await db.tasks.update_one(
-            {"_id": ObjectId(task_id)},
-            {"$set": {"status": "processing", "updated_at": datetime.utcnow()}}
-        )
-
-        task = await db.tasks.find_one({"_id": ObjectId(task_id)})
-        company = await db.companies.find_one({"_id": ObjectId(task["company_id"])})
+        task, company = await _start_task(db, task_id)
         company_settings = company.get("settings", {}) if company else {}
 
         result = await generate_invoice_draft(
@@ -268,13 +381,7 @@ async def process_cashflow_task(ctx: dict, task_id: str, task_input: dict[str, A
     db = await get_mongodb()
 
     try:
-        await db.tasks.update_one(
-            {"_id": ObjectId(task_id)},
-            {"$set": {"status": "processing", "updated_at": datetime.utcnow()}}
-        )
-
-        task = await db.tasks.find_one({"_id": ObjectId(task_id)})
-        company = await db.companies.find_one({"_id": ObjectId(task["company_id"])})
+        task, company = await _start_task(db, task_id)
         company_settings = company.get("settings", {}) if company else {}
 
         result = await analyze_cashflow(
@@ -431,17 +538,31 @@ async def cleanup_stuck_tasks(ctx: dict) -> dict:
     return {"cleaned_up": result.modified_count}
 
 
+async def cleanup_expired_response_cache(ctx: dict) -> dict:
+    """Delete expired cached agent responses from the memory collection."""
+    from app.services.agents.memory import memory_service
+
+    deleted = await memory_service.purge_expired_cached_responses()
+
+    if deleted > 0:
+        print(f"Deleted {deleted} expired cached responses")
+
+    return {"deleted": deleted}
+
+
 class WorkerSettings:
     """ARQ Worker settings."""
 
     functions = [
         process_instagram_task,
+        process_instagram_batch_task,
         process_copywriter_task,
         process_invoice_task,
         process_cashflow_task,
         process_schedule_rules,
         process_publications,
         cleanup_stuck_tasks,
+        cleanup_expired_response_cache,
     ]
 
     # Cron jobs for periodic tasks
@@ -452,6 +573,8 @@ class WorkerSettings:
         cron(process_publications, minute=None),
         # Cleanup stuck tasks every 5 minutes
         cron(cleanup_stuck_tasks, minute={0, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55}),
+        # Delete expired response cache entries every hour at :30
+        cron(cleanup_expired_response_cache, hour=None, minute=30),
     ]
 
     @staticmethod
@@ -0,0 +1,125 @@
+"""Tests for the agent memory service helpers."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from app.services.agents import memory
+from app.services.agents.memory import AgentMemoryService, EmbeddingCache, RecallCache
+
+
+class TestEmbeddingCache:
+    """Tests for EmbeddingCache."""
+
+    def test_hit_and_miss_stats(self):
+        """Test that lookups are counted."""
+        cache = EmbeddingCache(maxsize=2, ttl=60)
+        key = EmbeddingCache.key("model", "kawa")
+
+        assert cache.get(key) is None
+        cache.set(key, [0.5, 0.25])
+        assert cache.get(key) == [0.5, 0.25]
+
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+        assert cache.stats["hit_rate"] == 0.5
+
+    def test_evicts_least_recently_used(self):
+        """Test LRU eviction when the cache is full."""
+        cache = EmbeddingCache(maxsize=2, ttl=60)
+        a, b, c = (EmbeddingCache.key("model", t) for t in ("a", "b", "c"))
+
+        cache.set(a, [1.0])
+        cache.set(b, [2.0])
+        cache.get(a)
+        cache.set(c, [3.0])
+
+        assert cache.get(b) is None
+        assert cache.get(a) == [1.0]
+        assert cache.get(c) == [3.0]
+
+    def test_expired_entry_is_a_miss(self):
+        """Test that entries past their TTL are dropped."""
+        cache = EmbeddingCache(maxsize=2, ttl=10)
+        key = EmbeddingCache.key("model", "kawa")
+
+        with patch("app.services.agents.memory.time.monotonic", return_value=100.0):
+            cache.set(key, [0.1])
+        with patch("app.services.agents.memory.time.monotonic", return_value=111.0):
+            assert cache.get(key) is None
+        assert cache.stats["size"] == 0
+
+
+class TestRecallCache:
+    """Tests for RecallCache."""
+
+    def test_similar_query_hits(self):
+        """Test that a near-identical query vector reuses cached results."""
+        cache = RecallCache(per_company=4, ttl=60, min_similarity=0.97)
+        key = (("brand_voice",), None, 5, 0.7)
+
+        cache.set("c1", key, [1.0, 0.0], [{"content": "ton marki"}])
+
+        assert cache.get("c1", key, [0.99, 0.14]) == [{"content": "ton marki"}]
+        assert cache.get("c1", key, [0.0, 1.0]) is None
+        assert cache.get("c2", key, [1.0, 0.0]) is None
+        assert cache.get("c1", ((), None, 5, 0.7), [1.0, 0.0]) is None
+
+    def test_invalidate_drops_company(self):
+        """Test that invalidation forgets a company's results."""
+        cache = RecallCache(per_company=4, ttl=60, min_similarity=0.97)
+        key = ((), None, 5, 0.7)
+
+        cache.set("c1", key, [1.0, 0.0], [])
+        cache.invalidate("c1")
+
+        assert cache.get("c1", key, [1.0, 0.0]) is None
+
+
+class TestPurgeExpiredCachedResponses:
+    """Tests for purge_expired_cached_responses_sync."""
+
+    def _service(self, count: int) -> AgentMemoryService:
+        service = AgentMemoryService()
+        service._initialized = True
+        service.client = MagicMock()
+        service.client.count.return_value.count = count
+        return service
+
+    def test_deletes_expired_entries(self):
+        """Test that expired entries are deleted and counted."""
+        service = self._service(3)
+
+        assert service.purge_expired_cached_responses_sync() == 3
+        service.client.delete.assert_called_once()
+
+    def test_nothing_expired(self):
+        """Test that no delete is sent when nothing expired."""
+        service = self._service(0)
+
+        assert service.purge_expired_cached_responses_sync() == 0
+        service.client.delete.assert_not_called()
+
+
+class TestInitializeSync:
+    """Tests for initialize_sync."""
+
+    def test_parallel_threads_initialize_once(self):
+        """Test that tool threads starting together create the collection once."""
+        client = MagicMock()
+        client.get_collection.side_effect = Exception("Not found")
+        client.create_collection.side_effect = lambda **kwargs: time.sleep(0.05)
+        qdrant = MagicMock(return_value=client)
+        service = AgentMemoryService()
+
+        with patch.object(memory, "QdrantClient", qdrant), \
+                patch.object(memory, "_openai_client"):
+            threads = [threading.Thread(target=service.initialize_sync) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert service._initialized
+        qdrant.assert_called_once()
+        client.create_collection.assert_called_once()
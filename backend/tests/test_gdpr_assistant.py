@@ -0,0 +1,120 @@
+"""Tests for the GDPR/RODO assistant."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from app.services.agents.legal import gdpr_assistant
+from app.services.agents.legal.gdpr_assistant import (
+    _apply_rodo_facts,
+    _derive_rodo_facts,
+    generate_full_gdpr_package,
+    generate_privacy_policy_stream,
+)
+
+
+class TestDeriveRodoFacts:
+    """Tests for _derive_rodo_facts."""
+
+    def test_public_entity_uses_polish_cap(self):
+        """Test that public entities get the separate Polish fine cap."""
+        facts = _derive_rodo_facts("<1000", False, False, True)
+
+        assert facts["iod_required"][0] is True
+        assert facts["fine_risk_tier"][0] == "polish_public"
+
+    def test_special_categories_do_not_set_fine_tier(self):
+        """Test that the fine tier is left to the model for private entities."""
+        facts = _derive_rodo_facts(">10000", False, True, False)
+
+        assert facts["iod_required"][0] is True
+        assert facts["dpia_required"][0] is True
+        assert "fine_risk_tier" not in facts
+
+
+class TestApplyRodoFacts:
+    """Tests for _apply_rodo_facts."""
+
+    def test_replaces_null_section_and_keeps_text(self):
+        """Test model output with null or a string instead of an object."""
+        assessment = {"iod_assessment": None, "risk_assessment": "Niskie ryzyko"}
+        facts = _derive_rodo_facts("<1000", False, False, True)
+
+        _apply_rodo_facts(assessment, facts)
+
+        assert assessment["iod_assessment"] == {"required": True}
+        assert assessment["risk_assessment"] == {
+            "summary": "Niskie ryzyko",
+            "fine_risk_tier": "polish_public",
+        }
+
+
+class TestGenerateFullGdprPackage:
+    """Tests for generate_full_gdpr_package."""
+
+    async def test_forwards_flags_and_keeps_other_documents_on_failure(self):
+        """Test RODO flags reach the audit and one failure drops only its document."""
+        audit = AsyncMock(return_value={"success": True, "assessment": {"overall_score": 70}})
+        policy = AsyncMock(side_effect=TimeoutError())
+        dpa = AsyncMock(return_value={"success": True, "dpa": {"title": "Umowa powierzenia"}})
+
+        with patch.object(gdpr_assistant, "check_gdpr_compliance", audit), \
+                patch.object(gdpr_assistant, "generate_privacy_policy", policy), \
+                patch.object(gdpr_assistant, "generate_data_processing_agreement", dpa):
+            package = await generate_full_gdpr_package(
+                company_name="Firma",
+                company_address="Warszawa",
+                business_description="Sklep internetowy z odzieza",
+                data_collected=["email"],
+                data_processing_purposes=["realizacja zamowien"],
+                business_type="ecommerce",
+                number_of_data_subjects=">10000",
+                uses_profiling=True,
+                is_public_entity=True,
+            )
+
+        audit_kwargs = audit.call_args.kwargs
+        assert audit_kwargs["number_of_data_subjects"] == ">10000"
+        assert audit_kwargs["uses_profiling"] is True
+        assert audit_kwargs["is_public_entity"] is True
+        assert policy.call_args.kwargs["business_type"] == "ecommerce"
+
+        assert package["success"] is True
+        assert package["failed"] == ["privacy_policy"]
+        assert "error" in package["privacy_policy"]
+        assert package["assessment"] == {"overall_score": 70}
+        assert package["dpa"] == {"title": "Umowa powierzenia"}
+
+
+class _FakeStreamingLlm:
+    """LLM stub whose stream keeps going after the JSON object closes."""
+
+    def __init__(self, chunks: list[str]):
+        self.chunks = chunks
+        self.closed = False
+
+    async def astream(self, messages):
+        try:
+            for chunk in self.chunks:
+                yield SimpleNamespace(content=chunk)
+            while True:
+                yield SimpleNamespace(content=" ")
+        finally:
+            self.closed = True
+
+
+class TestGeneratePrivacyPolicyStream:
+    """Tests for generate_privacy_policy_stream."""
+
+    async def test_yields_fields_and_closes_model_stream(self):
+        """Test that fields stream out and the model stream is closed at the end."""
+        llm = _FakeStreamingLlm(['{"title": "Polityka', ' prywatności", "iod": {"na', 'me": null}}'])
+
+        with patch.object(gdpr_assistant, "_get_llm", return_value=llm):
+            fields = [
+                field async for field in generate_privacy_policy_stream(
+                    company_name="Firma", company_address="Warszawa"
+                )
+            ]
+
+        assert fields == [{"title": "Polityka prywatności"}, {"iod": {"name": None}}]
+        assert llm.closed
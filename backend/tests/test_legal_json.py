@@ -0,0 +1,87 @@
+"""Tests for JSON extraction from legal agents' LLM output."""
+
+import json
+
+from app.services.agents.legal._llm_json import JsonFieldStream, extract_json_object
+
+
+class TestExtractJsonObject:
+    """Tests for extract_json_object."""
+
+    def test_no_object(self):
+        """Test text without JSON."""
+        assert extract_json_object("Brak danych") is None
+
+    def test_unbalanced_object(self):
+        """Test truncated output."""
+        assert extract_json_object('{"title": "Regulamin"') is None
+
+    def test_strips_preamble_and_code_fence(self):
+        """Test output wrapped in commentary and a code fence."""
+        text = 'Oto regulamin:\n```json\n{"title": "Regulamin"}\n```'
+
+        assert extract_json_object(text) == '{"title": "Regulamin"}'
+
+    def test_ignores_trailing_commentary_with_braces(self):
+        """Test that text after the object is not included."""
+        text = '{"a": 1} Uwaga: pola {opcjonalne} można pominąć.'
+
+        assert extract_json_object(text) == '{"a": 1}'
+
+    def test_braces_and_escapes_inside_strings(self):
+        """Test braces and escaped quotes inside string values."""
+        payload = {
+            "content": 'Art. 38 {pkt 13} "treści cyfrowe" }',
+            "path": "C:\\regulamin\\",
+            "sections": [{"number": "§ 1"}],
+        }
+        text = "Wynik: " + json.dumps(payload, ensure_ascii=False) + " }"
+
+        assert json.loads(extract_json_object(text)) == payload
+
+
+def _feed_in_chunks(text: str, size: int) -> tuple[list[tuple], JsonFieldStream]:
+    """Feed text to a new scanner in fixed-size chunks, collecting fields."""
+    scanner = JsonFieldStream()
+    fields = []
+    for start in range(0, len(text), size):
+        fields.extend(scanner.feed(text[start:start + size]))
+    return fields, scanner
+
+
+class TestJsonFieldStream:
+    """Tests for JsonFieldStream."""
+
+    PAYLOAD = {
+        "title": 'Polityka "prywatności", wersja {1}',
+        "path": "C:\\dane\\",
+        "administrator": {"name": "Firma", "address": {"city": "Kraków"}},
+        "sections": [{"number": "§ 1", "items": ["a, b", "}"]}],
+        "version": 2,
+    }
+
+    def test_every_chunk_size(self):
+        """Test chunks split inside strings, escapes and nested objects."""
+        text = "Oto dokument:\n" + json.dumps(self.PAYLOAD, ensure_ascii=False) + "\nKoniec"
+
+        for size in range(1, 12):
+            fields, scanner = _feed_in_chunks(text, size)
+
+            assert dict(fields) == self.PAYLOAD, size
+            assert [key for key, _ in fields] == list(self.PAYLOAD)
+            assert scanner.done
+
+    def test_fields_arrive_before_object_closes(self):
+        """Test that a completed member is returned before the rest arrives."""
+        scanner = JsonFieldStream()
+
+        assert scanner.feed('{"title": "Regu') == []
+        assert scanner.feed('lamin", "sect') == [("title", "Regulamin")]
+        assert not scanner.done
+
+    def test_ignores_text_after_object(self):
+        """Test that nothing is parsed once the object is closed."""
+        scanner = JsonFieldStream()
+
+        assert scanner.feed('{"a": 1}') == [("a", 1)]
+        assert scanner.feed(', "b": 2}') == []
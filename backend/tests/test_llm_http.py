@@ -0,0 +1,31 @@
+"""Tests for the shared LLM HTTP pools."""
+
+from functools import lru_cache
+
+from app.services.agents.llm_http import (
+    close_llm_http_clients,
+    get_llm_http_async_client,
+    get_llm_http_client,
+    uses_llm_http_clients,
+)
+
+
+@uses_llm_http_clients
+@lru_cache(maxsize=1)
+def _cached_pools():
+    return get_llm_http_client(), get_llm_http_async_client()
+
+
+class TestCloseLlmHttpClients:
+    """Tests for close_llm_http_clients."""
+
+    async def test_pools_are_rebuilt_after_close(self):
+        """Test that an app restart (e.g. next TestClient) gets open pools."""
+        old_sync, old_async = _cached_pools()
+
+        await close_llm_http_clients()
+        new_sync, new_async = _cached_pools()
+
+        assert old_sync.is_closed and old_async.is_closed
+        assert new_sync is not old_sync and new_async is not old_async
+        assert not new_sync.is_closed and not new_async.is_closed
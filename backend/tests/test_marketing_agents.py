@@ -0,0 +1,133 @@
+"""Tests for marketing agents' entry points and output parsing."""
+
+import inspect
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from app.services.agents.marketing import instagram
+from app.services.agents.marketing.copywriter import generate_marketing_copy
+from app.services.agents.marketing.instagram import (
+    build_instagram_batch_request,
+    fetch_instagram_posts_batch,
+    parse_post_sections,
+)
+
+
+class TestGenerateMarketingCopySignature:
+    """Tests for the generate_marketing_copy entry point."""
+
+    def test_accepts_memory_and_brand_context(self):
+        """Test that callers can pass company and brand context."""
+        params = inspect.signature(generate_marketing_copy).parameters
+
+        assert params["company_id"].default == ""
+        assert params["brand_context"].default == ""
+
+
+class TestParsePostSections:
+    """Tests for parse_post_sections."""
+
+    def test_no_sections(self):
+        """Test output without any known section."""
+        assert parse_post_sections("Brak wyniku") == {}
+
+    def test_list_format(self):
+        """Test the format the review task asks for."""
+        text = (
+            "Zatwierdzam:\n"
+            "- TEKST POSTU: Jesien w pelni!\n\nWpadnij do nas.\n"
+            "- HASHTAGI: #jesien #kawa\n"
+            "- CZAS PUBLIKACJI: wtorek 18:00\n"
+            "- OPIS GRAFIKI: cozy autumn cafe, warm light\n"
+            "---\n"
+            "Uwagi koncowe"
+        )
+
+        assert parse_post_sections(text) == {
+            "post_text": "Jesien w pelni!\n\nWpadnij do nas.",
+            "hashtags": "#jesien #kawa",
+            "suggested_time": "wtorek 18:00",
+            "image_prompt": "cozy autumn cafe, warm light",
+        }
+
+    def test_bold_labels_and_trailing_trends(self):
+        """Test markdown bold labels and the extra trends section."""
+        text = (
+            "**TEKST POSTU:** Hej\n"
+            "**OPIS GRAFIKI:** sunny beach\n"
+            "- WYKORZYSTANE TRENDY: lato"
+        )
+
+        assert parse_post_sections(text) == {
+            "post_text": "Hej",
+            "image_prompt": "sunny beach",
+        }
+
+    def test_bold_at_end_of_post_text(self):
+        """Test that bold text closing a section keeps its asterisks."""
+        text = "**TEKST POSTU:** Hello **world**\n**HASHTAGI:** #a"
+
+        assert parse_post_sections(text) == {
+            "post_text": "Hello **world**",
+            "hashtags": "#a",
+        }
+
+
+class TestBuildInstagramBatchRequest:
+    """Tests for build_instagram_batch_request."""
+
+    def test_chat_completion_line(self):
+        """Test that a post becomes one Batch API chat completion request."""
+        line = build_instagram_batch_request(
+            "3", "Promocja jesiennej kawy", post_type="story", include_hashtags=False
+        )
+
+        assert line["custom_id"] == "3"
+        assert line["url"] == "/v1/chat/completions"
+        system, user = line["body"]["messages"]
+        assert system["role"] == "system"
+        assert "BRIEF: Promocja jesiennej kawy" in user["content"]
+        assert "HASHTAGI: Bez hashtagow" in user["content"]
+        assert "Instagram Story" in user["content"]
+
+
+class TestFetchInstagramPostsBatch:
+    """Tests for fetch_instagram_posts_batch."""
+
+    async def test_reads_errors_from_error_file(self):
+        """Test that failed requests get their error from the batch error file."""
+        output_line = {
+            "custom_id": "0",
+            "response": {
+                "status_code": 200,
+                "body": {"choices": [{"message": {"content": "TEKST POSTU: Hej"}}]},
+            },
+        }
+        error_line = {
+            "custom_id": "1",
+            "response": {
+                "status_code": 429,
+                "body": {"error": {"message": "Rate limit exceeded"}},
+            },
+        }
+        files = {
+            "file-out": json.dumps(output_line),
+            "file-err": json.dumps(error_line),
+        }
+        client = SimpleNamespace(
+            batches=SimpleNamespace(retrieve=AsyncMock(return_value=SimpleNamespace(
+                status="completed", output_file_id="file-out", error_file_id="file-err",
+            ))),
+            files=SimpleNamespace(content=AsyncMock(
+                side_effect=lambda file_id: SimpleNamespace(text=files[file_id])
+            )),
+        )
+
+        with patch.object(instagram, "_batch_client", return_value=client):
+            results = await fetch_instagram_posts_batch(
+                "batch_1", [{"brief": "Kawa"}, {"brief": "Herbata"}]
+            )
+
+        assert results[0]["post_text"] == "Hej"
+        assert "Rate limit exceeded" in results[1]["error"]
@@ -0,0 +1,59 @@
+"""Tests for the terms and return policy generator."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from app.services.agents.legal import terms_generator
+from app.services.agents.legal.terms_generator import (
+    _match_withdrawal_exceptions,
+    generate_data_collection_notice,
+    generate_return_policy,
+)
+
+
+class TestMatchWithdrawalExceptions:
+    """Tests for _match_withdrawal_exceptions."""
+
+    def test_matches_products_to_statutory_exceptions(self):
+        """Test that products get their Art. 38 exception and unmatched ones are skipped."""
+        matched = _match_withdrawal_exceptions(["Kursy online z fotografii", "Kubki", "Kwiaty cięte"])
+
+        assert [(m["product"], m["article"]) for m in matched] == [
+            ("Kursy online z fotografii", "Art. 38 pkt 13"),
+            ("Kwiaty cięte", "Art. 38 pkt 4"),
+        ]
+
+
+class TestGenerateReturnPolicy:
+    """Tests for generate_return_policy."""
+
+    async def test_returns_matched_exceptions(self):
+        """Test that non-returnable products reach the response."""
+        llm = SimpleNamespace(model_name="gpt-4o")
+
+        with patch.object(terms_generator, "_get_llm", return_value=llm), \
+                patch.object(terms_generator, "get_cached_document",
+                             AsyncMock(return_value={"title": "Polityka zwrotów"})):
+            result = await generate_return_policy(
+                company_name="Firma",
+                company_address="Warszawa",
+                non_returnable_products=["Personalizowane produkty"],
+            )
+
+        assert result["return_policy"] == {"title": "Polityka zwrotów"}
+        assert [m["article"] for m in result["non_returnable_products"]] == ["Art. 38 pkt 3"]
+
+
+class TestGenerateDataCollectionNotice:
+    """Tests for generate_data_collection_notice."""
+
+    async def test_changes_to_a_result_do_not_leak(self):
+        """Test that editing one notice leaves the shared sections intact."""
+        first = await generate_data_collection_notice("Firma", "Warszawa", "kontakt@firma.pl")
+        first["notice"]["sections"][-1]["content"] = "zmienione"
+        first["required_elements"].append("dodatkowy")
+
+        second = await generate_data_collection_notice("Firma", "Warszawa", "kontakt@firma.pl")
+
+        assert second["notice"]["sections"][-1]["content"] != "zmienione"
+        assert "dodatkowy" not in second["required_elements"]
@@ -1,13 +1,35 @@
 """
 ARQ Worker for processing background tasks.
 
-Run with: arq app.services.task_queue.WorkerSettings
+Run with: python worker.py
 """
+import asyncio
+
+from arq import run_worker
+
 from app.services.task_queue import WorkerSettings
 
-# This file allows running the worker with:
+# This file also allows running the worker with the default asyncio loop:
 # python -m arq worker.WorkerSettings
 # or
 # arq worker.WorkerSettings
 
 __all__ = ["WorkerSettings"]
+
+
+def main() -> None:
+    """Run the worker on uvloop where it is available."""
+    # Tylko proces workera - API i testy zostają przy swojej pętli.
+    # Na Windows uvloop nie istnieje, zostaje domyślna pętla asyncio.
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        asyncio.set_event_loop(uvloop.new_event_loop())
+
+    run_worker(WorkerSettings)
+
+
+if __name__ == "__main__":
+    main()